@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+def snapshot_version(path, ignore=None):
+    """Identify the database snapshot on disk from file names, sizes and mtimes.
+
+    ignore is a path inside a database directory that is not part of the
+    database, such as a snapshots directory kept on the same volume.
+    """
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+        if ignore:
+            ignore = os.path.realpath(ignore)
+            paths = [p for p in paths if os.path.realpath(p) != ignore]
+    else:
+        paths = [path, path + ".wal"]
+
+    digest = hashlib.sha1()
+    for file_path in paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        digest.update(f"{os.path.basename(file_path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """LRU cache of serialized query responses bounded by entries, bytes and age.
+
+    All entries belong to one database snapshot; when the snapshot version
+    changes the whole cache is dropped.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl_seconds=0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.version = None
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def set_version(self, version):
+        """Drop every entry if the database snapshot changed"""
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self.version = version
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        body, expires_at = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key, body, version=None):
+        """Cache a body; skipped if it was computed against a version that has since been replaced"""
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        if version is not None and version != self.version:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        self._entries[key] = (body, expires_at)
+        self._bytes += len(body)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key):
+        body, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def stats(self):
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one execution.
+
+    The first caller for a key runs it; callers arriving while it is in
+    flight wait for and share its result or error.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, retry_on=()):
+        """Await fn(), or the in-flight call with the same key.
+
+        Returns (result, shared). If the call being shared fails with one of
+        the retry_on exceptions (or is cancelled), which only concerns the
+        caller that ran it, the waiters try again.
+        """
+        if not self.enabled:
+            self.executions += 1
+            return await fn(), False
+
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                result = await asyncio.shield(future)
+            except retry_on:
+                continue
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+            self.coalesced += 1
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the error as retrieved in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+    def stats(self):
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
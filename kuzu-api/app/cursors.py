@@ -0,0 +1,121 @@
+import base64
+import json
+import secrets
+import time
+from collections import OrderedDict
+
+from .serialize import dumps
+
+
+def encode_row(columns, row):
+    """Encode one result row as a JSON object"""
+    return dumps(dict(zip(columns, row)))
+
+
+def fetch_encoded_rows(result, columns, limit, max_bytes=None):
+    """Fetch up to limit rows (and at most max_bytes) as encoded JSON objects"""
+    rows = []
+    size = 0
+    while len(rows) < limit and result.has_next():
+        if max_bytes is not None and size >= max_bytes:
+            break
+        row = encode_row(columns, result.get_next())
+        rows.append(row)
+        size += len(row)
+    return rows, size
+
+
+def page_body(rows, columns, execution_time_ms, truncated=False, next_cursor=None):
+    """Assemble a QueryResult document from pre-encoded rows"""
+    tail = json.dumps(
+        {
+            "columns": columns,
+            "execution_time_ms": execution_time_ms,
+            "truncated": truncated,
+            "next_cursor": next_cursor,
+        }
+    )
+    return b'{"data":[' + b",".join(rows) + b"]," + tail[1:].encode()
+
+
+class Cursor:
+    """The buffered remainder of a paged query result"""
+
+    def __init__(self, key, columns, rows, size, truncated, ttl_seconds):
+        self.key = key
+        self.columns = columns
+        self.rows = rows
+        self.size = size
+        self.truncated = truncated
+        self.expires_at = time.monotonic() + ttl_seconds
+
+
+class CursorStore:
+    """Open cursors, bounded in number and total buffered bytes and expired after ttl_seconds.
+
+    The oldest cursors are dropped first when either bound is exceeded. A
+    cursor token encodes the cursor id and a row offset, so a page can be
+    fetched again until the cursor expires.
+    """
+
+    def __init__(self, max_cursors=100, ttl_seconds=300, max_bytes=64 * 1024 * 1024):
+        self.max_cursors = max_cursors
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._cursors = OrderedDict()
+        self._bytes = 0
+
+        self.opened = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def open(self, key, columns, rows, size, truncated):
+        """Store the remaining rows of a result and return a token for its first page"""
+        self._expire()
+        cursor_id = secrets.token_urlsafe(12)
+        self._cursors[cursor_id] = Cursor(key, columns, rows, size, truncated, self.ttl_seconds)
+        self._bytes += size
+        self.opened += 1
+        while len(self._cursors) > self.max_cursors or self._bytes > self.max_bytes:
+            _, cursor = self._cursors.popitem(last=False)
+            self._bytes -= cursor.size
+            self.evicted += 1
+        return self.token(cursor_id, 0)
+
+    def get(self, token):
+        """Resolve a token to (cursor_id, cursor, offset), or None if it is unknown or expired"""
+        self._expire()
+        try:
+            cursor_id, offset = base64.urlsafe_b64decode(token.encode()).decode().rsplit(":", 1)
+            offset = int(offset)
+        except ValueError:
+            return None
+        cursor = self._cursors.get(cursor_id)
+        if cursor is None:
+            return None
+        return cursor_id, cursor, offset
+
+    def close(self, cursor_id):
+        cursor = self._cursors.pop(cursor_id, None)
+        if cursor is not None:
+            self._bytes -= cursor.size
+
+    @staticmethod
+    def token(cursor_id, offset):
+        return base64.urlsafe_b64encode(f"{cursor_id}:{offset}".encode()).decode()
+
+    def _expire(self):
+        now = time.monotonic()
+        for cursor_id in [c for c, cursor in self._cursors.items() if cursor.expires_at < now]:
+            self._bytes -= self._cursors.pop(cursor_id).size
+            self.expired += 1
+
+    def stats(self):
+        return {
+            "open": len(self._cursors),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "opened": self.opened,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,155 @@
+"""Token-level analysis of Cypher query text.
+
+One lexer pass per distinct query text yields everything the request path
+needs: whether the query writes or changes connection settings, the
+token-normalized text used in cache keys, and the literal-stripped
+fingerprint used in metrics and logs. Results are memoized,
+so repeated queries cost a dictionary lookup.
+"""
+import hashlib
+import json
+import re
+from functools import lru_cache
+
+# Keywords whose case is folded in cache keys and fingerprints, so queries
+# that differ only in keyword case share a cached result and a metrics group
+KEYWORDS = {
+    "MATCH", "OPTIONAL", "WHERE", "RETURN", "WITH", "UNWIND", "AS", "AND",
+    "OR", "NOT", "XOR", "IN", "IS", "NULL", "TRUE", "FALSE", "DISTINCT",
+    "ORDER", "BY", "ASC", "ASCENDING", "DESC", "DESCENDING", "SKIP", "LIMIT",
+    "UNION", "ALL", "CALL", "YIELD", "CASE", "WHEN", "THEN", "ELSE", "END",
+    "CONTAINS", "STARTS", "ENDS",
+}
+
+# Clauses that modify the database or touch files and extensions. A query is
+# read-only if none of them appears as a keyword anywhere in it, and it does
+# not change a connection setting with CALL <option> = <value>.
+WRITE_KEYWORDS = {
+    "CREATE", "MERGE", "SET", "DELETE", "DETACH", "REMOVE", "DROP", "ALTER",
+    "COPY", "LOAD", "INSTALL", "ATTACH", "IMPORT", "EXPORT", "CHECKPOINT",
+    "BEGIN", "COMMIT", "ROLLBACK", "USE",
+}
+
+_TOKEN = re.compile(
+    r"""
+    (?P<space>\s+)
+    |(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    |(?P<quoted>`[^`]*`)
+    |(?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    |(?P<word>[A-Za-z_][A-Za-z_0-9]*)
+    |(?P<symbol>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# A word right after one of these is a property, label or parameter name
+_NAME_PREFIXES = {".", ":", "$"}
+# A word right after one of these is an alias or a variable, never a clause
+_VARIABLE_PREFIXES = {"AS", "(", "[", ","}
+
+
+class QueryAnalysis:
+    """What the request path needs to know about one query text"""
+
+    __slots__ = ("normalized", "fingerprint", "write_keywords")
+
+    def __init__(self, normalized, fingerprint, write_keywords):
+        # Tokens joined by single spaces, with keyword case folded. Kuzu
+        # names unaliased columns after the parsed expression, so queries
+        # differing only in spacing or keyword case give the same result.
+        self.normalized = normalized
+        # (short hash, text with string and number literals replaced by ?)
+        self.fingerprint = fingerprint
+        # Write clauses and CALL <option> settings found in the query, in
+        # order of appearance
+        self.write_keywords = write_keywords
+
+    @property
+    def read_only(self):
+        return not self.write_keywords
+
+    def cache_key(self, params=None):
+        """Key the query on its normalized text and canonicalized parameters"""
+        canonical_params = json.dumps(
+            params or {}, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return self.normalized + "\0" + canonical_params
+
+
+def _tokens(query):
+    """(kind, text) pairs with whitespace and comments merged into single spaces"""
+    tokens = []
+    for match in _TOKEN.finditer(query):
+        kind = match.lastgroup
+        if kind == "space" or kind == "comment":
+            if tokens and tokens[-1][0] != "space":
+                tokens.append(("space", " "))
+        else:
+            tokens.append((kind, match.group()))
+    if tokens and tokens[-1][0] == "space":
+        tokens.pop()
+    return tokens
+
+
+def _next_token(tokens, i):
+    """Index of the first token after i that is not whitespace, or None"""
+    return next((j for j in range(i + 1, len(tokens)) if tokens[j][0] != "space"), None)
+
+
+def _is_name(tokens, i, previous):
+    """Whether the word at i is used as a name, as in {set: 1}, (set:Label), set.prop or AS set"""
+    if previous in _VARIABLE_PREFIXES:
+        return True
+    after = _next_token(tokens, i)
+    return after is not None and tokens[after][1] in (":", ".")
+
+
+def _setting(tokens, i):
+    """The option changed by CALL at i, as in CALL threads = 1, or None for a procedure call"""
+    option = _next_token(tokens, i)
+    if option is None or tokens[option][0] not in ("word", "quoted"):
+        return None
+    after = _next_token(tokens, option)
+    if after is None or tokens[after][1] != "=":
+        return None
+    return tokens[option][1]
+
+
+@lru_cache(maxsize=4096)
+def analyze_query(query):
+    """Lex a query once into its normalized text, fingerprint and write clauses"""
+    normalized = []
+    fingerprint = []
+    write_keywords = []
+    previous = None
+    tokens = _tokens(query.strip())
+    for i, (kind, token) in enumerate(tokens):
+        if kind == "word" and previous not in _NAME_PREFIXES:
+            upper = token.upper()
+            is_name = _is_name(tokens, i, previous)
+            if upper in WRITE_KEYWORDS and not is_name:
+                write_keywords.append(upper)
+            elif upper == "CALL":
+                option = _setting(tokens, i)
+                if option is not None:
+                    write_keywords.append(f"CALL {option}")
+            if upper in KEYWORDS:
+                # A map key or alias such as {end: 1} keeps its case in the
+                # cache key, where it names a property or column
+                normalized.append(token if is_name else upper)
+                token = upper
+            else:
+                normalized.append(token)
+        elif kind != "space":
+            normalized.append(token)
+        fingerprint.append("?" if kind in ("string", "number") else token)
+        if kind != "space":
+            previous = token.upper() if kind == "word" else token
+
+    fingerprint_text = "".join(fingerprint)
+    return QueryAnalysis(
+        " ".join(normalized),
+        (hashlib.sha1(fingerprint_text.encode()).hexdigest()[:12], fingerprint_text),
+        tuple(write_keywords),
+    )
@@ -0,0 +1,68 @@
+import pyarrow as pa
+
+from .serialize import dumps
+
+# Response formats supported by /query and their media types
+RECORDS = "records"
+COLUMNAR = "columnar"
+ARROW = "arrow"
+
+MEDIA_TYPES = {
+    RECORDS: "application/json",
+    COLUMNAR: "application/json",
+    ARROW: "application/vnd.apache.arrow.stream",
+}
+
+
+def negotiate_format(requested, accept=None):
+    """Pick a response format from the format parameter or the Accept header"""
+    if requested:
+        if requested not in MEDIA_TYPES:
+            raise ValueError(
+                f"Unknown format '{requested}', expected one of: {', '.join(MEDIA_TYPES)}"
+            )
+        return requested
+    if accept and MEDIA_TYPES[ARROW] in accept:
+        return ARROW
+    return RECORDS
+
+
+def arrow_ipc_bytes(table):
+    """Serialize an Arrow table to the Arrow IPC streaming format"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def rows_to_arrow(columns, rows):
+    """Build an Arrow table from rows of Kuzu's Python values.
+
+    Column types are inferred from the values. A column Arrow cannot infer a
+    type for, such as maps with non-string keys, holds the values as JSON.
+    """
+    arrays = []
+    for i in range(len(columns)):
+        values = [row[i] for row in rows]
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            arrays.append(
+                pa.array([None if v is None else dumps(v).decode() for v in values], pa.string())
+            )
+    return pa.Table.from_arrays(arrays, names=columns)
+
+
+def columnar_json_bytes(columns, rows, execution_time_ms, truncated=False):
+    """Serialize result rows as {"columns": [...], "values": [[...], ...]}.
+
+    Values are encoded from Kuzu's Python values like the records format,
+    so nodes, rels and maps have the same keys in both.
+    """
+    document = {
+        "columns": columns,
+        "values": [[row[i] for row in rows] for i in range(len(columns))],
+        "execution_time_ms": execution_time_ms,
+        "truncated": truncated,
+    }
+    return dumps(document)
@@ -0,0 +1,106 @@
+"""HTTP caching for GET responses: ETags, conditional requests and compression.
+
+Results only change when the database snapshot changes, so an ETag made of
+the snapshot version and the request's cache key lets browsers, CDNs and
+edge workers revalidate without the query being run again. The identity,
+gzip and zstd bodies share one ETag, so it is a weak one.
+"""
+import asyncio
+import gzip
+import hashlib
+
+from fastapi.responses import Response
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content codings we can produce, in order of preference
+ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def make_etag(version, key):
+    """A weak ETag for the response to key on a database snapshot, in any content coding"""
+    return f'W/"{version}-{hashlib.sha1(key.encode()).hexdigest()[:16]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Check an If-None-Match header against an ETag using weak comparison"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the preferred content coding allowed by an Accept-Encoding header, or None"""
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, options = item.strip().partition(";")
+        quality = 1.0
+        options = options.strip()
+        if options.startswith("q="):
+            try:
+                quality = float(options[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+async def cacheable_response(
+    request,
+    body,
+    media_type,
+    etag,
+    cache_control,
+    headers=None,
+    min_compress_bytes=1024,
+    compressed_cache=None,
+    thread_min_bytes=64 * 1024,
+):
+    """A response carrying ETag and Cache-Control, compressed if the client accepts it.
+
+    Bodies of at least thread_min_bytes are compressed in a worker thread so
+    the event loop keeps serving. Compressed bodies are kept in
+    compressed_cache, keyed on the ETag and coding, so repeated responses
+    are only compressed once.
+    """
+    headers = dict(headers or {})
+    headers.update(
+        {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept, Accept-Encoding"}
+    )
+    if len(body) >= min_compress_bytes:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            key = etag + "\0" + encoding
+            compressed = compressed_cache.get(key) if compressed_cache is not None else None
+            if compressed is None:
+                if len(body) >= thread_min_bytes:
+                    compressed = await asyncio.to_thread(compress, body, encoding)
+                else:
+                    compressed = compress(body, encoding)
+                if compressed_cache is not None:
+                    compressed_cache.put(key, compressed)
+            body = compressed
+            headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def not_modified(etag, cache_control):
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept, Accept-Encoding"},
+    )
@@ -1,11 +1,67 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from pydantic import BaseModel, Field
 import kuzu
 import os
 from typing import Dict, Any, Optional, List
+import asyncio
+import hmac
+import json
 import logging
-from contextlib import asynccontextmanager
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from .cache import ResultCache, SingleFlight, snapshot_version
+from .cypher import analyze_query
+from .cursors import CursorStore, fetch_encoded_rows, page_body
+from .formats import (
+    ARROW,
+    MEDIA_TYPES,
+    RECORDS,
+    arrow_ipc_bytes,
+    columnar_json_bytes,
+    negotiate_format,
+    rows_to_arrow,
+)
+from .http_cache import (
+    cacheable_response,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from .metrics import PHASES, Metrics
+from .pool import ConnectionPool, PoolExhausted
+from .quran import (
+    NAMED_QUERIES,
+    Chapter,
+    ChapterVerses,
+    VerseDetail,
+    VerseTranslations,
+    fetch_chapter_verses,
+    fetch_chapters,
+    fetch_verse,
+    fetch_verse_translations,
+    chapter_queries,
+    chapters_query,
+    verse_topics_query,
+)
+from .schema import Schema, introspect_schema
+from .serialize import dumps, fetch_records
+from .slowlog import SlowQueryLog, run_plan
+from .snapshots import (
+    SnapshotError,
+    SnapshotInvalid,
+    SnapshotNotFound,
+    SnapshotStore,
+    verify_schema,
+)
+from .warmup import DEFAULT_TABLES, Warmup, load_queries, warm_up
 
 # Configure logging
 logging.basicConfig(
@@ -24,25 +80,246 @@ else:
     # Use a directory in the current working directory
     DB_PATH = os.environ.get("DB_PATH", os.path.join(os.getcwd(), "db_data"))
 
-# Database connection
+# Buffer pool size and query threads of the database (0 = Kuzu defaults).
+# server.py sets these per worker when serving with several processes.
+BUFFER_POOL_MB = int(os.environ.get("KUZU_BUFFER_POOL_MB", 0))
+MAX_DB_THREADS = int(os.environ.get("KUZU_MAX_THREADS", 0))
+
+# Connection pool settings
+POOL_SIZE = int(os.environ.get("KUZU_POOL_SIZE", 4))
+WORKER_THREADS = int(os.environ.get("KUZU_WORKER_THREADS", POOL_SIZE))
+# Threads Kuzu may use per query on each connection (0 = Kuzu default)
+CONNECTION_THREADS = int(os.environ.get("KUZU_CONNECTION_THREADS", 0))
+# Requests allowed to queue for a connection before new ones are shed with
+# a 503, and how long a queued request may wait
+MAX_POOL_WAITERS = int(os.environ.get("MAX_POOL_WAITERS", 64))
+POOL_ACQUIRE_TIMEOUT_MS = int(os.environ.get("POOL_ACQUIRE_TIMEOUT_MS", 5000))
+# Default and maximum query timeouts enforced by Kuzu
+QUERY_TIMEOUT_MS = int(os.environ.get("QUERY_TIMEOUT_MS", 30000))
+MAX_QUERY_TIMEOUT_MS = int(os.environ.get("MAX_QUERY_TIMEOUT_MS", 120000))
+# How often a running query checks whether its client has disconnected
+DISCONNECT_CHECK_MS = int(os.environ.get("DISCONNECT_CHECK_MS", 100))
+# Prepared statements cached per connection for parameterized queries
+PREPARED_CACHE_SIZE = int(os.environ.get("PREPARED_CACHE_SIZE", 128))
+
+# Maximum rows returned for one query; larger results are truncated
+MAX_RESULT_ROWS = int(os.environ.get("MAX_RESULT_ROWS", 10000))
+# Page size used when a cursor is requested without page_size
+DEFAULT_PAGE_SIZE = int(os.environ.get("DEFAULT_PAGE_SIZE", 100))
+# Open cursors kept for paging, how long they live, how much each may buffer
+# and how much all of them may buffer together
+MAX_CURSORS = int(os.environ.get("MAX_CURSORS", 50))
+CURSOR_TTL_SECONDS = float(os.environ.get("CURSOR_TTL_SECONDS", 300))
+MAX_CURSORS_BYTES = int(os.environ.get("MAX_CURSORS_MB", 64)) * 1024 * 1024
+MAX_CURSOR_BYTES = min(
+    int(os.environ.get("MAX_CURSOR_MB", 4)) * 1024 * 1024, MAX_CURSORS_BYTES
+)
+
+# Maximum number of statements accepted by /query/batch
+MAX_BATCH_QUERIES = int(os.environ.get("MAX_BATCH_QUERIES", 50))
+
+# Rows fetched from Kuzu per chunk of a streamed response
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", 500))
+
+# Distinct query fingerprints labelled in /metrics before grouping as "other"
+METRICS_MAX_FINGERPRINTS = int(os.environ.get("METRICS_MAX_FINGERPRINTS", 200))
+
+# Result cache settings
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 1024))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_MB", 64)) * 1024 * 1024
+RESULT_CACHE_TTL_SECONDS = float(os.environ.get("RESULT_CACHE_TTL_SECONDS", 0))
+# Let concurrent identical queries share one execution
+COALESCE_QUERIES = os.environ.get("COALESCE_QUERIES", "true").lower() == "true"
+
+# Cache for the typed verse and chapter endpoints
+ENDPOINT_CACHE_MAX_ENTRIES = int(os.environ.get("ENDPOINT_CACHE_MAX_ENTRIES", 8192))
+ENDPOINT_CACHE_MAX_BYTES = int(os.environ.get("ENDPOINT_CACHE_MAX_MB", 64)) * 1024 * 1024
+# Queries slower than this (queue wait through serialization) are logged
+# and kept for /admin/slow-queries; 0 disables the slow-query log
+SLOW_QUERY_MS = int(os.environ.get("SLOW_QUERY_MS", 1000))
+SLOW_QUERY_LOG_SIZE = int(os.environ.get("SLOW_QUERY_LOG_SIZE", 100))
+# Fraction of slow queries run again in the background to capture their
+# plan, and whether to run them with PROFILE or EXPLAIN
+SLOW_QUERY_PLAN_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_PLAN_SAMPLE_RATE", 0.1))
+SLOW_QUERY_PLAN_MODE = os.environ.get("SLOW_QUERY_PLAN_MODE", "PROFILE").upper()
+# Token required by /admin endpoints in an X-Admin-Token header; unset
+# leaves them open
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# Cache-Control max-age of GET query and endpoint responses; ETags let
+# clients revalidate after that
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.environ.get("HTTP_CACHE_MAX_AGE_SECONDS", 60))
+# Smallest response body compressed for clients that accept gzip or zstd
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+# Bodies at least this large are compressed in a worker thread instead of
+# on the event loop
+COMPRESS_THREAD_MIN_BYTES = int(os.environ.get("COMPRESS_THREAD_MIN_KB", 64)) * 1024
+# Compressed bodies kept so cache hits are not compressed again
+COMPRESSED_CACHE_MAX_BYTES = int(os.environ.get("COMPRESSED_CACHE_MAX_MB", 32)) * 1024 * 1024
+# JSON file of {"name": "query"} served by GET /query/named/{name}, in
+# addition to the queries behind the typed endpoints
+NAMED_QUERIES_FILE = os.environ.get("NAMED_QUERIES_FILE")
+# How often to stat the database files to detect a new snapshot
+SNAPSHOT_CHECK_INTERVAL_SECONDS = float(
+    os.environ.get("SNAPSHOT_CHECK_INTERVAL_SECONDS", 5)
+)
+
+# Versioned snapshots live in SNAPSHOTS_DIR/<version>/SNAPSHOT_DB_NAME and
+# can be switched between without a restart. The version named in
+# SNAPSHOTS_DIR/CURRENT is served; without one, DB_PATH is. SNAPSHOTS_DIR
+# may be a directory inside DB_PATH, which is left out of its version.
+SNAPSHOTS_DIR = os.environ.get("SNAPSHOTS_DIR")
+SNAPSHOT_DB_NAME = os.environ.get("SNAPSHOT_DB_NAME", "quran_graph_db")
+# How long in-flight queries on a replaced snapshot may run before they are
+# interrupted and its connections closed
+SNAPSHOT_DRAIN_TIMEOUT_SECONDS = float(os.environ.get("SNAPSHOT_DRAIN_TIMEOUT_SECONDS", 30))
+
+# Warm-up after startup: tables read in full and a JSON file of canonical
+# queries replayed on every connection before /ready succeeds
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_TABLES = [
+    name.strip()
+    for name in os.environ.get("WARMUP_TABLES", ",".join(DEFAULT_TABLES)).split(",")
+    if name.strip()
+]
+WARMUP_QUERIES_FILE = os.environ.get("WARMUP_QUERIES_FILE")
+
+# Database and connection pool
 db = None
-conn = None
+pool = None
+# Schema introspected once at startup
+schema = None
+# Path of the database being served and its snapshot version, if any
+active_path = None
+active_snapshot = None
+
+snapshots = SnapshotStore(SNAPSHOTS_DIR, SNAPSHOT_DB_NAME) if SNAPSHOTS_DIR else None
+# Held while a snapshot is being opened and switched to
+snapshot_lock = asyncio.Lock()
+# Switch started because another worker changed CURRENT, and a version that
+# failed so it is not retried on every check
+snapshot_task = None
+snapshot_failed = None
+# Closes of replaced snapshots still waiting for their connections to be returned
+closing_snapshots = set()
+# Background captures of slow query plans
+plan_captures = set()
+
+result_cache = ResultCache(
+    max_entries=RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=RESULT_CACHE_MAX_BYTES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+)
+endpoint_cache = ResultCache(
+    max_entries=ENDPOINT_CACHE_MAX_ENTRIES,
+    max_bytes=ENDPOINT_CACHE_MAX_BYTES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+)
+compressed_cache = ResultCache(
+    max_entries=ENDPOINT_CACHE_MAX_ENTRIES,
+    max_bytes=COMPRESSED_CACHE_MAX_BYTES,
+    ttl_seconds=RESULT_CACHE_TTL_SECONDS,
+)
+snapshot_checked_at = 0.0
+
+# Identical queries currently running, shared by concurrent requests
+in_flight = SingleFlight(enabled=COALESCE_QUERIES)
+
+cursors = CursorStore(
+    max_cursors=MAX_CURSORS, ttl_seconds=CURSOR_TTL_SECONDS, max_bytes=MAX_CURSORS_BYTES
+)
+
+metrics = Metrics(max_fingerprints=METRICS_MAX_FINGERPRINTS)
+
+warmup = Warmup()
+
+# Queries served by GET /query/named/{name}
+named_queries = dict(NAMED_QUERIES)
+
+slow_queries = SlowQueryLog(
+    threshold_ms=SLOW_QUERY_MS,
+    max_entries=SLOW_QUERY_LOG_SIZE,
+    plan_sample_rate=SLOW_QUERY_PLAN_SAMPLE_RATE,
+    plan_mode=SLOW_QUERY_PLAN_MODE,
+)
+
+# Queries that were stopped before completing
+query_counters = {"timed_out": 0, "cancelled": 0}
+
+
+def refresh_snapshot_version(force=False):
+    """Invalidate cached results if the database files changed on disk.
+
+    Also starts switching to the snapshot named in CURRENT if another
+    worker process has switched to it.
+    """
+    global snapshot_checked_at, snapshot_task
+    now = time.monotonic()
+    if force or now - snapshot_checked_at >= SNAPSHOT_CHECK_INTERVAL_SECONDS:
+        snapshot_checked_at = now
+        version = snapshot_version(active_path, ignore=SNAPSHOTS_DIR)
+        result_cache.set_version(version)
+        endpoint_cache.set_version(version)
+        compressed_cache.set_version(version)
+
+        if snapshots is not None and not snapshot_lock.locked():
+            current = snapshots.current()
+            if current and current not in (active_snapshot, snapshot_failed):
+                snapshot_task = asyncio.create_task(follow_snapshot(current))
+
+
+def open_database(path):
+    """Open a database read-only with the configured buffer pool and threads"""
+    return kuzu.Database(
+        path,
+        buffer_pool_size=BUFFER_POOL_MB * 1024 * 1024,
+        max_num_threads=MAX_DB_THREADS,
+        read_only=True,
+    )
+
+
+def open_pool(database):
+    return ConnectionPool(
+        database,
+        size=POOL_SIZE,
+        worker_threads=WORKER_THREADS,
+        connection_threads=CONNECTION_THREADS,
+        statement_cache_size=PREPARED_CACHE_SIZE,
+        max_waiters=MAX_POOL_WAITERS,
+        acquire_timeout=POOL_ACQUIRE_TIMEOUT_MS / 1000,
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global db, conn
+    global db, pool, schema, warmup, active_path, active_snapshot
+    warmup = Warmup()
+    startup_time = time.time()
+    active_path = DB_PATH
+    if snapshots is not None:
+        active_snapshot = snapshots.current()
+        if active_snapshot:
+            active_path = snapshots.database_path(active_snapshot)
+            logger.info(f"Serving snapshot {active_snapshot}")
     try:
-        logger.info(f"Connecting to existing database at {DB_PATH}")
+        logger.info(f"Connecting to existing database at {active_path}")
 
         # Connect to the database in read-only mode
         try:
             # Note: Kuzu doesn't have a built-in read-only mode, but we'll ensure
             # our API endpoints don't allow write operations
-            db = kuzu.Database(DB_PATH, read_only=True)
-            conn = kuzu.Connection(db)
-            logger.info("Database connection established")
+            start_time = time.time()
+            db = open_database(active_path)
+            warmup.record("database_open", start_time)
+
+            start_time = time.time()
+            pool = open_pool(db)
+            warmup.record("pool", start_time)
+            logger.info(
+                f"Database connection pool established ({POOL_SIZE} connections, {WORKER_THREADS} worker threads) "
+                f"in process {os.getpid()}"
+            )
         except Exception as db_error:
             logger.error(f"Failed to connect to database: {str(db_error)}")
             raise
@@ -50,13 +327,198 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
 
+    # The database is read-only, so the schema only needs to be read once
+    try:
+        start_time = time.time()
+        schema = Schema(await pool.run(introspect_schema))
+        warmup.record("schema", start_time)
+        logger.info(
+            f"Schema loaded: {len(schema.document['node_tables'])} node tables, "
+            f"{len(schema.document['rel_tables'])} rel tables in {warmup.timings['schema']:.0f} ms"
+        )
+    except Exception as e:
+        warmup.errors.append(f"schema: {str(e)}")
+        logger.error(f"Failed to introspect schema: {str(e)}")
+
+    load_named_queries(schema.document if schema is not None else None)
+    if NAMED_QUERIES_FILE:
+        logger.info(f"Loaded named queries from {NAMED_QUERIES_FILE}")
+
+    # Warm up in the background so /health answers straight away; /ready
+    # only succeeds once this has finished
+    warmup_task = asyncio.create_task(run_warmup(startup_time))
+
     yield
 
     # Shutdown
-    logger.info("Shutting down database connection")
-    # Kuzu handles cleanup automatically when objects are destroyed
-    conn = None
+    for task in (warmup_task, snapshot_task, *closing_snapshots, *plan_captures):
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    logger.info("Shutting down database connection pool")
+    pool.close()
+    pool = None
     db = None
+    schema = None
+
+
+def load_named_queries(schema_document):
+    """Register the typed endpoints' queries that fit the schema, then those from NAMED_QUERIES_FILE"""
+    verses_query, translations_query = chapter_queries(schema_document)
+    queries = {
+        **NAMED_QUERIES,
+        "chapters": chapters_query(schema_document),
+        "chapter_verses": verses_query,
+        "chapter_translations": translations_query,
+    }
+    if verse_topics_query(schema_document) is None:
+        del queries["verse_topics"]
+    if NAMED_QUERIES_FILE:
+        with open(NAMED_QUERIES_FILE) as f:
+            queries.update(json.load(f))
+    named_queries.clear()
+    named_queries.update(queries)
+
+
+async def run_warmup(startup_time):
+    """Warm the buffer pool and statement caches, then mark the service ready"""
+    if WARMUP_ENABLED:
+        start_time = time.time()
+        try:
+            await warm_up(
+                pool,
+                schema.document if schema is not None else None,
+                WARMUP_TABLES,
+                load_queries(
+                    WARMUP_QUERIES_FILE, schema.document if schema is not None else None
+                ),
+                warmup,
+            )
+        except Exception as e:
+            warmup.errors.append(str(e))
+            logger.error(f"Warm-up failed: {str(e)}")
+        warmup.record("warmup", start_time)
+    warmup.record("total", startup_time)
+    warmup.ready = True
+    breakdown = ", ".join(f"{phase}={ms} ms" for phase, ms in warmup.timings.items())
+    logger.info(f"Ready after cold start: {breakdown}")
+
+
+async def switch_snapshot(version):
+    """Open, verify and warm a snapshot, then serve new requests from it.
+
+    The swap itself never awaits, so each request runs entirely on either
+    the old or the new database. The old pool is closed once the queries
+    still running on it finish; if they outlive the drain timeout they are
+    interrupted and the close waits in the background. Raises SnapshotError, leaving the current
+    snapshot in place, if the new one cannot be served.
+    """
+    global db, pool, schema, active_path, active_snapshot, snapshot_failed
+    if snapshot_lock.locked():
+        raise SnapshotError("Another snapshot switch is in progress")
+    async with snapshot_lock:
+        if version == active_snapshot:
+            raise SnapshotError(f"Snapshot {version} is already being served")
+        path = snapshots.database_path(version)
+        logger.info(f"Switching to snapshot {version} at {path}")
+        state = Warmup()
+
+        start_time = time.time()
+        try:
+            new_db = await asyncio.to_thread(open_database, path)
+        except Exception as e:
+            snapshot_failed = version
+            raise SnapshotInvalid(f"Snapshot {version} could not be opened: {str(e)}")
+        state.record("database_open", start_time)
+        new_pool = open_pool(new_db)
+        try:
+            start_time = time.time()
+            new_schema = Schema(await new_pool.run(introspect_schema))
+            state.record("schema", start_time)
+            problems = verify_schema(
+                new_schema.document, schema.document if schema is not None else None
+            )
+            if problems:
+                raise SnapshotInvalid(
+                    f"Snapshot {version} failed verification: {'; '.join(problems)}"
+                )
+
+            if WARMUP_ENABLED:
+                start_time = time.time()
+                await warm_up(
+                    new_pool,
+                    new_schema.document,
+                    WARMUP_TABLES,
+                    load_queries(WARMUP_QUERIES_FILE, new_schema.document),
+                    state,
+                )
+                state.record("warmup", start_time)
+                if state.errors:
+                    raise SnapshotInvalid(
+                        f"Snapshot {version} failed warm-up: {'; '.join(state.errors)}"
+                    )
+        except BaseException as e:
+            if isinstance(e, SnapshotInvalid):
+                snapshot_failed = version
+            await asyncio.to_thread(new_pool.close)
+            new_db.close()
+            raise
+
+        old_db, old_pool, previous = db, pool, active_snapshot
+        db, pool, schema = new_db, new_pool, new_schema
+        load_named_queries(schema.document)
+        active_path, active_snapshot = path, version
+        snapshot_failed = None
+        refresh_snapshot_version(force=True)
+        snapshots.mark_active(version, previous)
+        logger.info(f"Serving snapshot {version}, draining snapshot {previous or DB_PATH}")
+
+        start_time = time.time()
+        drained = await old_pool.drain(SNAPSHOT_DRAIN_TIMEOUT_SECONDS)
+        state.record("drain", start_time)
+        if drained:
+            await close_snapshot(old_pool, old_db, previous or DB_PATH)
+        else:
+            logger.warning(
+                f"Interrupted queries still running on snapshot {previous or DB_PATH}, "
+                "closing it once they return their connections"
+            )
+            task = asyncio.create_task(close_snapshot(old_pool, old_db, previous or DB_PATH))
+            closing_snapshots.add(task)
+            task.add_done_callback(closing_snapshots.discard)
+        breakdown = ", ".join(f"{phase}={ms} ms" for phase, ms in state.timings.items())
+        logger.info(f"Switched to snapshot {version}: {breakdown}")
+        return {
+            "version": version,
+            "previous": previous,
+            "drained": drained,
+            "timings_ms": state.timings,
+        }
+
+
+async def close_snapshot(old_pool, old_db, name):
+    """Close a replaced snapshot once every connection checked out of it is returned.
+
+    Kuzu requires connections and query results to be released before their
+    database is closed, so this waits for streams and interrupted calls
+    however long they take.
+    """
+    await old_pool.drain()
+    await asyncio.to_thread(old_pool.close)
+    old_db.close()
+    logger.info(f"Closed snapshot {name}")
+
+
+async def follow_snapshot(version):
+    """Switch to a snapshot another worker process has switched to"""
+    try:
+        await switch_snapshot(version)
+    except SnapshotError as e:
+        logger.error(f"Could not follow snapshot {version}: {str(e)}")
 
 
 # Create FastAPI app
@@ -80,100 +542,1005 @@ app.add_middleware(
 class CypherQuery(BaseModel):
     query: str
     params: Optional[Dict[str, Any]] = None
+    timeout_ms: Optional[int] = Field(None, gt=0)
+    page_size: Optional[int] = Field(None, gt=0)
+    cursor: Optional[str] = None
 
 
 class QueryResult(BaseModel):
     data: List[Dict[str, Any]]
     columns: List[str]
     execution_time_ms: float
+    truncated: bool = False
+    next_cursor: Optional[str] = None
+
+
+class BatchQuery(BaseModel):
+    queries: List[CypherQuery]
+
+
+class BatchItemResult(BaseModel):
+    data: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[List[str]] = None
+    execution_time_ms: float
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+class BatchResult(BaseModel):
+    results: List[BatchItemResult]
+    execution_time_ms: float
 
 
 # Event handlers are now managed by the lifespan context manager
 
 
+def run_query(conn, query, params=None, timeout_ms=None, max_rows=None, profile=None):
+    """Execute a query on a pooled connection (runs in a worker thread).
+
+    If a profile dict is given, the execute and fetch times (in seconds) and
+    the row count are recorded in it.
+    """
+    start_time = time.time()
+
+    # Execute the query
+    result = start_query(conn, query, params, timeout_ms)
+    executed_time = time.time()
+
+    # Convert result to list of dictionaries, only fetching the rows we
+    # are going to return
+    columns = result.get_column_names()
+    truncated = max_rows is not None and result.get_num_tuples() > max_rows
+    data = fetch_records(result, columns, max_rows if truncated else None)
+
+    end_time = time.time()
+    execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
+    if profile is not None:
+        profile.update(
+            execute=executed_time - start_time,
+            fetch=end_time - executed_time,
+            rows=len(data),
+        )
+
+    return {
+        "data": data,
+        "columns": columns,
+        "execution_time_ms": execution_time,
+        "truncated": truncated,
+    }
+
+
+def run_records_query(conn, query, params, timeout_ms, max_rows, profile=None):
+    """Execute a query and encode it as a QueryResult JSON document (runs in a worker thread)"""
+    result = run_query(conn, query, params, timeout_ms, max_rows, profile)
+    serialize_start = time.time()
+    body = dumps(result)
+    if profile is not None:
+        profile["serialize"] = time.time() - serialize_start
+    return body
+
+
+def run_paged_query(conn, query, params, timeout_ms, page_size, profile=None):
+    """Execute a query and split its rows into a first page and a cursor buffer (runs in a worker thread)"""
+    start_time = time.time()
+    result = start_query(conn, query, params, timeout_ms)
+    executed_time = time.time()
+    columns = result.get_column_names()
+
+    page, _ = fetch_encoded_rows(result, columns, page_size)
+    rest, rest_size = fetch_encoded_rows(
+        result, columns, MAX_RESULT_ROWS - len(page), MAX_CURSOR_BYTES
+    )
+    if profile is not None:
+        profile.update(
+            execute=executed_time - start_time,
+            fetch=time.time() - executed_time,
+            rows=len(page),
+        )
+    return {
+        "columns": columns,
+        "page": page,
+        "rest": rest,
+        "rest_size": rest_size,
+        "truncated": result.has_next(),
+        "execution_time_ms": (time.time() - start_time) * 1000,
+    }
+
+
+def check_read_only(analysis):
+    """Reject queries that would write to the database or change connection settings"""
+    if not analysis.read_only:
+        metrics.observe_error("write_rejected")
+        raise HTTPException(
+            status_code=403,
+            detail=f"Write operations and setting changes are not allowed ({', '.join(analysis.write_keywords)}). "
+            "This API provides read-only access to the database.",
+        )
+
+
+def query_timeout(query_data):
+    """The timeout in milliseconds to enforce for a query"""
+    return min(query_data.timeout_ms or QUERY_TIMEOUT_MS, MAX_QUERY_TIMEOUT_MS)
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client goes away while its query is running"""
+
+
+def query_error(e, timeout_ms=None):
+    """Map a failed query to an HTTP error"""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, PoolExhausted):
+        metrics.observe_error("shed")
+        return HTTPException(
+            status_code=503,
+            detail=f"Server is busy, try again later: {str(e)}",
+            headers={"Retry-After": "1"},
+        )
+    if isinstance(e, ClientDisconnected):
+        metrics.observe_error("cancelled")
+        return HTTPException(status_code=499, detail="Client disconnected")
+    if "Interrupted" in str(e):
+        query_counters["timed_out"] += 1
+        metrics.observe_error("timeout")
+        return HTTPException(
+            status_code=504, detail=f"Query timed out after {timeout_ms} ms"
+        )
+    metrics.observe_error("query")
+    logger.error(f"Query execution error: {str(e)}")
+    return HTTPException(status_code=400, detail=f"Query execution failed: {str(e)}")
+
+
+def record_query(fingerprint, profile, size, source, query=None, params=None, timeout_ms=None):
+    """Record metrics for an executed query, logging it if it was slow.
+
+    For a sample of slow queries with known text, the plan is captured in
+    the background.
+    """
+    metrics.observe_query(fingerprint, profile, size)
+    total_ms = sum(profile.get(phase, 0) for phase in PHASES) * 1000
+    if not slow_queries.is_slow(total_ms):
+        return
+    entry = slow_queries.record(fingerprint, params, profile, total_ms, source)
+    if query is not None and slow_queries.should_capture_plan():
+        slow_queries.capturing = True
+        # The event loop only keeps weak references to tasks
+        task = asyncio.create_task(capture_plan(entry, query, params, timeout_ms))
+        plan_captures.add(task)
+        task.add_done_callback(plan_captures.discard)
+
+
+async def capture_plan(entry, query, params, timeout_ms):
+    """Run a slow query again under PROFILE or EXPLAIN and attach the plan to its log entry"""
+    try:
+        # Don't take a connection from requests that are already waiting
+        if pool is None or pool.stats()["waiters"]:
+            return
+        entry["plan"] = await pool.run(
+            run_plan, query, params, slow_queries.plan_mode, timeout_ms
+        )
+        slow_queries.plans_captured += 1
+    except Exception as e:
+        slow_queries.plans_failed += 1
+        logger.warning(f"Failed to capture plan of slow query {entry['fingerprint']}: {str(e)}")
+    finally:
+        slow_queries.capturing = False
+
+
+async def call_until_disconnected(request, lease, fn, *args):
+    """Run fn on a leased connection, giving up if the client disconnects.
+
+    The caller must then leave the lease, which interrupts the query still
+    running in Kuzu.
+    """
+    call = asyncio.ensure_future(lease.call(fn, *args))
+    while True:
+        done, _ = await asyncio.wait({call}, timeout=DISCONNECT_CHECK_MS / 1000)
+        if done:
+            return call.result()
+        if await request.is_disconnected():
+            query_counters["cancelled"] += 1
+            call.cancel()
+            raise ClientDisconnected()
+
+
+async def run_until_disconnected(request, fn, *args, profile=None):
+    """Run fn on a pooled connection, interrupting the query if the client disconnects"""
+    async with pool.connection() as lease:
+        if profile is not None:
+            profile["queue_wait"] = lease.wait_ms / 1000
+        return await call_until_disconnected(request, lease, fn, *args)
+
+
+def start_query(conn, query, params=None, timeout_ms=None):
+    """Execute a query without fetching its rows (runs in a worker thread)"""
+    # Connections are reused, so always reset the timeout (0 disables it)
+    conn.set_query_timeout(timeout_ms or 0)
+    if params:
+        return conn.execute(query, dict(params))
+    return conn.execute(query)
+
+
+def run_table_query(
+    conn, query, params, response_format, timeout_ms=None, profile=None
+):
+    """Execute a query and serialize it in the columnar or Arrow format (runs in a worker thread).
+
+    Returns the body and whether rows beyond MAX_RESULT_ROWS were dropped.
+    Columnar values are read from the row iterator, like records. Arrow
+    tables come from Kuzu's Arrow export, which converts a whole result at
+    once, so a larger result is read row by row up to the limit instead
+    and its types are inferred.
+    """
+    start_time = time.time()
+    result = start_query(conn, query, params, timeout_ms)
+    executed_time = time.time()
+    truncated = result.get_num_tuples() > MAX_RESULT_ROWS
+    columns = result.get_column_names()
+    if response_format != ARROW:
+        rows = result.get_n(MAX_RESULT_ROWS)
+    elif truncated:
+        table = rows_to_arrow(columns, result.get_n(MAX_RESULT_ROWS))
+    else:
+        table = result.get_as_arrow(chunk_size=0)
+    fetched_time = time.time()
+
+    if response_format == ARROW:
+        body = arrow_ipc_bytes(table)
+        row_count = table.num_rows
+    else:
+        body = columnar_json_bytes(
+            columns, rows, (fetched_time - start_time) * 1000, truncated
+        )
+        row_count = len(rows)
+    if profile is not None:
+        profile.update(
+            execute=executed_time - start_time,
+            fetch=fetched_time - executed_time,
+            serialize=time.time() - fetched_time,
+            rows=row_count,
+        )
+    return body, truncated
+
+
+def fetch_ndjson_chunk(conn, result, columns, size):
+    """Fetch up to size rows and encode them as NDJSON (runs in a worker thread)"""
+    lines = []
+    while len(lines) < size and result.has_next():
+        lines.append(dumps(dict(zip(columns, result.get_next()))))
+    return len(lines), b"".join(line + b"\n" for line in lines)
+
+
 @app.post("/query", response_model=QueryResult)
-async def execute_query(query_data: CypherQuery):
-    global conn
-    if conn is None:
+async def execute_query(
+    query_data: CypherQuery,
+    request: Request,
+    response_format: Optional[str] = Query(None, alias="format"),
+):
+    """Execute a read-only Cypher query.
+
+    The result is returned as JSON records by default. Pass format=columnar
+    for {"columns": [...], "values": [[...], ...]}, or format=arrow (or an
+    Accept: application/vnd.apache.arrow.stream header) for an Arrow IPC
+    stream built directly from Kuzu's Arrow export.
+
+    At most MAX_RESULT_ROWS rows are returned; larger results are flagged as
+    truncated (an X-Truncated header for Arrow). Pass page_size to page
+    through a result: the response carries a next_cursor to send back with
+    the same query to get the following page.
+    """
+    if pool is None:
         raise HTTPException(
             status_code=500, detail="Database connection not established"
         )
 
-    # Check if the query is read-only
-    query = query_data.query.strip().upper()
-    if query.startswith(
-        ("CREATE", "DROP", "ALTER", "DELETE", "REMOVE", "SET", "MERGE")
-    ):
+    analysis = analyze_query(query_data.query)
+    check_read_only(analysis)
+    response_format = request_format(request, response_format)
+
+    if query_data.page_size is not None or query_data.cursor is not None:
+        if response_format != RECORDS:
+            raise HTTPException(
+                status_code=400, detail="Paging is only supported for the records format"
+            )
+        return await execute_paged_query(query_data, analysis, request)
+
+    body, headers = await answer_query(
+        request,
+        analysis,
+        query_data.query,
+        query_data.params,
+        query_timeout(query_data),
+        response_format,
+    )
+    return Response(content=body, media_type=MEDIA_TYPES[response_format], headers=headers)
+
+
+def request_format(request, response_format):
+    """The response format from the format parameter or the Accept header"""
+    try:
+        return negotiate_format(response_format, request.headers.get("accept"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def answer_query(
+    request, analysis, query, params, timeout_ms, response_format, source="query"
+):
+    """Serve a query from the result cache or run it, returning the body and response headers.
+
+    Identical queries arriving while one is running wait for it and share
+    its response instead of running again. source labels the execution in
+    the slow-query log.
+    """
+    # Serve identical read-only queries from the result cache
+    fingerprint = analysis.fingerprint
+    key = analysis.cache_key(params) + "\0" + response_format
+    refresh_snapshot_version()
+    version = result_cache.version
+    body = result_cache.get(key)
+    if body is not None:
+        metrics.observe_query(fingerprint, {}, len(body), cache="hit")
+        return body, {"X-Cache": "HIT"}
+
+    async def execute():
+        profile = {}
+        try:
+            if response_format == RECORDS:
+                body = await run_until_disconnected(
+                    request,
+                    run_records_query,
+                    query,
+                    params,
+                    timeout_ms,
+                    MAX_RESULT_ROWS,
+                    profile,
+                    profile=profile,
+                )
+            else:
+                body, truncated = await run_until_disconnected(
+                    request,
+                    run_table_query,
+                    query,
+                    params,
+                    response_format,
+                    timeout_ms,
+                    profile,
+                    profile=profile,
+                )
+        except ClientDisconnected:
+            # Only concerns this request; requests sharing it run it again
+            raise
+        except Exception as e:
+            raise query_error(e, timeout_ms)
+
+        record_query(fingerprint, profile, len(body), source, query, params, timeout_ms)
+
+        if response_format == ARROW and truncated:
+            # Truncated Arrow results are not cached so the header is never lost
+            return body, {"X-Truncated": "true"}
+        result_cache.put(key, body, version)
+        return body, {}
+
+    try:
+        # Requests only share executions on the same snapshot and with the
+        # same timeout, so nobody waits longer or gives up sooner than asked
+        (body, headers), shared = await in_flight.do(
+            f"{version}\0{timeout_ms}\0{key}", execute, retry_on=ClientDisconnected
+        )
+    except ClientDisconnected as e:
+        raise query_error(e)
+    if shared:
+        metrics.observe_query(fingerprint, {}, len(body), cache="coalesced")
+    return body, {**headers, "X-Cache": "COALESCED" if shared else "MISS"}
+
+
+def parse_params(params):
+    """Decode the JSON-encoded params of a GET query"""
+    if not params:
+        return None
+    try:
+        params = json.loads(params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"params is not valid JSON: {str(e)}")
+    if not isinstance(params, dict):
+        raise HTTPException(status_code=400, detail="params must be a JSON object")
+    return params
+
+
+async def cacheable_query(request, query, params, response_format):
+    """Answer a GET query with an ETag, answering 304 without running it if the client's copy is current"""
+    if pool is None:
         raise HTTPException(
-            status_code=403,
-            detail="Write operations are not allowed. This API provides read-only access to the database.",
+            status_code=500, detail="Database connection not established"
+        )
+
+    analysis = analyze_query(query)
+    check_read_only(analysis)
+    response_format = request_format(request, response_format)
+
+    refresh_snapshot_version()
+    etag = make_etag(
+        result_cache.version, analysis.cache_key(params) + "\0" + response_format
+    )
+    cache_control = f"public, max-age={HTTP_CACHE_MAX_AGE_SECONDS}"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        metrics.observe_query(analysis.fingerprint, {}, 0, cache="not_modified")
+        return not_modified(etag, cache_control)
+
+    body, headers = await answer_query(
+        request, analysis, query, params, QUERY_TIMEOUT_MS, response_format
+    )
+    return await http_response(
+        request, body, MEDIA_TYPES[response_format], etag, cache_control, headers
+    )
+
+
+async def http_response(request, body, media_type, etag, cache_control, headers=None):
+    """A cacheable GET response, compressed and cached per the server's settings"""
+    return await cacheable_response(
+        request,
+        body,
+        media_type,
+        etag,
+        cache_control,
+        headers,
+        COMPRESS_MIN_BYTES,
+        compressed_cache,
+        COMPRESS_THREAD_MIN_BYTES,
+    )
+
+
+@app.get("/query", response_model=QueryResult)
+async def execute_query_get(
+    request: Request,
+    query: str = Query(...),
+    params: Optional[str] = Query(None),
+    response_format: Optional[str] = Query(None, alias="format"),
+):
+    """Execute a read-only Cypher query given in the URL, with params as a JSON object.
+
+    Unlike POST /query the response can be cached by browsers and CDNs: it
+    carries an ETag for the snapshot and query, and a request whose
+    If-None-Match matches gets 304 Not Modified without running the query.
+    """
+    return await cacheable_query(request, query, parse_params(params), response_format)
+
+
+@app.get("/query/named/{name}", response_model=QueryResult)
+async def execute_named_query(
+    name: str,
+    request: Request,
+    params: Optional[str] = Query(None),
+    response_format: Optional[str] = Query(None, alias="format"),
+):
+    """Execute a registered query by name, with params as a JSON object.
+
+    Cached like GET /query, with shorter URLs and only vetted queries.
+    """
+    query = named_queries.get(name)
+    if query is None:
+        raise HTTPException(status_code=404, detail=f"Unknown named query '{name}'")
+    return await cacheable_query(request, query, parse_params(params), response_format)
+
+
+async def execute_paged_query(query_data, analysis, request):
+    """Return one page of a query result, opening a cursor for the rest"""
+    key = analysis.cache_key(query_data.params)
+    page_size = min(query_data.page_size or DEFAULT_PAGE_SIZE, MAX_RESULT_ROWS)
+
+    if query_data.cursor is not None:
+        found = cursors.get(query_data.cursor)
+        if found is None:
+            raise HTTPException(
+                status_code=410,
+                detail="Cursor is unknown or has expired, run the query again",
+            )
+        cursor_id, cursor, offset = found
+        if cursor.key != key:
+            raise HTTPException(
+                status_code=400, detail="Cursor does not belong to this query"
+            )
+
+        start_time = time.time()
+        end = offset + page_size
+        next_cursor = None
+        if end < len(cursor.rows):
+            next_cursor = cursors.token(cursor_id, end)
+        else:
+            cursors.close(cursor_id)
+        body = page_body(
+            cursor.rows[offset:end],
+            cursor.columns,
+            (time.time() - start_time) * 1000,
+            cursor.truncated,
+            next_cursor,
+        )
+        return Response(content=body, media_type="application/json")
+
+    timeout_ms = query_timeout(query_data)
+    profile = {}
+    try:
+        page = await run_until_disconnected(
+            request,
+            run_paged_query,
+            query_data.query,
+            query_data.params,
+            timeout_ms,
+            page_size,
+            profile,
+            profile=profile,
         )
+    except Exception as e:
+        raise query_error(e, timeout_ms)
+
+    next_cursor = None
+    if page["rest"]:
+        next_cursor = cursors.open(
+            key, page["columns"], page["rest"], page["rest_size"], page["truncated"]
+        )
+    body = page_body(
+        page["page"],
+        page["columns"],
+        page["execution_time_ms"],
+        page["truncated"],
+        next_cursor,
+    )
+    record_query(
+        analysis.fingerprint,
+        profile,
+        len(body),
+        "query_paged",
+        query_data.query,
+        query_data.params,
+        timeout_ms,
+    )
+    return Response(content=body, media_type="application/json")
+
 
+async def run_batch_item(request, query_data, limit):
+    """Answer one statement of a batch as /query would, reporting failure instead of raising.
+
+    Returns the encoded result. At most limit's worth of statements of one
+    batch run at a time, so a batch never queues more than that for the pool.
+    """
+    start_time = time.time()
+    timeout_ms = query_timeout(query_data)
     try:
-        import time
+        analysis = analyze_query(query_data.query)
+        check_read_only(analysis)
+        async with limit:
+            body, _ = await answer_query(
+                request,
+                analysis,
+                query_data.query,
+                query_data.params,
+                timeout_ms,
+                RECORDS,
+                "query_batch",
+            )
+        return body
+    except Exception as e:
+        error = query_error(e, timeout_ms).detail
+    return dumps({"execution_time_ms": (time.time() - start_time) * 1000, "error": error})
+
+
+@app.post("/query/batch", response_model=BatchResult)
+async def execute_batch(batch: BatchQuery, request: Request):
+    """Execute several queries concurrently in one round trip.
 
+    Results are returned in request order. Statements share the result cache
+    and coalescing of /query, and at most POOL_SIZE of them run at once. A
+    failing statement gets an error entry without failing the rest of the
+    batch.
+    """
+    if pool is None:
+        raise HTTPException(
+            status_code=500, detail="Database connection not established"
+        )
+    if len(batch.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {MAX_BATCH_QUERIES} queries",
+        )
+
+    start_time = time.time()
+    limit = asyncio.Semaphore(POOL_SIZE)
+    results = await asyncio.gather(
+        *(run_batch_item(request, q, limit) for q in batch.queries)
+    )
+    execution_time = (time.time() - start_time) * 1000
+
+    # Each result is already an encoded QueryResult or error document
+    return Response(
+        content=b'{"results":['
+        + b",".join(results)
+        + b'],"execution_time_ms":'
+        + dumps(execution_time)
+        + b"}",
+        media_type="application/json",
+    )
+
+
+@app.post("/query/stream")
+async def stream_query(query_data: CypherQuery, request: Request):
+    """Execute a query and stream its rows as newline-delimited JSON.
+
+    Each row is written as one JSON object keyed by column name. The last
+    line is a {"stats": {...}} object with the column names, row count and
+    execution time, or an {"error": ...} object if fetching failed midway.
+    """
+    if pool is None:
+        raise HTTPException(
+            status_code=500, detail="Database connection not established"
+        )
+
+    analysis = analyze_query(query_data.query)
+    check_read_only(analysis)
+
+    # The connection stays checked out until the whole result is streamed.
+    # If the client disconnects, closing the stream interrupts the query.
+    timeout_ms = query_timeout(query_data)
+    profile = {}
+    stack = AsyncExitStack()
+    try:
+        lease = await stack.enter_async_context(pool.connection())
+        profile["queue_wait"] = lease.wait_ms / 1000
         start_time = time.time()
+        result = await call_until_disconnected(
+            request, lease, start_query, query_data.query, query_data.params, timeout_ms
+        )
+        profile["execute"] = time.time() - start_time
+    except Exception as e:
+        await stack.aclose()
+        raise query_error(e, timeout_ms)
+
+    async def rows():
+        try:
+            columns = result.get_column_names()
+            row_count = 0
+            size = 0
+            while True:
+                count, chunk = await lease.call(
+                    fetch_ndjson_chunk, result, columns, STREAM_CHUNK_ROWS
+                )
+                if not count:
+                    break
+                row_count += count
+                size += len(chunk)
+                yield chunk
+
+            profile["fetch"] = time.time() - start_time - profile["execute"]
+            profile["rows"] = row_count
+            record_query(
+                analysis.fingerprint,
+                profile,
+                size,
+                "query_stream",
+                query_data.query,
+                query_data.params,
+                timeout_ms,
+            )
+
+            stats = {
+                "columns": columns,
+                "row_count": row_count,
+                "execution_time_ms": (time.time() - start_time) * 1000,
+            }
+            yield dumps({"stats": stats}) + b"\n"
+        except Exception as e:
+            logger.error(f"Query streaming error: {str(e)}")
+            yield dumps({"error": str(e)}) + b"\n"
+        finally:
+            await stack.aclose()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+async def serve_endpoint(request, name, route, key, fn, *args):
+    """Serve a typed endpoint from its cache or by running fn on a pooled connection.
 
-        # Execute the query
-        if query_data.params:
-            # Prepare parameters for the query
-            params = {}
-            for key, value in query_data.params.items():
-                params[key] = value
-            result = conn.execute(query_data.query, params)
+    fn returns a response model; LookupError from it becomes a 404. Metrics
+    are recorded under the endpoint name rather than a query fingerprint.
+    """
+    if pool is None:
+        raise HTTPException(
+            status_code=500, detail="Database connection not established"
+        )
+
+    fingerprint = (name, route)
+    refresh_snapshot_version()
+    version = endpoint_cache.version
+    etag = make_etag(version, key)
+    cache_control = f"public, max-age={HTTP_CACHE_MAX_AGE_SECONDS}"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        metrics.observe_query(fingerprint, {}, 0, cache="not_modified")
+        return not_modified(etag, cache_control)
+
+    body = endpoint_cache.get(key)
+    if body is not None:
+        metrics.observe_query(fingerprint, {}, len(body), cache="hit")
+        return await http_response(
+            request, body, "application/json", etag, cache_control, {"X-Cache": "HIT"}
+        )
+
+    async def execute():
+        profile = {}
+        try:
+            model = await run_until_disconnected(
+                request, fn, *args, QUERY_TIMEOUT_MS, profile, profile=profile
+            )
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ClientDisconnected:
+            raise
+        except Exception as e:
+            raise query_error(e, QUERY_TIMEOUT_MS)
+
+        serialize_start = time.time()
+        if isinstance(model, list):
+            body = dumps([item.model_dump() for item in model])
         else:
-            result = conn.execute(query_data.query)
+            body = model.model_dump_json().encode()
+        profile["serialize"] = time.time() - serialize_start
+        record_query(fingerprint, profile, len(body), name)
 
-        # Convert result to list of dictionaries
-        data = []
-        columns = result.get_column_names()
+        endpoint_cache.put(key, body, version)
+        return body
 
-        # Get results as dataframe and convert to dict
-        df = result.get_as_df()
-        if not df.empty:
-            data = df.to_dict(orient="records")
+    try:
+        body, shared = await in_flight.do(
+            f"endpoint\0{version}\0{QUERY_TIMEOUT_MS}\0{key}",
+            execute,
+            retry_on=ClientDisconnected,
+        )
+    except ClientDisconnected as e:
+        raise query_error(e)
+    if shared:
+        metrics.observe_query(fingerprint, {}, len(body), cache="coalesced")
+    return await http_response(
+        request, body, "application/json", etag, cache_control,
+        {"X-Cache": "COALESCED" if shared else "MISS"},
+    )
 
-        execution_time = (time.time() - start_time) * 1000  # Convert to milliseconds
 
-        return {"data": data, "columns": columns, "execution_time_ms": execution_time}
-    except Exception as e:
-        logger.error(f"Query execution error: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"Query execution failed: {str(e)}")
+@app.get("/chapters", response_model=List[Chapter])
+async def get_chapters(request: Request):
+    """All chapters ordered by chapter number"""
+    return await serve_endpoint(
+        request,
+        "chapters",
+        "GET /chapters",
+        "chapters",
+        fetch_chapters,
+        chapters_query(schema.document if schema is not None else None),
+    )
+
+
+@app.get("/chapter/{chapter_number}/verses", response_model=ChapterVerses)
+async def get_chapter_verses(
+    chapter_number: int,
+    request: Request,
+    language: str = Query("en"),
+):
+    """Verses of a chapter in order, each with its translations in one language"""
+    return await serve_endpoint(
+        request,
+        "chapter_verses",
+        "GET /chapter/{chapter_number}/verses",
+        f"chapter\0{chapter_number}\0{language}",
+        fetch_chapter_verses,
+        chapter_number,
+        language,
+        chapter_queries(schema.document if schema is not None else None),
+    )
+
+
+@app.get("/verse/{verse_key}", response_model=VerseDetail)
+async def get_verse(
+    verse_key: str,
+    request: Request,
+    language: Optional[str] = Query(None),
+    tafsirs: bool = Query(True),
+):
+    """A verse with its topics, translations (optionally in one language) and tafsirs.
+
+    Pass tafsirs=false to leave out the tafsir texts, which are by far the
+    largest part of the response.
+    """
+    return await serve_endpoint(
+        request,
+        "verse",
+        "GET /verse/{verse_key}",
+        f"verse\0{verse_key}\0{language or ''}\0{tafsirs}",
+        fetch_verse,
+        verse_key,
+        language,
+        tafsirs,
+        verse_topics_query(schema.document if schema is not None else None),
+    )
+
+
+@app.get("/verse/{verse_key}/translations", response_model=VerseTranslations)
+async def get_verse_translations(
+    verse_key: str,
+    request: Request,
+    language: Optional[str] = Query(None),
+):
+    """Translations of a verse, optionally in one language"""
+    return await serve_endpoint(
+        request,
+        "verse_translations",
+        "GET /verse/{verse_key}/translations",
+        f"translations\0{verse_key}\0{language or ''}",
+        fetch_verse_translations,
+        verse_key,
+        language,
+    )
+
+
+@app.get("/schema")
+async def get_schema(request: Request):
+    """Node and rel tables with properties, primary keys, connectivity and row counts"""
+    if schema is None:
+        raise HTTPException(status_code=503, detail="Schema is not available")
+
+    cache_control = "public, no-cache"
+    if etag_matches(request.headers.get("if-none-match"), schema.etag):
+        return not_modified(schema.etag, cache_control)
+    return await http_response(
+        request, schema.body, "application/json", schema.etag, cache_control
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics: per-phase query latency by fingerprint, rows, bytes, errors and pool gauges"""
+    return PlainTextResponse(
+        metrics.render(
+            pool.stats() if pool is not None else None, result_cache.stats()
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
 
 
 @app.get("/sync-instructions")
 async def sync_instructions():
     """Provide instructions for manually syncing the database from S3"""
+    if snapshots is None:
+        return {
+            "message": "Manual sync instructions",
+            "steps": [
+                "1. SSH into the container: flyctl ssh console -a kuzu-api",
+                "2. Configure AWS CLI: aws configure",
+                "3. Enter AWS credentials when prompted:",
+                f"4. Sync the database: aws s3 cp s3://quranlabs/quran_graph_db/ {DB_PATH}/ --recursive --endpoint-url=https://fly.storage.tigris.dev",
+                "5. Restart the app: exit and run 'flyctl apps restart kuzu-api'",
+            ],
+        }
     return {
         "message": "Manual sync instructions",
         "steps": [
             "1. SSH into the container: flyctl ssh console -a kuzu-api",
             "2. Configure AWS CLI: aws configure",
             "3. Enter AWS credentials when prompted:",
-            "4. Sync the database: aws s3 cp s3://quranlabs/quran_graph_db/ /app/database/ --recursive --endpoint-url=https://fly.storage.tigris.dev",
-            "5. Restart the app: exit and run 'flyctl apps restart kuzu-api'",
+            f"4. Download the new version: aws s3 cp s3://quranlabs/quran_graph_db/ {snapshots.root}/<version>/{snapshots.db_name}/ --recursive --endpoint-url=https://fly.storage.tigris.dev",
+            "5. Switch to it: curl -X POST localhost:$PORT/admin/snapshots/activate -H \"X-Admin-Token: $ADMIN_TOKEN\" -H 'Content-Type: application/json' -d '{\"version\": \"<version>\"}'",
+            "6. If it misbehaves, switch back: curl -X POST localhost:$PORT/admin/snapshots/rollback -H \"X-Admin-Token: $ADMIN_TOKEN\"",
         ],
     }
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
-    global conn
+    """Liveness check that never waits for a pooled connection.
+
+    Whether the database can serve queries is reported by /ready.
+    """
+    return {"status": "healthy", "message": "Service is running"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check that only succeeds once startup warm-up has finished"""
+    if pool is None or not warmup.ready:
+        return JSONResponse(status_code=503, content=warmup.status())
+    return warmup.status()
+
+
+def require_admin(request):
+    """Reject admin requests without the configured ADMIN_TOKEN.
+
+    The admin endpoints do not exist unless a token is configured.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("x-admin-token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Admin token required")
+
+
+@app.get("/admin/slow-queries")
+async def get_slow_queries(request: Request):
+    """Recent slow queries, newest first, with phase timings and any captured plan"""
+    require_admin(request)
+    return {"stats": slow_queries.stats(), "queries": slow_queries.entries()}
+
+
+class SnapshotSwitch(BaseModel):
+    version: str
+
+
+def snapshot_error(e):
+    if isinstance(e, SnapshotNotFound):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, SnapshotInvalid):
+        return HTTPException(status_code=422, detail=str(e))
+    return HTTPException(status_code=409, detail=str(e))
+
+
+def require_snapshots():
+    if snapshots is None:
+        raise HTTPException(
+            status_code=404, detail="Snapshots are not enabled, set SNAPSHOTS_DIR"
+        )
+
+
+@app.get("/admin/snapshots")
+async def get_snapshots(request: Request):
+    """Snapshot versions on disk, the one being served and the rollback target"""
+    require_admin(request)
+    require_snapshots()
+    return {
+        "active": active_snapshot,
+        "path": active_path,
+        "previous": snapshots.previous(),
+        "switching": snapshot_lock.locked(),
+        "versions": snapshots.versions(),
+    }
+
+
+@app.post("/admin/snapshots/activate")
+async def activate_snapshot(switch: SnapshotSwitch, request: Request):
+    """Switch to a snapshot version without a restart"""
+    require_admin(request)
+    require_snapshots()
     try:
-        if conn is None:
-            return {"status": "error", "message": "Database connection not established"}
-
-        # Execute a simple query to check if the database is responsive
-        result = conn.execute("RETURN 1 as test")
-        data = result.get_as_df()
-        if data.iloc[0]["test"] == 1:
-            return {"status": "healthy", "message": "Database connection is working"}
-        else:
-            return {
-                "status": "error",
-                "message": "Database query returned unexpected result",
-            }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        return {"status": "error", "message": f"Health check failed: {str(e)}"}
+        return await switch_snapshot(switch.version)
+    except SnapshotError as e:
+        raise snapshot_error(e)
+
+
+@app.post("/admin/snapshots/rollback")
+async def rollback_snapshot(request: Request):
+    """Switch back to the snapshot that was served before the current one"""
+    require_admin(request)
+    require_snapshots()
+    previous = snapshots.previous()
+    if not previous or previous == active_snapshot:
+        raise HTTPException(status_code=409, detail="There is no previous snapshot to roll back to")
+    try:
+        return await switch_snapshot(previous)
+    except SnapshotError as e:
+        raise snapshot_error(e)
+
+
+@app.get("/stats")
+async def stats():
+    """Connection pool, result cache, query and cursor statistics"""
+    if pool is None:
+        raise HTTPException(
+            status_code=500, detail="Database connection not established"
+        )
+    return {
+        "pool": pool.stats(),
+        "cache": result_cache.stats(),
+        "endpoint_cache": endpoint_cache.stats(),
+        "compressed_cache": compressed_cache.stats(),
+        "queries": dict(query_counters),
+        "cursors": cursors.stats(),
+        "coalescing": in_flight.stats(),
+        "query_analysis": analyze_query.cache_info()._asdict(),
+        "slow_queries": slow_queries.stats(),
+    }
@@ -0,0 +1,149 @@
+"""Prometheus metrics rendered in the text exposition format.
+
+Everything here is updated from the event loop only, so plain dicts are
+enough and recording a query costs a handful of dictionary operations.
+"""
+import bisect
+
+# Latency buckets in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Phases of a query recorded in kuzu_api_query_phase_seconds
+PHASES = ("queue_wait", "execute", "fetch", "serialize")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *label_values, amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in self.values.items():
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self.values = {}
+
+    def observe(self, value, *label_values):
+        entry = self.values.get(label_values)
+        if entry is None:
+            entry = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                labels = _labels(self.labels + ("le",), label_values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def gauge(name, help_text, value):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+
+class Metrics:
+    """Query metrics labelled by query fingerprint.
+
+    At most max_fingerprints distinct fingerprints get their own label;
+    later ones are grouped under "other" to bound cardinality.
+    """
+
+    def __init__(self, max_fingerprints=200):
+        self.max_fingerprints = max_fingerprints
+        self.fingerprints = {}
+
+        self.phase_seconds = Histogram(
+            "kuzu_api_query_phase_seconds",
+            "Time spent in each phase of a query",
+            ("phase", "fingerprint"),
+        )
+        self.queries = Counter(
+            "kuzu_api_queries_total", "Queries answered", ("fingerprint", "cache")
+        )
+        self.rows = Counter(
+            "kuzu_api_query_rows_total", "Rows returned", ("fingerprint",)
+        )
+        self.response_bytes = Counter(
+            "kuzu_api_response_bytes_total", "Response body bytes returned", ("fingerprint",)
+        )
+        self.errors = Counter(
+            "kuzu_api_query_errors_total", "Failed queries by error type", ("type",)
+        )
+
+    def label(self, fingerprint):
+        """The label for a (fingerprint id, fingerprint text) pair"""
+        fingerprint_id, text = fingerprint
+        if fingerprint_id in self.fingerprints:
+            return fingerprint_id
+        if len(self.fingerprints) < self.max_fingerprints:
+            self.fingerprints[fingerprint_id] = text
+            return fingerprint_id
+        return "other"
+
+    def observe_query(self, fingerprint, profile, size, cache="miss"):
+        """Record one answered query from its profile of phase timings and row count"""
+        label = self.label(fingerprint)
+        for phase in PHASES:
+            if phase in profile:
+                self.phase_seconds.observe(profile[phase], phase, label)
+        self.queries.inc(label, cache)
+        self.rows.inc(label, amount=profile.get("rows", 0))
+        self.response_bytes.inc(label, amount=size)
+
+    def observe_error(self, error_type):
+        self.errors.inc(error_type)
+
+    def render(self, pool_stats=None, cache_stats=None):
+        lines = [
+            "# HELP kuzu_api_query_fingerprint_info Normalized query text of each fingerprint",
+            "# TYPE kuzu_api_query_fingerprint_info gauge",
+        ]
+        for fingerprint_id, text in self.fingerprints.items():
+            labels = _labels(("fingerprint", "query"), (fingerprint_id, text[:300]))
+            lines.append(f"kuzu_api_query_fingerprint_info{labels} 1")
+
+        for metric in (self.phase_seconds, self.queries, self.rows, self.response_bytes, self.errors):
+            lines.extend(metric.render())
+
+        if pool_stats is not None:
+            lines += gauge("kuzu_api_pool_size", "Connections in the pool", pool_stats["size"])
+            lines += gauge("kuzu_api_pool_in_use", "Connections checked out", pool_stats["in_use"])
+            lines += gauge("kuzu_api_pool_idle", "Idle connections", pool_stats["idle"])
+            lines += gauge("kuzu_api_pool_waiters", "Requests waiting for a connection", pool_stats["waiters"])
+        if cache_stats is not None:
+            lines += gauge("kuzu_api_result_cache_entries", "Cached query responses", cache_stats["entries"])
+            lines += gauge("kuzu_api_result_cache_bytes", "Size of cached query responses", cache_stats["bytes"])
+        return "\n".join(lines) + "\n"
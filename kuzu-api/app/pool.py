@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import kuzu
+
+logger = logging.getLogger(__name__)
+
+# Kuzu discourages separate prepare + execute, but reusing a prepared
+# statement is what lets us skip parsing and planning on repeated queries.
+warnings.filterwarnings(
+    "ignore", message="The use of separate prepare", category=DeprecationWarning
+)
+
+
+class PoolExhausted(Exception):
+    """Raised when a connection cannot be acquired within the pool's limits"""
+
+
+class PooledConnection:
+    """A Kuzu connection with an LRU cache of prepared statements.
+
+    Parameterized queries are prepared once per connection and reused, keyed
+    on the query text and the parameter types. Other attributes are
+    delegated to the underlying kuzu.Connection.
+    """
+
+    def __init__(self, db, num_threads=0, statement_cache_size=128):
+        self.conn = kuzu.Connection(db, num_threads=num_threads)
+        self.statement_cache_size = statement_cache_size
+        self._statements = OrderedDict()
+
+        self.prepare_hits = 0
+        self.prepare_misses = 0
+        self.prepare_time_ms = 0.0
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def execute(self, query, params=None):
+        if not params or self.statement_cache_size <= 0:
+            return self.conn.execute(query, params)
+        return self.conn.execute(self.prepare(query, params), params)
+
+    def prepare(self, query, params):
+        """Return a cached prepared statement, preparing it on a miss"""
+        key = (query, tuple(sorted((k, type(v).__name__) for k, v in params.items())))
+        statement = self._statements.get(key)
+        if statement is not None:
+            self._statements.move_to_end(key)
+            self.prepare_hits += 1
+            return statement
+
+        start_time = time.perf_counter()
+        statement = self.conn.prepare(query, params)
+        self.prepare_time_ms += (time.perf_counter() - start_time) * 1000
+        self.prepare_misses += 1
+        if not statement.is_success():
+            raise RuntimeError(statement.get_error_message())
+
+        self._statements[key] = statement
+        if len(self._statements) > self.statement_cache_size:
+            self._statements.popitem(last=False)
+        return statement
+
+    def cached_statements(self):
+        return len(self._statements)
+
+
+class IdleConnections(asyncio.LifoQueue):
+    """Idle connections, most recently released first"""
+
+    def take_nowait(self, candidates):
+        """Remove and return the most recently released idle connection among candidates, or None"""
+        for i in range(len(self._queue) - 1, -1, -1):
+            if self._queue[i] in candidates:
+                return self._queue.pop(i)
+        return None
+
+
+class Lease:
+    """A connection checked out of the pool for one or more calls"""
+
+    def __init__(self, pool, conn):
+        self.pool = pool
+        self.conn = conn
+        self.pending = None
+        self.wait_ms = 0.0
+
+    async def call(self, fn, *args):
+        """Run fn(conn, *args) in a worker thread"""
+        loop = asyncio.get_running_loop()
+        self.pending = loop.run_in_executor(self.pool._executor, fn, self.conn, *args)
+        return await asyncio.shield(self.pending)
+
+
+class ConnectionPool:
+    """A fixed-size pool of connections on a shared read-only Kuzu database.
+
+    Queries are dispatched to a worker thread pool so that blocking Kuzu calls
+    never run on the event loop.
+    """
+
+    def __init__(
+        self,
+        db,
+        size=4,
+        worker_threads=None,
+        connection_threads=0,
+        statement_cache_size=128,
+        max_waiters=None,
+        acquire_timeout=None,
+    ):
+        self.db = db
+        self.size = size
+        self.max_waiters = max_waiters
+        self.acquire_timeout = acquire_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=worker_threads or size, thread_name_prefix="kuzu-worker"
+        )
+        self._connections = [
+            PooledConnection(
+                db, num_threads=connection_threads, statement_cache_size=statement_cache_size
+            )
+            for _ in range(size)
+        ]
+        # Reuse the most recently released connection first so its prepared
+        # statements stay warm
+        self._idle = IdleConnections()
+        for conn in self._connections:
+            self._idle.put_nowait(conn)
+
+        self._in_use = 0
+        self._waiters = 0
+        self._acquired = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._shed = 0
+
+    async def acquire(self):
+        """Check out an idle connection, waiting if all are in use.
+
+        Raises PoolExhausted straight away if max_waiters requests are already
+        queued, or after acquire_timeout seconds without a free connection.
+        """
+        # Waiters beyond the idle connections are the ones that will queue.
+        # Counting them this way also holds for a burst arriving in one
+        # event-loop tick, before any idle connection has been claimed.
+        if (
+            self.max_waiters is not None
+            and self._waiters - self._idle.qsize() >= self.max_waiters
+        ):
+            self._shed += 1
+            raise PoolExhausted(f"{self._waiters} requests already waiting for a connection")
+
+        self._waiters += 1
+        start_time = time.perf_counter()
+        try:
+            conn = await asyncio.wait_for(self._idle.get(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._shed += 1
+            raise PoolExhausted(f"No connection available after {self.acquire_timeout} seconds")
+        finally:
+            self._waiters -= 1
+
+        wait_ms = (time.perf_counter() - start_time) * 1000
+        self._acquired += 1
+        self._total_wait_ms += wait_ms
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+        self._in_use += 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool"""
+        self._in_use -= 1
+        self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def connection(self):
+        """Hold a pooled connection across several calls"""
+        start_time = time.perf_counter()
+        lease = Lease(self, await self.acquire())
+        lease.wait_ms = (time.perf_counter() - start_time) * 1000
+        try:
+            yield lease
+        finally:
+            self._return(lease)
+
+    def _return(self, lease):
+        # If the request was abandoned mid-query, interrupt the query and
+        # return the connection to the pool only once the worker is done.
+        if lease.pending is not None and not lease.pending.done():
+            lease.conn.interrupt()
+            lease.pending.add_done_callback(
+                lambda future: self._release_abandoned(lease.conn, future)
+            )
+        else:
+            self.release(lease.conn)
+
+    def _release_abandoned(self, conn, future):
+        # Nobody awaits an abandoned call, so consume its (expected) error
+        if not future.cancelled():
+            future.exception()
+        self.release(conn)
+
+    async def run(self, fn, *args):
+        """Run fn(conn, *args) on a pooled connection in a worker thread"""
+        async with self.connection() as lease:
+            return await lease.call(fn, *args)
+
+    async def run_on_each(self, fn, *args, interval=0.05):
+        """Run fn(conn, *args) once on every connection, e.g. to prime its statement cache.
+
+        Connections are visited one at a time, each taken only while it is
+        idle and no request is waiting for one, so a pool serving requests
+        is never held up by more than one connection.
+        """
+        remaining = list(self._connections)
+        results = []
+        while remaining:
+            conn = None if self._waiters else self._idle.take_nowait(remaining)
+            if conn is None:
+                await asyncio.sleep(interval)
+                continue
+            remaining.remove(conn)
+            self._in_use += 1
+            lease = Lease(self, conn)
+            try:
+                results.append(await lease.call(fn, *args))
+            finally:
+                self._return(lease)
+        return results
+
+    async def drain(self, timeout=None, interval=0.05):
+        """Wait until no connection is checked out or waited for.
+
+        Returns False if that did not happen within timeout seconds, after
+        interrupting the queries still running.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._in_use or self._waiters:
+            if deadline is not None and time.monotonic() >= deadline:
+                for conn in self._connections:
+                    conn.interrupt()
+                return False
+            await asyncio.sleep(interval)
+        return True
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "in_use": self._in_use,
+            "idle": self._idle.qsize(),
+            "waiters": self._waiters,
+            "acquired": self._acquired,
+            "avg_wait_ms": self._total_wait_ms / self._acquired if self._acquired else 0.0,
+            "max_wait_ms": self._max_wait_ms,
+            "shed": self._shed,
+            "prepared_statements": {
+                "cached": sum(c.cached_statements() for c in self._connections),
+                "hits": sum(c.prepare_hits for c in self._connections),
+                "misses": sum(c.prepare_misses for c in self._connections),
+                "prepare_time_ms": sum(c.prepare_time_ms for c in self._connections),
+            },
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        logger.info("Connection pool closed")
@@ -0,0 +1,320 @@
+"""Fixed, parameterized queries behind the typed verse and chapter endpoints.
+
+Each query runs with parameters, so the pool's prepared-statement cache
+plans it once per connection. Related nodes are fetched with separate
+queries instead of several collect(distinct ...) clauses, which would
+multiply topics, tafsirs and translations together.
+"""
+import time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+CHAPTERS_QUERY = "MATCH (c:Chapter) RETURN c"
+# Snapshots served to the web app link each chapter to its verses
+CHAPTER_VERSES_QUERY = """
+MATCH (c:Chapter {chapter_number: $chapter})-[:CONTAINS]->(v:Verse)
+RETURN v
+"""
+CHAPTER_TRANSLATIONS_QUERY = """
+MATCH (c:Chapter {chapter_number: $chapter})-[:CONTAINS]->(v:Verse)-[:HAS_TRANSLATION]->(t:Translation)
+WHERE t.language = $language
+RETURN v.verse_key, t
+"""
+# Databases built by the playground ingest only store the chapter number on
+# each verse, and have no topics
+SURAH_CHAPTERS_QUERY = """
+MATCH (v:Verse)
+WITH v.surah_number AS chapter_number, count(*) AS verses_count
+RETURN {chapter_number: chapter_number, verses_count: verses_count}
+"""
+SURAH_VERSES_QUERY = "MATCH (v:Verse) WHERE v.surah_number = $chapter RETURN v"
+SURAH_TRANSLATIONS_QUERY = """
+MATCH (v:Verse)-[:HAS_TRANSLATION]->(t:Translation)
+WHERE v.surah_number = $chapter AND t.language = $language
+RETURN v.verse_key, t
+"""
+VERSE_QUERY = "MATCH (v:Verse) WHERE v.verse_key = $verse_key RETURN v"
+VERSE_TOPICS_QUERY = """
+MATCH (v:Verse)-[:HAS_TOPIC]->(t:Topic)
+WHERE v.verse_key = $verse_key
+RETURN t
+"""
+VERSE_TAFSIRS_QUERY = """
+MATCH (v:Verse)-[:HAS_TAFSIR]->(t:Tafsir)
+WHERE v.verse_key = $verse_key
+RETURN t
+"""
+VERSE_TRANSLATIONS_QUERY = """
+MATCH (v:Verse)-[:HAS_TRANSLATION]->(t:Translation)
+WHERE v.verse_key = $verse_key
+RETURN t
+"""
+VERSE_TRANSLATIONS_BY_LANGUAGE_QUERY = """
+MATCH (v:Verse)-[:HAS_TRANSLATION]->(t:Translation)
+WHERE v.verse_key = $verse_key AND t.language = $language
+RETURN t
+"""
+
+# Served by GET /query/named/{name}
+NAMED_QUERIES = {
+    "chapters": CHAPTERS_QUERY,
+    "chapter_verses": CHAPTER_VERSES_QUERY,
+    "chapter_translations": CHAPTER_TRANSLATIONS_QUERY,
+    "verse": VERSE_QUERY,
+    "verse_topics": VERSE_TOPICS_QUERY,
+    "verse_tafsirs": VERSE_TAFSIRS_QUERY,
+    "verse_translations": VERSE_TRANSLATIONS_QUERY,
+    "verse_translations_by_language": VERSE_TRANSLATIONS_BY_LANGUAGE_QUERY,
+}
+
+
+def _has_table(schema_document, name):
+    """Whether a database has a node or rel table (assumed so without a schema)"""
+    if schema_document is None:
+        return True
+    tables = schema_document["node_tables"] + schema_document["rel_tables"]
+    return any(table["name"] == name for table in tables)
+
+
+def chapters_query(schema_document):
+    """The query listing chapters that fits a database's schema"""
+    if _has_table(schema_document, "Chapter"):
+        return CHAPTERS_QUERY
+    return SURAH_CHAPTERS_QUERY
+
+
+def chapter_queries(schema_document):
+    """The (verses, translations) queries of a chapter that fit a database's schema"""
+    if _has_table(schema_document, "CONTAINS"):
+        return CHAPTER_VERSES_QUERY, CHAPTER_TRANSLATIONS_QUERY
+    return SURAH_VERSES_QUERY, SURAH_TRANSLATIONS_QUERY
+
+
+def verse_topics_query(schema_document):
+    """The query for a verse's topics, or None if the database has no topics"""
+    if _has_table(schema_document, "HAS_TOPIC"):
+        return VERSE_TOPICS_QUERY
+    return None
+
+
+class Chapter(BaseModel):
+    chapter_number: int
+    name_english: Optional[str] = None
+    name_arabic: Optional[str] = None
+    revelation_place: Optional[str] = None
+    verses_count: Optional[int] = None
+
+
+class Topic(BaseModel):
+    topic_id: Optional[int] = None
+    name: Optional[str] = None
+
+
+class Translation(BaseModel):
+    id: int
+    text: Optional[str] = None
+    language: Optional[str] = None
+    translator: Optional[str] = None
+
+
+class Tafsir(BaseModel):
+    id: int
+    text: Optional[str] = None
+    source: Optional[str] = None
+    language: Optional[str] = None
+
+
+class Verse(BaseModel):
+    verse_key: str
+    id: Optional[int] = None
+    surah_number: Optional[int] = None
+    ayah_number: Optional[int] = None
+    text: Optional[str] = None
+
+
+class VerseDetail(Verse):
+    topics: List[Topic]
+    translations: List[Translation]
+    tafsirs: Optional[List[Tafsir]] = None
+
+
+class ChapterVerse(Verse):
+    translations: List[Translation]
+
+
+class ChapterVerses(BaseModel):
+    chapter_number: int
+    language: str
+    verses: List[ChapterVerse]
+
+
+class VerseTranslations(BaseModel):
+    verse_key: str
+    language: Optional[str] = None
+    translations: List[Translation]
+
+
+def _nodes(conn, query, params):
+    result = conn.execute(query, params)
+    nodes = []
+    while result.has_next():
+        nodes.append(result.get_next())
+    return nodes
+
+
+def _verse_fields(node):
+    # Older snapshots name some verse properties differently
+    return {
+        "verse_key": node["verse_key"],
+        "id": node.get("id"),
+        "surah_number": node.get("surah_number"),
+        "ayah_number": node.get("ayah_number") or node.get("verse_number"),
+        "text": node.get("text") or node.get("text_uthmani"),
+    }
+
+
+def _translation(node):
+    return Translation(
+        id=node["id"],
+        text=node.get("text"),
+        language=node.get("language"),
+        translator=node.get("translator"),
+    )
+
+
+class _Timer:
+    """Records execute time and row counts into a request profile"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.start_time = time.time()
+
+    def done(self, rows):
+        if self.profile is not None:
+            self.profile.update(execute=time.time() - self.start_time, rows=rows)
+
+
+def fetch_chapters(conn, query=CHAPTERS_QUERY, timeout_ms=None, profile=None):
+    """All chapters ordered by number (runs in a worker thread).
+
+    query is the query from chapters_query().
+    """
+    conn.set_query_timeout(timeout_ms or 0)
+    timer = _Timer(profile)
+    chapters = sorted(
+        (Chapter(**row[0]) for row in _nodes(conn, query, {})),
+        key=lambda c: c.chapter_number,
+    )
+    timer.done(len(chapters))
+    return chapters
+
+
+def fetch_verse(
+    conn,
+    verse_key,
+    language,
+    include_tafsirs,
+    topics_query=VERSE_TOPICS_QUERY,
+    timeout_ms=None,
+    profile=None,
+):
+    """A verse with its topics, translations and optionally tafsirs (runs in a worker thread).
+
+    topics_query is the query from verse_topics_query(); without one the
+    verse has no topics. Raises LookupError if the verse does not exist.
+    """
+    conn.set_query_timeout(timeout_ms or 0)
+    timer = _Timer(profile)
+    params = {"verse_key": verse_key}
+    rows = _nodes(conn, VERSE_QUERY, params)
+    if not rows:
+        raise LookupError(f"Verse {verse_key} not found")
+
+    topics = []
+    if topics_query is not None:
+        topics = [
+            Topic(topic_id=row[0].get("topic_id"), name=row[0].get("name"))
+            for row in _nodes(conn, topics_query, params)
+        ]
+    translations = _fetch_translations(conn, verse_key, language)
+    tafsirs = None
+    if include_tafsirs:
+        tafsirs = sorted(
+            (
+                Tafsir(
+                    id=row[0]["id"],
+                    text=row[0].get("text"),
+                    source=row[0].get("source"),
+                    language=row[0].get("language"),
+                )
+                for row in _nodes(conn, VERSE_TAFSIRS_QUERY, params)
+            ),
+            key=lambda t: t.id,
+        )
+
+    timer.done(1 + len(topics) + len(translations) + len(tafsirs or []))
+    return VerseDetail(
+        **_verse_fields(rows[0][0]),
+        topics=topics,
+        translations=translations,
+        tafsirs=tafsirs,
+    )
+
+
+def fetch_verse_translations(conn, verse_key, language, timeout_ms=None, profile=None):
+    """Translations of a verse, optionally in one language (runs in a worker thread)"""
+    conn.set_query_timeout(timeout_ms or 0)
+    timer = _Timer(profile)
+    translations = _fetch_translations(conn, verse_key, language)
+    timer.done(len(translations))
+    return VerseTranslations(verse_key=verse_key, language=language, translations=translations)
+
+
+def _fetch_translations(conn, verse_key, language):
+    if language:
+        rows = _nodes(
+            conn,
+            VERSE_TRANSLATIONS_BY_LANGUAGE_QUERY,
+            {"verse_key": verse_key, "language": language},
+        )
+    else:
+        rows = _nodes(conn, VERSE_TRANSLATIONS_QUERY, {"verse_key": verse_key})
+    return sorted((_translation(row[0]) for row in rows), key=lambda t: t.id)
+
+
+def fetch_chapter_verses(
+    conn,
+    chapter,
+    language,
+    queries=(CHAPTER_VERSES_QUERY, CHAPTER_TRANSLATIONS_QUERY),
+    timeout_ms=None,
+    profile=None,
+):
+    """Verses of a chapter in order, each with its translations in one language (runs in a worker thread).
+
+    queries are the (verses, translations) queries from chapter_queries().
+    Raises LookupError if the chapter has no verses.
+    """
+    conn.set_query_timeout(timeout_ms or 0)
+    timer = _Timer(profile)
+    verses_query, translations_query = queries
+    rows = _nodes(conn, verses_query, {"chapter": chapter})
+    if not rows:
+        raise LookupError(f"Chapter {chapter} not found")
+
+    translations = {}
+    for verse_key, node in _nodes(
+        conn, translations_query, {"chapter": chapter, "language": language}
+    ):
+        translations.setdefault(verse_key, []).append(_translation(node))
+
+    verses = []
+    for row in rows:
+        fields = _verse_fields(row[0])
+        verse_translations = sorted(translations.get(fields["verse_key"], []), key=lambda t: t.id)
+        verses.append(ChapterVerse(**fields, translations=verse_translations))
+    verses.sort(key=lambda v: (v.ayah_number or 0, v.id or 0))
+
+    timer.done(len(verses) + sum(len(v) for v in translations.values()))
+    return ChapterVerses(chapter_number=chapter, language=language, verses=verses)
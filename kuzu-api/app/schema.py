@@ -0,0 +1,72 @@
+import hashlib
+import json
+
+
+def _rows(conn, query):
+    result = conn.execute(query)
+    columns = result.get_column_names()
+    rows = []
+    while result.has_next():
+        rows.append(dict(zip(columns, result.get_next())))
+    return rows
+
+
+def _count(conn, query):
+    return _rows(conn, query)[0]["count"]
+
+
+def introspect_schema(conn):
+    """Describe every node and rel table with properties, keys, connectivity and row counts"""
+    node_tables = []
+    rel_tables = []
+
+    for table in _rows(conn, "CALL show_tables() RETURN *"):
+        name = table["name"]
+        properties = _rows(conn, f"CALL TABLE_INFO('{name}') RETURN *")
+
+        if table["type"] == "NODE":
+            node_tables.append(
+                {
+                    "name": name,
+                    "primary_key": next(
+                        (p["name"] for p in properties if p.get("primary key")), None
+                    ),
+                    "properties": [
+                        {"name": p["name"], "type": p["type"]} for p in properties
+                    ],
+                    "row_count": _count(conn, f"MATCH (n:`{name}`) RETURN count(n) AS count"),
+                }
+            )
+        elif table["type"] == "REL":
+            connections = _rows(conn, f"CALL SHOW_CONNECTION('{name}') RETURN *")
+            rel_tables.append(
+                {
+                    "name": name,
+                    "properties": [
+                        {"name": p["name"], "type": p["type"]} for p in properties
+                    ],
+                    "connections": [
+                        {
+                            "from": c["source table name"],
+                            "to": c["destination table name"],
+                        }
+                        for c in connections
+                    ],
+                    "row_count": _count(
+                        conn, f"MATCH ()-[r:`{name}`]->() RETURN count(r) AS count"
+                    ),
+                }
+            )
+
+    node_tables.sort(key=lambda t: t["name"])
+    rel_tables.sort(key=lambda t: t["name"])
+    return {"node_tables": node_tables, "rel_tables": rel_tables}
+
+
+class Schema:
+    """A serialized schema document with a weak ETag, shared by its compressed forms"""
+
+    def __init__(self, document):
+        self.document = document
+        self.body = json.dumps(document, separators=(",", ":")).encode()
+        self.etag = 'W/"' + hashlib.sha1(self.body).hexdigest() + '"'
@@ -0,0 +1,74 @@
+"""JSON encoding of Kuzu values straight from the row iterator.
+
+Rows come back from Kuzu as Python values: nodes and rels are dicts with
+_id/_label (and _src/_dst) keys, lists are lists, maps are dicts that may
+have non-string keys, and NULL is None. orjson encodes all of these
+directly, without a DataFrame or numpy scalars in between.
+"""
+import datetime
+import decimal
+import json
+import math
+import uuid
+
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value):
+    """Encode the values orjson does not know the way FastAPI's encoder does"""
+    if isinstance(value, decimal.Decimal):
+        # DECIMAL and INT128 values
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError
+
+
+def _fallback_default(value):
+    try:
+        return _default(value)
+    except TypeError:
+        pass
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(value):
+    """Encode a value as compact UTF-8 JSON bytes"""
+    try:
+        return orjson.dumps(value, default=_default, option=_OPTIONS)
+    except (orjson.JSONEncodeError, TypeError):
+        # Integers beyond 64 bits (INT128, large DECIMALs) and unknown types
+        return json.dumps(
+            _with_str_keys(value),
+            default=_fallback_default,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode()
+
+
+def _with_str_keys(value):
+    """Prepare a value for the json module the way orjson would see it"""
+    if isinstance(value, dict):
+        return {str(k): _with_str_keys(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_with_str_keys(v) for v in value]
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        # orjson encodes NaN and infinities as null too
+        return None
+    return value
+
+
+def fetch_records(result, columns, limit=None):
+    """Fetch up to limit rows (all if None) as dicts keyed by column name"""
+    rows = result.get_all() if limit is None else result.get_n(limit)
+    return [dict(zip(columns, row)) for row in rows]
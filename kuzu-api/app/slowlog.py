@@ -0,0 +1,86 @@
+"""Slow-query log: a structured log line per slow query and a ring of recent ones.
+
+A sample of slow queries is run again with PROFILE or EXPLAIN in the
+background so the ring also shows the plan responsible for the latency.
+"""
+import json
+import logging
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def params_shape(params):
+    """Parameter names and value types, without the values themselves"""
+    return {name: type(value).__name__ for name, value in sorted((params or {}).items())}
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms=1000, max_entries=100, plan_sample_rate=0.1, plan_mode="PROFILE"):
+        self.threshold_ms = threshold_ms
+        self.plan_sample_rate = plan_sample_rate
+        self.plan_mode = plan_mode
+        self._entries = deque(maxlen=max_entries)
+        self.capturing = False
+
+        self.logged = 0
+        self.plans_captured = 0
+        self.plans_failed = 0
+
+    def is_slow(self, total_ms):
+        return self.threshold_ms > 0 and total_ms >= self.threshold_ms
+
+    def record(self, fingerprint, params, profile, total_ms, source):
+        """Log a slow query and keep it in the ring; returns its entry"""
+        fingerprint_id, text = fingerprint
+        entry = {
+            "time": time.time(),
+            "source": source,
+            "fingerprint": fingerprint_id,
+            "query": text,
+            "params": params_shape(params),
+            "rows": profile.get("rows"),
+            "total_ms": round(total_ms, 1),
+            "phases_ms": {
+                phase: round(seconds * 1000, 1)
+                for phase, seconds in profile.items()
+                if phase != "rows"
+            },
+            "plan": None,
+        }
+        self._entries.append(entry)
+        self.logged += 1
+        logger.warning(
+            "Slow query: "
+            + json.dumps({key: value for key, value in entry.items() if key != "plan"})
+        )
+        return entry
+
+    def should_capture_plan(self):
+        """Whether to capture the plan of this slow query: sampled, and one capture at a time"""
+        return not self.capturing and random.random() < self.plan_sample_rate
+
+    def entries(self):
+        """Recent slow queries, newest first"""
+        return list(reversed(self._entries))
+
+    def stats(self):
+        return {
+            "threshold_ms": self.threshold_ms,
+            "entries": len(self._entries),
+            "logged": self.logged,
+            "plans_captured": self.plans_captured,
+            "plans_failed": self.plans_failed,
+        }
+
+
+def run_plan(conn, query, params, mode, timeout_ms=None):
+    """Run a query under PROFILE or EXPLAIN and return the rendered plan (runs in a worker thread)"""
+    conn.set_query_timeout(timeout_ms or 0)
+    result = conn.execute(f"{mode} {query}", dict(params) if params else None)
+    lines = []
+    while result.has_next():
+        lines.append(str(result.get_next()[0]))
+    return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""Versioned database snapshots on local disk.
+
+Each snapshot is a directory SNAPSHOTS_DIR/<version> holding the database,
+which is a file or, for Kuzu versions that store one, a directory. The CURRENT file names the version being served and PREVIOUS the one
+it replaced, so a restart (or another worker process) serves the same
+snapshot and a rollback knows where to go back to. Versions are never
+deleted here; old ones are removed by hand once they are not needed.
+"""
+import os
+import re
+import time
+
+CURRENT = "CURRENT"
+PREVIOUS = "PREVIOUS"
+
+_VERSION = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+class SnapshotError(Exception):
+    """A snapshot cannot be switched to in the current state"""
+
+
+class SnapshotNotFound(SnapshotError):
+    """The requested snapshot version does not exist"""
+
+
+class SnapshotInvalid(SnapshotError):
+    """The snapshot opened but failed verification or warm-up"""
+
+
+def _database_stat(path):
+    """(size in bytes, latest mtime) of a database file or directory, or None if it is missing"""
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime
+    if not os.path.isdir(path):
+        return None
+    size = 0
+    mtime = os.stat(path).st_mtime
+    for directory, _, names in os.walk(path):
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            size += stat.st_size
+            mtime = max(mtime, stat.st_mtime)
+    return size, mtime
+
+
+class SnapshotStore:
+    def __init__(self, root, db_name="quran_graph_db"):
+        self.root = root
+        self.db_name = db_name
+
+    def database_path(self, version):
+        """Path of the database of a version; raises SnapshotNotFound if it is missing"""
+        if not version or not _VERSION.match(version):
+            raise SnapshotNotFound(f"Invalid snapshot version '{version}'")
+        path = os.path.join(self.root, version, self.db_name)
+        if not os.path.exists(path):
+            raise SnapshotNotFound(f"Snapshot {version} has no database at {path}")
+        return path
+
+    def versions(self):
+        """Snapshot versions on disk, oldest first"""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        versions = []
+        for name in names:
+            if not _VERSION.match(name):
+                continue
+            stat = _database_stat(os.path.join(self.root, name, self.db_name))
+            if stat is None:
+                continue
+            versions.append((stat, name))
+        versions.sort(key=lambda v: (v[0][1], v[1]))
+        return [
+            {
+                "version": name,
+                "size_bytes": size,
+                "modified": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(mtime)),
+            }
+            for (size, mtime), name in versions
+        ]
+
+    def current(self):
+        return self._read(CURRENT)
+
+    def previous(self):
+        return self._read(PREVIOUS)
+
+    def mark_active(self, version, previous):
+        """Record the version now being served and the one it replaced"""
+        if previous:
+            self._write(PREVIOUS, previous)
+        self._write(CURRENT, version)
+
+    def _read(self, name):
+        try:
+            with open(os.path.join(self.root, name)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write(self, name, value):
+        # Write then rename, so readers never see a partial file
+        path = os.path.join(self.root, name)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(value + "\n")
+        os.replace(temp_path, path)
+
+
+def verify_schema(candidate, reference=None):
+    """Problems that make a snapshot unfit to serve, compared with the one being served.
+
+    Every node and rel table of the reference schema must still exist, and
+    node tables that had rows must not be empty.
+    """
+    problems = []
+    if not candidate["node_tables"]:
+        return ["it has no node tables"]
+    if reference is None:
+        return problems
+
+    node_tables = {table["name"]: table for table in candidate["node_tables"]}
+    rel_tables = {table["name"] for table in candidate["rel_tables"]}
+    for table in reference["node_tables"]:
+        found = node_tables.get(table["name"])
+        if found is None:
+            problems.append(f"node table {table['name']} is missing")
+        elif table.get("row_count") and not found.get("row_count"):
+            problems.append(f"node table {table['name']} is empty")
+    for table in reference["rel_tables"]:
+        if table["name"] not in rel_tables:
+            problems.append(f"rel table {table['name']} is missing")
+    return problems
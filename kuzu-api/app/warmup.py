@@ -0,0 +1,190 @@
+"""Warm-up run at startup, before the service reports ready.
+
+Machines are stopped when idle, so every cold start opens the database with
+an empty buffer pool and empty prepared-statement caches. Warm-up reads the
+hot tables once and replays canonical queries on every pooled connection so
+the first real requests do not pay for it.
+"""
+import json
+import logging
+import time
+
+from .quran import (
+    CHAPTER_VERSES_QUERY,
+    CHAPTERS_QUERY,
+    VERSE_QUERY,
+    VERSE_TAFSIRS_QUERY,
+    VERSE_TOPICS_QUERY,
+    VERSE_TRANSLATIONS_BY_LANGUAGE_QUERY,
+    VERSE_TRANSLATIONS_QUERY,
+    chapter_queries,
+    chapters_query,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tables whose columns are scanned so their pages are in the buffer pool
+DEFAULT_TABLES = (
+    "Verse",
+    "Translation",
+    "Tafsir",
+    "HAS_TRANSLATION",
+    "HAS_TAFSIR",
+    "HAS_TOPIC",
+)
+
+# Queries the web app and the typed endpoints run on every page view, with
+# the tables each one needs, besides the chapter queries, which depend on
+# the schema
+DEFAULT_QUERIES = [
+    {"query": VERSE_QUERY, "params": {"verse_key": "1:1"}, "tables": ("Verse",)},
+    {
+        "query": VERSE_TOPICS_QUERY,
+        "params": {"verse_key": "1:1"},
+        "tables": ("Verse", "HAS_TOPIC", "Topic"),
+    },
+    {
+        "query": VERSE_TAFSIRS_QUERY,
+        "params": {"verse_key": "1:1"},
+        "tables": ("Verse", "HAS_TAFSIR", "Tafsir"),
+    },
+    {
+        "query": VERSE_TRANSLATIONS_QUERY,
+        "params": {"verse_key": "1:1"},
+        "tables": ("Verse", "HAS_TRANSLATION", "Translation"),
+    },
+    {
+        "query": VERSE_TRANSLATIONS_BY_LANGUAGE_QUERY,
+        "params": {"verse_key": "1:1", "language": "en"},
+        "tables": ("Verse", "HAS_TRANSLATION", "Translation"),
+    },
+]
+
+
+def default_queries(schema_document=None):
+    """The default queries whose tables all exist in the schema (all of them without one)"""
+    list_query = chapters_query(schema_document)
+    verses_query, translations_query = chapter_queries(schema_document)
+    chapter_tables = ("Chapter", "CONTAINS") if verses_query == CHAPTER_VERSES_QUERY else ("Verse",)
+    queries = DEFAULT_QUERIES + [
+        {"query": list_query, "tables": ("Chapter",) if list_query == CHAPTERS_QUERY else ("Verse",)},
+        {"query": verses_query, "params": {"chapter": 1}, "tables": chapter_tables},
+        {
+            "query": translations_query,
+            "params": {"chapter": 1, "language": "en"},
+            "tables": chapter_tables + ("HAS_TRANSLATION", "Translation"),
+        },
+    ]
+    if schema_document is None:
+        return queries
+    tables = {
+        table["name"]
+        for table in schema_document["node_tables"] + schema_document["rel_tables"]
+    }
+    return [item for item in queries if tables.issuperset(item["tables"])]
+
+
+def load_queries(path=None, schema_document=None):
+    """Canonical queries from a JSON file of [{"query": ..., "params": {...}}], or the defaults for a schema"""
+    if not path:
+        return default_queries(schema_document)
+    with open(path) as f:
+        queries = json.load(f)
+    for item in queries:
+        if not isinstance(item, dict) or not isinstance(item.get("query"), str):
+            raise ValueError(f"Invalid warm-up query in {path}: {item!r}")
+    return queries
+
+
+def _touch_columns(variable, properties):
+    """Aggregates that read every property column without returning its values"""
+    columns = ["count(*)"]
+    for prop in properties:
+        column = f"{variable}.`{prop['name']}`"
+        if prop["type"] == "STRING":
+            columns.append(f"sum(size({column}))")
+        else:
+            columns.append(f"count({column})")
+    return ", ".join(columns)
+
+
+def touch_query(schema_document, name):
+    """An aggregate scanning every property of a table, or None if it does not exist.
+
+    Only one row comes back, so even the large text tables are read into
+    the buffer pool without being held in memory as a result.
+    """
+    for table in schema_document["node_tables"]:
+        if table["name"] == name:
+            return f"MATCH (n:`{name}`) RETURN {_touch_columns('n', table['properties'])}"
+    for table in schema_document["rel_tables"]:
+        if table["name"] == name:
+            return f"MATCH ()-[r:`{name}`]->() RETURN {_touch_columns('r', table['properties'])}"
+    return None
+
+
+def touch_table(conn, query):
+    """Run a table scan and return its row count (runs in a worker thread)"""
+    return conn.execute(query).get_next()[0]
+
+
+def replay_queries(conn, queries):
+    """Run each canonical query and fetch its rows (runs in a worker thread).
+
+    Parameterized queries go through the connection's statement cache, so
+    this also prepares them. Returns the number of queries that failed.
+    """
+    failed = 0
+    for item in queries:
+        try:
+            result = conn.execute(item["query"], item.get("params") or None)
+            while result.has_next():
+                result.get_next()
+        except Exception as e:
+            failed += 1
+            logger.warning(f"Warm-up query failed: {str(e)}")
+    return failed
+
+
+class Warmup:
+    """Readiness state and the cold-start timing breakdown in milliseconds"""
+
+    def __init__(self):
+        self.ready = False
+        self.timings = {}
+        self.errors = []
+
+    def record(self, phase, start_time):
+        self.timings[phase] = round((time.time() - start_time) * 1000, 1)
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "timings_ms": dict(self.timings),
+            "errors": list(self.errors),
+        }
+
+
+async def warm_up(pool, schema_document, tables, queries, state):
+    """Read the hot tables and replay queries on every connection, recording timings in state"""
+    if schema_document is not None:
+        for name in tables:
+            query = touch_query(schema_document, name)
+            if query is None:
+                logger.warning(f"Warm-up table {name} does not exist, skipping it")
+                continue
+            start_time = time.time()
+            try:
+                rows = await pool.run(touch_table, query)
+            except Exception as e:
+                state.errors.append(f"{name}: {str(e)}")
+                logger.warning(f"Failed to warm up table {name}: {str(e)}")
+                continue
+            state.record(f"table:{name}", start_time)
+            logger.info(f"Warmed up {name} ({rows} rows) in {state.timings[f'table:{name}']} ms")
+
+    start_time = time.time()
+    failed = sum(await pool.run_on_each(replay_queries, queries))
+    if failed:
+        state.errors.append(f"{failed} warm-up queries failed")
+    state.record("queries", start_time)
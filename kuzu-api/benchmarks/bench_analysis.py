@@ -0,0 +1,66 @@
+"""Per-request cost of query analysis: the read-only check, fingerprint and cache key.
+
+Times the lexer pass on first sight of a query text (uncached) and on
+repeats (memoized), plus building the cache key from parameters, for
+queries of the sizes the web app and data explorer send.
+
+Usage:
+    python benchmarks/bench_analysis.py --iterations 20000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.cypher import analyze_query  # noqa: E402
+
+QUERIES = {
+    "lookup": ("MATCH (v:Verse {verse_key: $k}) RETURN v", {"k": "2:255"}),
+    "surah page": (
+        """
+        MATCH (c:Chapter {chapter_number: $n})-[:CONTAINS]->(v:Verse)
+        OPTIONAL MATCH (v)-[:HAS_TRANSLATION]->(tr:Translation {language: "en"})
+        RETURN v.id, v.verse_key, v.verse_number, v.text_uthmani, collect(distinct tr) as translations
+        ORDER BY v.verse_number
+        """,
+        {"n": 2},
+    ),
+    "verse page": (
+        """
+        MATCH (v:Verse {verse_key: $verse_key})
+        OPTIONAL MATCH (v)-[:HAS_TOPIC]->(t:Topic)
+        OPTIONAL MATCH (v)-[:HAS_TAFSIR]->(tf:Tafsir)
+        OPTIONAL MATCH (v)-[:HAS_TRANSLATION]->(tr:Translation)
+        // everything the verse page renders
+        RETURN v, collect(distinct {topic_id: t.topic_id, name: t.name}) AS topics,
+               collect(distinct {id: tf.id, text: tf.text, source: tf.source}) AS tafsirs,
+               collect(distinct {id: tr.id, text: tr.text, language: tr.language}) AS translations
+        """,
+        {"verse_key": "2:255"},
+    ),
+}
+
+
+def per_call_us(fn, iterations):
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def main(args):
+    uncached = analyze_query.__wrapped__
+    print(f"{'query':>12} {'chars':>6} {'uncached us':>12} {'cached us':>10} {'cache key us':>13}")
+    for name, (query, params) in QUERIES.items():
+        analysis = analyze_query(query)
+        print(
+            f"{name:>12} {len(query):>6} "
+            f"{per_call_us(lambda: uncached(query), max(1, args.iterations // 20)):>12.1f} "
+            f"{per_call_us(lambda: analyze_query(query), args.iterations):>10.2f} "
+            f"{per_call_us(lambda: analysis.cache_key(params), args.iterations):>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args())
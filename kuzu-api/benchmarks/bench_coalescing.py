@@ -0,0 +1,87 @@
+"""Thundering-herd load test for single-flight query coalescing.
+
+Sends bursts of identical /query requests (a surah page being opened by
+many visitors at once) to the app in process, with coalescing off and on,
+and reports how many times the query actually ran. The result cache is
+cleared before every burst so only coalescing can save executions.
+
+Usage:
+    python benchmarks/bench_coalescing.py --herd 50 --bursts 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_db import build  # noqa: E402
+
+QUERY = """
+MATCH (c:Chapter {chapter_number: $n})-[:CONTAINS]->(v:Verse)
+OPTIONAL MATCH (v)-[:HAS_TRANSLATION]->(tr:Translation {language: "en"})
+RETURN v.id, v.verse_key, v.verse_number, v.text_uthmani, collect(distinct tr) as translations
+ORDER BY v.verse_number
+"""
+
+
+async def burst(client, herd, n):
+    async def one():
+        start = time.perf_counter()
+        response = await client.post("/query", json={"query": QUERY, "params": {"n": n}})
+        response.raise_for_status()
+        return (time.perf_counter() - start) * 1000
+
+    return await asyncio.gather(*(one() for _ in range(herd)))
+
+
+async def run(main, coalesce, args):
+    main.in_flight.enabled = coalesce
+    executions = main.in_flight.executions
+    coalesced = main.in_flight.coalesced
+    transport = httpx.ASGITransport(app=main.app)
+    latencies = []
+    start = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for i in range(args.bursts):
+            main.result_cache.clear()
+            latencies += await burst(client, args.herd, i % 20 + 1)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": args.herd * args.bursts,
+        "executions": main.in_flight.executions - executions,
+        "coalesced": main.in_flight.coalesced - coalesced,
+        "seconds": elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+async def main(args):
+    os.environ["DB_PATH"] = args.db or build(os.path.join(tempfile.mkdtemp(), "bench.kz"))
+    os.environ.setdefault("MAX_POOL_WAITERS", str(args.herd * 2))
+    os.environ.setdefault("WARMUP_ENABLED", "false")
+    from app import main as app_main
+
+    async with app_main.app.router.lifespan_context(app_main.app):
+        print(f"{'coalescing':>10} {'requests':>9} {'executions':>11} {'coalesced':>10} {'seconds':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for coalesce in (False, True):
+            r = await run(app_main, coalesce, args)
+            print(
+                f"{'on' if coalesce else 'off':>10} {r['requests']:>9} {r['executions']:>11} {r['coalesced']:>10} "
+                f"{r['seconds']:>8.2f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Existing database to use instead of a generated fixture")
+    parser.add_argument("--herd", type=int, default=50, help="Identical requests per burst")
+    parser.add_argument("--bursts", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
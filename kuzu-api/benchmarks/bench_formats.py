@@ -0,0 +1,95 @@
+"""Compare /query response formats on verse, translation and tafsir-sized results.
+
+For each result shape this times the full path from query execution to
+response bytes for the records format, both the current row iterator ->
+orjson path and the previous pandas DataFrame -> dicts -> FastAPI encoder
+path, the columnar JSON format and the Arrow IPC stream, and reports the
+payload sizes. The pandas path needs pandas installed.
+
+Usage:
+    python benchmarks/bench_formats.py --iterations 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import kuzu
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.formats import ARROW, COLUMNAR  # noqa: E402
+from app.main import run_records_query, run_table_query  # noqa: E402
+from benchmarks.fixture_db import build  # noqa: E402
+
+RESULTS = {
+    "verse": (
+        "MATCH (v:Verse {verse_key: $k}) RETURN v",
+        {"k": "2:10"},
+    ),
+    "translation": (
+        """
+        MATCH (c:Chapter {chapter_number: $n})-[:CONTAINS]->(v:Verse)-[:HAS_TRANSLATION]->(t:Translation)
+        RETURN v.verse_key, t.translator, t.language, t.text
+        """,
+        {"n": 2},
+    ),
+    "tafsir": (
+        "MATCH (v:Verse)-[:HAS_TAFSIR]->(t:Tafsir) WHERE v.surah_number <= $n RETURN v.verse_key, t",
+        {"n": 10},
+    ),
+}
+
+
+def pandas_records_bytes(conn, query, params):
+    start_time = time.time()
+    result = conn.execute(query, params)
+    columns = result.get_column_names()
+    df = result.get_as_df()
+    data = df.to_dict(orient="records") if not df.empty else []
+    document = {
+        "data": data,
+        "columns": columns,
+        "execution_time_ms": (time.time() - start_time) * 1000,
+        "truncated": False,
+    }
+    return JSONResponse(jsonable_encoder(document)).body
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(body)
+
+
+def main(args):
+    db_path = args.db or build(os.path.join(tempfile.mkdtemp(), "bench.kz"))
+    db = kuzu.Database(db_path, read_only=True)
+    conn = kuzu.Connection(db)
+
+    print(f"{'result':>12} {'format':>9} {'median ms':>10} {'bytes':>12}")
+    for name, (query, params) in RESULTS.items():
+        formats = {
+            "pandas": lambda: pandas_records_bytes(conn, query, params),
+            "records": lambda: run_records_query(conn, query, params, None, None),
+            COLUMNAR: lambda: run_table_query(conn, query, params, COLUMNAR)[0],
+            ARROW: lambda: run_table_query(conn, query, params, ARROW)[0],
+        }
+        for response_format, fn in formats.items():
+            fn()  # warm up
+            median_ms, size = timed(fn, args.iterations)
+            print(f"{name:>12} {response_format:>9} {median_ms:>10.2f} {size:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Existing database to use instead of a generated fixture")
+    parser.add_argument("--iterations", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,83 @@
+"""Measure /query throughput against the connection pool at several pool sizes.
+
+Runs the same mix of queries through ConnectionPool with a fixed number of
+concurrent clients, so the numbers show how throughput scales with the pool
+size compared to a single shared connection.
+
+Usage:
+    python benchmarks/bench_pool.py --sizes 1 2 4 8 --requests 400
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import kuzu
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import run_query  # noqa: E402
+from app.pool import ConnectionPool  # noqa: E402
+from benchmarks.fixture_db import build  # noqa: E402
+
+QUERIES = [
+    (
+        """
+        MATCH (c:Chapter {chapter_number: $n})-[:CONTAINS]->(v:Verse)
+        OPTIONAL MATCH (v)-[:HAS_TRANSLATION]->(tr:Translation {language: "en"})
+        RETURN v.id, v.verse_key, v.verse_number, v.text_uthmani, collect(distinct tr) as translations
+        ORDER BY v.verse_number
+        """,
+        lambda i: {"n": i % 20 + 1},
+    ),
+    (
+        """
+        MATCH (v:Verse {verse_key: $k})
+        OPTIONAL MATCH (v)-[:HAS_TAFSIR]->(tf:Tafsir)
+        RETURN v, collect(distinct tf) as tafsirs
+        """,
+        lambda i: {"k": f"{i % 20 + 1}:{i % 50 + 1}"},
+    ),
+]
+
+
+async def run_clients(pool, total, concurrency):
+    counter = iter(range(total))
+
+    async def client():
+        for i in counter:
+            query, params = QUERIES[i % len(QUERIES)]
+            await pool.run(run_query, query, params(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def main(args):
+    db_path = args.db or build(os.path.join(tempfile.mkdtemp(), "bench.kz"))
+    db = kuzu.Database(db_path, read_only=True)
+
+    print(f"{'pool size':>10} {'requests':>9} {'seconds':>8} {'req/s':>8} {'avg wait ms':>12}")
+    for size in args.sizes:
+        pool = ConnectionPool(db, size=size, connection_threads=args.connection_threads)
+        # Warm up every connection once before timing
+        await run_clients(pool, size * 2, size)
+        elapsed = await run_clients(pool, args.requests, args.concurrency)
+        stats = pool.stats()
+        print(
+            f"{size:>10} {args.requests:>9} {elapsed:>8.2f} {args.requests / elapsed:>8.1f} {stats['avg_wait_ms']:>12.2f}"
+        )
+        pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Existing database to use instead of a generated fixture")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--connection-threads", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
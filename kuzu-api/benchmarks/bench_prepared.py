@@ -0,0 +1,71 @@
+"""Measure per-call latency of a hot parameterized verse lookup with and without
+the prepared-statement cache.
+
+Usage:
+    python benchmarks/bench_prepared.py --iterations 2000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import kuzu
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.pool import PooledConnection  # noqa: E402
+from benchmarks.fixture_db import build  # noqa: E402
+
+QUERY = """
+MATCH (v:Verse)
+WHERE v.verse_key = $k
+OPTIONAL MATCH (v)-[:HAS_TRANSLATION]->(tr:Translation)
+RETURN v.verse_key, v.text, collect(tr.text) AS translations
+"""
+
+
+def measure(conn, iterations, verse_keys):
+    samples = []
+    for i in range(iterations):
+        params = {"k": verse_keys[i % len(verse_keys)]}
+        start = time.perf_counter()
+        result = conn.execute(QUERY, params)
+        while result.has_next():
+            result.get_next()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:>12} {statistics.mean(samples):>9.3f} {statistics.median(samples):>9.3f} {p95:>9.3f}")
+
+
+def main(args):
+    db_path = args.db or build(os.path.join(tempfile.mkdtemp(), "bench.kz"))
+    db = kuzu.Database(db_path, read_only=True)
+    verse_keys = [f"{c}:{a}" for c in range(1, 11) for a in range(1, 21)]
+
+    unprepared = kuzu.Connection(db)
+    prepared = PooledConnection(db)
+    # Warm up the buffer pool and the statement cache before timing
+    measure(unprepared, 50, verse_keys)
+    measure(prepared, 50, verse_keys)
+
+    print(f"{'mode':>12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    report("unprepared", measure(unprepared, args.iterations, verse_keys))
+    report("prepared", measure(prepared, args.iterations, verse_keys))
+    print(
+        f"prepare hits: {prepared.prepare_hits}, misses: {prepared.prepare_misses}, "
+        f"prepare time: {prepared.prepare_time_ms:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Existing database to use instead of a generated fixture")
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args())
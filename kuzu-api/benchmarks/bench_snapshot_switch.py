@@ -0,0 +1,143 @@
+"""Switch between two local snapshots under load and report what clients saw.
+
+Builds two fixture snapshots that differ in chapter count under a temporary
+SNAPSHOTS_DIR, serves the first in process, and keeps closed-loop clients
+querying chapters and verses while it activates the second, tries a
+snapshot that fails verification, and rolls back. Reports failed requests,
+the latency around each switch, and the phase timings of the switches.
+
+Usage:
+    python benchmarks/bench_snapshot_switch.py --clients 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+import kuzu
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_db import build  # noqa: E402
+
+DB_NAME = "quran_graph_db"
+ADMIN_TOKEN = "bench"
+
+
+def make_snapshots(root):
+    for version in ("v1", "v2", "broken"):
+        os.makedirs(os.path.join(root, version))
+    build(os.path.join(root, "v1", DB_NAME), chapters=20)
+    build(os.path.join(root, "v2", DB_NAME), chapters=25, seed=7)
+    # A database without the app's tables, which must be rejected
+    conn = kuzu.Connection(kuzu.Database(os.path.join(root, "broken", DB_NAME)))
+    conn.execute("CREATE NODE TABLE Other (id INT64 PRIMARY KEY)")
+    conn.execute("CREATE (:Other {id: 1})")
+    with open(os.path.join(root, "CURRENT"), "w") as f:
+        f.write("v1\n")
+
+
+async def clients(client, count, stop):
+    """Closed-loop clients; returns (time, latency ms, ok, chapters seen) per request"""
+    samples = []
+
+    async def worker(n):
+        i = n
+        while not stop.is_set():
+            i += 1
+            start = time.perf_counter()
+            try:
+                if i % 2:
+                    response = await client.get("/chapters")
+                    chapters = len(response.json()) if response.status_code == 200 else None
+                else:
+                    response = await client.get(f"/verse/{i % 20 + 1}:1")
+                    chapters = None
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok, chapters = False, None
+            samples.append((time.perf_counter(), (time.perf_counter() - start) * 1000, ok, chapters))
+            # Cache hits complete without suspending, so yield to the switches
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker(n) for n in range(count)))
+    return samples
+
+
+def window(samples, start, end):
+    latencies = sorted(ms for t, ms, ok, _ in samples if start <= t <= end and ok)
+    if not latencies:
+        return {"requests": 0}
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(latencies[len(latencies) // 2], 1),
+        "max_ms": round(latencies[-1], 1),
+    }
+
+
+async def main(args):
+    root = tempfile.mkdtemp()
+    make_snapshots(root)
+    os.environ.update(
+        SNAPSHOTS_DIR=root,
+        SNAPSHOT_DB_NAME=DB_NAME,
+        DB_PATH=os.path.join(root, "v1", DB_NAME),
+        ADMIN_TOKEN=ADMIN_TOKEN,
+    )
+    from app import main as app_main
+
+    stop = asyncio.Event()
+    switches = []
+    async with app_main.app.router.lifespan_context(app_main.app):
+        while not app_main.warmup.ready:
+            await asyncio.sleep(0.05)
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers={"X-Admin-Token": ADMIN_TOKEN},
+            timeout=60,
+        ) as client:
+            load = asyncio.create_task(clients(client, args.clients, stop))
+            for action, path, body in [
+                ("activate v2", "/admin/snapshots/activate", {"version": "v2"}),
+                ("activate broken", "/admin/snapshots/activate", {"version": "broken"}),
+                ("activate missing", "/admin/snapshots/activate", {"version": "v9"}),
+                ("rollback", "/admin/snapshots/rollback", None),
+            ]:
+                await asyncio.sleep(args.pause)
+                start = time.perf_counter()
+                response = await client.post(path, json=body)
+                end = time.perf_counter()
+                switches.append((action, response, start, end))
+            await asyncio.sleep(args.pause)
+            stop.set()
+            samples = await load
+            snapshots = (await client.get("/admin/snapshots")).json()
+
+    failed = sum(1 for _, _, ok, _ in samples if not ok)
+    print(f"{len(samples)} requests from {args.clients} clients, {failed} failed")
+    for action, response, start, end in switches:
+        body = response.json()
+        print(f"\n{action}: HTTP {response.status_code}")
+        if response.status_code == 200:
+            print(f"  phases: {body['timings_ms']}, drained: {body['drained']}")
+            print(f"  latency while switching: {window(samples, start, end)}")
+        else:
+            print(f"  {body['detail']}")
+    seen = []
+    for _, _, ok, chapters in sorted(samples):
+        if chapters is not None and (not seen or seen[-1] != chapters):
+            seen.append(chapters)
+    print(f"\nChapter counts seen, in order: {seen}")
+    print(f"Serving {snapshots['active']}, previous {snapshots['previous']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--pause", type=float, default=1, help="Seconds of load between switches")
+    asyncio.run(main(parser.parse_args()))
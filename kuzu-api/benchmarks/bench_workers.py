@@ -0,0 +1,129 @@
+"""Measure requests per second of server.py with 1 to N worker processes.
+
+For each worker count this starts server.py on a local port against the same
+read-only database, waits for /ready, then drives a mix of typed endpoint
+and /query requests from several client processes for a fixed duration.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1 2 4 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_db import build  # noqa: E402
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server.py")
+
+
+def request(client, i):
+    chapter = i % 20 + 1
+    verse_key = f"{chapter}:{i % 50 + 1}"
+    kind = i % 4
+    if kind == 0:
+        return client.get(f"/verse/{verse_key}")
+    if kind == 1:
+        return client.get(f"/chapter/{chapter}/verses")
+    if kind == 2:
+        return client.get(f"/verse/{verse_key}/translations", params={"language": "en"})
+    # /query results are cached by text and params, so vary the params
+    return client.post(
+        "/query",
+        json={
+            "query": "MATCH (v:Verse)-[:HAS_TRANSLATION]->(t:Translation) WHERE v.verse_key = $k RETURN t.text",
+            "params": {"k": verse_key},
+        },
+    )
+
+
+async def drive(base_url, duration, concurrency, offset):
+    deadline = time.perf_counter() + duration
+    counts = {"ok": 0, "errors": 0}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+
+        async def worker(n):
+            i = offset + n * 100003
+            while time.perf_counter() < deadline:
+                response = await request(client, i)
+                counts["ok" if response.status_code == 200 else "errors"] += 1
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return counts
+
+
+def client_process(args):
+    return asyncio.run(drive(*args))
+
+
+def wait_ready(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def run(db_path, workers, args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = dict(os.environ, DB_PATH=db_path, PORT=str(args.port), WEB_CONCURRENCY=str(workers))
+    server = subprocess.Popen(
+        [sys.executable, SERVER],
+        cwd=os.path.dirname(SERVER),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(base_url)
+        # Every worker warms up on its own, give them a moment after the first is ready
+        time.sleep(args.settle)
+        per_process = max(1, args.concurrency // args.client_processes)
+        jobs = [
+            (base_url, args.duration, per_process, n * 7919)
+            for n in range(args.client_processes)
+        ]
+        with multiprocessing.Pool(args.client_processes) as clients:
+            results = clients.map(client_process, jobs)
+    finally:
+        server.terminate()
+        server.wait()
+
+    ok = sum(r["ok"] for r in results)
+    errors = sum(r["errors"] for r in results)
+    return ok / args.duration, errors
+
+
+def main(args):
+    db_path = args.db or build(os.path.join(tempfile.mkdtemp(), "bench.kz"))
+
+    print(f"{'workers':>8} {'req/s':>9} {'errors':>7}")
+    for workers in args.workers:
+        throughput, errors = run(db_path, workers, args)
+        print(f"{workers:>8} {throughput:>9.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Existing database to use instead of a generated fixture")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--client-processes", type=int, default=2)
+    parser.add_argument("--settle", type=float, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    main(parser.parse_args())
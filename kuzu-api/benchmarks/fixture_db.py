@@ -0,0 +1,165 @@
+"""Build a small synthetic Quran graph database for local benchmarks.
+
+The schema mirrors the tables the web app queries (Chapter, Verse,
+Translation, Tafsir, Topic and their relationships), with generated text of
+roughly realistic length so that result sizes resemble production.
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+import kuzu
+
+WORDS = (
+    "the lord mercy guidance believers heaven earth day judgement prayer "
+    "charity patience truth light book messenger covenant people land water "
+    "garden fire signs knowledge wisdom grace forgiveness"
+).split()
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def build(db_path, chapters=20, verses_per_chapter=50, translators=3, tafsir_sources=2, topics=50, seed=42):
+    """Create a fixture database at db_path and return the path"""
+    rng = random.Random(seed)
+    if os.path.exists(db_path):
+        if os.path.isdir(db_path):
+            shutil.rmtree(db_path)
+        else:
+            os.remove(db_path)
+
+    db = kuzu.Database(db_path)
+    conn = kuzu.Connection(db)
+    conn.execute(
+        """
+    CREATE NODE TABLE Chapter (
+        chapter_number INT64 PRIMARY KEY,
+        id INT64,
+        name_english STRING,
+        name_arabic STRING,
+        revelation_place STRING,
+        verses_count INT64)
+    """
+    )
+    conn.execute(
+        """
+    CREATE NODE TABLE Verse (
+        verse_key STRING PRIMARY KEY,
+        id INT64,
+        surah_number INT64,
+        ayah_number INT64,
+        verse_number INT64,
+        text STRING,
+        text_uthmani STRING)
+    """
+    )
+    conn.execute(
+        """
+    CREATE NODE TABLE Translation (
+        id INT64 PRIMARY KEY,
+        verse_key STRING,
+        text STRING,
+        language STRING,
+        translator STRING)
+    """
+    )
+    conn.execute(
+        """
+    CREATE NODE TABLE Tafsir (
+        id INT64 PRIMARY KEY,
+        verse_key STRING,
+        text STRING,
+        language STRING,
+        source STRING,
+        group_ayah_key STRING,
+        from_ayah STRING,
+        to_ayah STRING)
+    """
+    )
+    conn.execute("CREATE NODE TABLE Topic (topic_id INT64 PRIMARY KEY, name STRING)")
+    conn.execute("CREATE REL TABLE CONTAINS (FROM Chapter TO Verse)")
+    conn.execute("CREATE REL TABLE HAS_TRANSLATION (FROM Verse TO Translation)")
+    conn.execute("CREATE REL TABLE HAS_TAFSIR (FROM Verse TO Tafsir)")
+    conn.execute("CREATE REL TABLE HAS_TOPIC (FROM Verse TO Topic)")
+
+    tmp_dir = tempfile.mkdtemp(prefix="kuzu_fixture_")
+    try:
+        files = {}
+
+        def write(name, rows):
+            path = os.path.join(tmp_dir, f"{name}.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(",".join(_csv_field(v) for v in row) + "\n")
+            files[name] = path
+
+        chapter_rows, verse_rows, contains_rows = [], [], []
+        translation_rows, has_translation_rows = [], []
+        tafsir_rows, has_tafsir_rows, has_topic_rows = [], [], []
+        verse_id = translation_id = tafsir_id = 0
+        for c in range(1, chapters + 1):
+            chapter_rows.append((c, c, f"Chapter {c}", f"Surah {c}", rng.choice(["makkah", "madinah"]), verses_per_chapter))
+            for a in range(1, verses_per_chapter + 1):
+                verse_id += 1
+                key = f"{c}:{a}"
+                verse_rows.append((key, verse_id, c, a, a, _text(rng, 25), _text(rng, 25)))
+                contains_rows.append((c, key))
+                for t in range(translators):
+                    translation_id += 1
+                    language = "en" if t % 2 == 0 else "id"
+                    translation_rows.append((translation_id, key, _text(rng, 40), language, f"Translator {t}"))
+                    has_translation_rows.append((key, translation_id))
+                for s in range(tafsir_sources):
+                    tafsir_id += 1
+                    tafsir_rows.append((tafsir_id, key, _text(rng, 400), "english", f"Source {s}", key, key, key))
+                    has_tafsir_rows.append((key, tafsir_id))
+                for topic in rng.sample(range(1, topics + 1), 2):
+                    has_topic_rows.append((key, topic))
+
+        write("Chapter", chapter_rows)
+        write("Verse", verse_rows)
+        write("Translation", translation_rows)
+        write("Tafsir", tafsir_rows)
+        write("Topic", [(t, f"Topic {t}") for t in range(1, topics + 1)])
+        write("CONTAINS", contains_rows)
+        write("HAS_TRANSLATION", has_translation_rows)
+        write("HAS_TAFSIR", has_tafsir_rows)
+        write("HAS_TOPIC", has_topic_rows)
+
+        for table in ["Chapter", "Verse", "Translation", "Tafsir", "Topic", "CONTAINS", "HAS_TRANSLATION", "HAS_TAFSIR", "HAS_TOPIC"]:
+            conn.execute(f"COPY {table} FROM '{files[table]}' (HEADER = false)")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    conn.close()
+    db.close()
+    return db_path
+
+
+def _csv_field(value):
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a synthetic Kuzu database for benchmarks")
+    parser.add_argument("db_path", help="Where to create the database")
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--verses-per-chapter", type=int, default=50)
+    parser.add_argument("--translators", type=int, default=3)
+    parser.add_argument("--tafsir-sources", type=int, default=2)
+    args = parser.parse_args()
+
+    build(
+        args.db_path,
+        chapters=args.chapters,
+        verses_per_chapter=args.verses_per_chapter,
+        translators=args.translators,
+        tafsir_sources=args.tafsir_sources,
+    )
+    print(f"Fixture database created at {args.db_path}")
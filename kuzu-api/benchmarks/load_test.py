@@ -0,0 +1,312 @@
+"""Load test kuzu-api with a weighted mix of the web app's queries.
+
+Builds a fixture database (or uses --db), serves the app either in process
+through an ASGI transport or as server.py on localhost, and drives it with
+closed-loop clients at each concurrency level for each pool size (and,
+against server.py, each worker count). Reports throughput and p50/p95/p99
+latency overall and per scenario, and writes the runs as JSON so they can be
+compared.
+
+Response caches are disabled unless --cache is given, so the numbers
+reflect query execution rather than cache hits.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 1 4 16 --pool-sizes 2 4 --output run.json
+    python benchmarks/load_test.py --mode server --workers 1 2 --output run.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_db import build  # noqa: E402
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server.py")
+
+
+# The queries below are the ones apps/web sends, with the same literal
+# interpolation, so the result cache and prepared statements see what
+# production sees.
+def chapter_listing(rng, args):
+    return "POST", "/query", {
+        "query": """
+    MATCH (c:Chapter)
+    RETURN c.id, c.chapter_number, c.name_english, c.name_arabic,
+           c.revelation_place, c.verses_count
+    ORDER BY c.chapter_number
+  """
+    }
+
+
+def surah_page(rng, args):
+    chapter = rng.randint(1, args.chapters)
+    return "POST", "/query", {
+        "query": f"""
+    MATCH (c:Chapter {{chapter_number: {chapter}}})-[:CONTAINS]->(v:Verse)
+    OPTIONAL MATCH (v)-[rtr:HAS_TRANSLATION]->(tr:Translation {{language: "en"}})
+    RETURN v.id, v.verse_key, v.verse_number, v.text_uthmani,
+           collect(distinct tr) as translations
+    ORDER BY v.verse_number
+  """
+    }
+
+
+def verse_key(rng, args):
+    return f"{rng.randint(1, args.chapters)}:{rng.randint(1, args.verses_per_chapter)}"
+
+
+def verse_page(rng, args):
+    return "POST", "/query", {
+        "query": f"""
+    MATCH (v:Verse {{verse_key: "{verse_key(rng, args)}"}})
+    OPTIONAL MATCH (v)-[r:HAS_TOPIC]->(t:Topic)
+    OPTIONAL MATCH (v)-[rt:HAS_TAFSIR]->(tf:Tafsir)
+    OPTIONAL MATCH (v)-[rtr:HAS_TRANSLATION]->(tr:Translation {{language: "en"}})
+    RETURN v, collect(distinct t) as topics, collect(distinct tf) as tafsirs, collect(distinct tr) as translations
+  """
+    }
+
+
+def typed_verse(rng, args):
+    return "GET", f"/verse/{verse_key(rng, args)}?language=en", None
+
+
+def expansion(rng, args):
+    return "POST", "/query", {
+        "query": f'MATCH (n:Verse)-[r]-(m) WHERE n.verse_key = "{verse_key(rng, args)}" RETURN n, r, m LIMIT 20'
+    }
+
+
+def explorer_default(rng, args):
+    return "POST", "/query", {
+        "query": f'MATCH (v:Verse)-[h:HAS_TOPIC]->(t:Topic) WHERE v.verse_key = "{verse_key(rng, args)}" RETURN v, h, t'
+    }
+
+
+def schema(rng, args):
+    return "GET", "/schema", None
+
+
+# name -> (request builder, default weight)
+SCENARIOS = {
+    "chapter_listing": (chapter_listing, 10),
+    "surah_page": (surah_page, 25),
+    "verse_page": (verse_page, 25),
+    "typed_verse": (typed_verse, 10),
+    "expansion": (expansion, 15),
+    "explorer_default": (explorer_default, 10),
+    "schema": (schema, 5),
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, seconds):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / seconds, 1) if seconds else 0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "max": latencies[-1] if latencies else None,
+        },
+    }
+
+
+async def drive(client, weights, concurrency, args):
+    """Run closed-loop clients for args.duration seconds and summarize the latencies"""
+    names = list(weights)
+    builders = [SCENARIOS[name][0] for name in names]
+    deadline = time.perf_counter() + args.duration
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+
+    async def worker(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            i = rng.choices(range(len(names)), weights=[weights[n] for n in names])[0]
+            method, path, body = builders[i](rng, args)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies[names[i]].append(round((time.perf_counter() - start) * 1000, 2))
+            else:
+                errors[names[i]] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.seed + n) for n in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    overall = summarize(
+        [latency for values in latencies.values() for latency in values],
+        sum(errors.values()),
+        seconds,
+    )
+    overall["scenarios"] = {
+        name: summarize(latencies[name], errors[name], seconds) for name in names
+    }
+    return overall
+
+
+async def run_in_process(db_path, pool_size, weights, args):
+    os.environ["DB_PATH"] = db_path
+    from app import main
+
+    # Settings are read at import, so override them on the module for each run
+    main.DB_PATH = db_path
+    main.POOL_SIZE = pool_size
+    main.WORKER_THREADS = pool_size
+    main.MAX_POOL_WAITERS = max(main.MAX_POOL_WAITERS, max(args.concurrency) * 2)
+    if not args.cache:
+        main.result_cache.max_entries = 0
+        main.endpoint_cache.max_entries = 0
+
+    runs = []
+    async with main.app.router.lifespan_context(main.app):
+        while not main.warmup.ready:
+            await asyncio.sleep(0.05)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+            for concurrency in args.concurrency:
+                runs.append(await drive(client, weights, concurrency, args))
+    return runs
+
+
+def wait_ready(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def run_server(db_path, pool_size, workers, weights, args):
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = dict(
+        os.environ,
+        DB_PATH=db_path,
+        PORT=str(args.port),
+        WEB_CONCURRENCY=str(workers),
+        KUZU_POOL_SIZE=str(pool_size),
+        MAX_POOL_WAITERS=str(max(64, max(args.concurrency) * 2)),
+    )
+    if not args.cache:
+        env.update(RESULT_CACHE_MAX_ENTRIES="0", ENDPOINT_CACHE_MAX_ENTRIES="0")
+    server = subprocess.Popen(
+        [sys.executable, SERVER],
+        cwd=os.path.dirname(SERVER),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    runs = []
+    try:
+        wait_ready(base_url)
+        # Each worker warms up on its own
+        time.sleep(args.settle)
+        limits = httpx.Limits(max_connections=max(args.concurrency))
+        async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+            for concurrency in args.concurrency:
+                runs.append(await drive(client, weights, concurrency, args))
+    finally:
+        server.terminate()
+        server.wait()
+    return runs
+
+
+def parse_weights(items):
+    weights = {name: weight for name, (_, weight) in SCENARIOS.items()}
+    for item in items or []:
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}', expected one of: {', '.join(SCENARIOS)}")
+        weights[name] = float(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+async def main(args):
+    db_path = args.db or build(
+        os.path.join(tempfile.mkdtemp(), "load.kz"),
+        chapters=args.chapters,
+        verses_per_chapter=args.verses_per_chapter,
+    )
+    weights = parse_weights(args.weight)
+    workers_options = args.workers if args.mode == "server" else [1]
+
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "mode": args.mode,
+        "db": db_path,
+        "host": {"python": platform.python_version(), "cpus": os.cpu_count()},
+        "duration_seconds": args.duration,
+        "cache": args.cache,
+        "weights": weights,
+        "runs": [],
+    }
+
+    print(f"{'workers':>7} {'pool':>5} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}")
+    for workers in workers_options:
+        for pool_size in args.pool_sizes:
+            if args.mode == "server":
+                runs = await run_server(db_path, pool_size, workers, weights, args)
+            else:
+                runs = await run_in_process(db_path, pool_size, weights, args)
+            for concurrency, run in zip(args.concurrency, runs):
+                run.update(workers=workers, pool_size=pool_size, concurrency=concurrency)
+                report["runs"].append(run)
+                latency = run["latency_ms"]
+                print(
+                    f"{workers:>7} {pool_size:>5} {concurrency:>7} {run['throughput_rps']:>8.1f} "
+                    f"{latency['p50'] or 0:>8.1f} {latency['p95'] or 0:>8.1f} {latency['p99'] or 0:>8.1f} {run['errors']:>6}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="Existing database to use instead of a generated fixture")
+    parser.add_argument("--mode", choices=["inprocess", "server"], default="inprocess")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[4])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="Worker processes (server mode)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--weight", action="append", metavar="SCENARIO=WEIGHT", help="Override a scenario weight, 0 drops it")
+    parser.add_argument("--cache", action="store_true", help="Keep the result caches enabled")
+    parser.add_argument("--chapters", type=int, default=20, help="Chapters in the database")
+    parser.add_argument("--verses-per-chapter", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--settle", type=float, default=2, help="Seconds to let server workers warm up")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -1,15 +1,102 @@
-import uvicorn
+import logging
 import os
 
+import uvicorn
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("server")
+
+# Fraction of the memory limit the workers may use together, and the memory
+# each worker needs besides Kuzu's buffer pool (interpreter, caches, results)
+MEMORY_FRACTION = float(os.environ.get("MEMORY_FRACTION", 0.8))
+WORKER_OVERHEAD_MB = int(os.environ.get("WORKER_OVERHEAD_MB", 256))
+# Smallest buffer pool worth running a worker with
+MIN_BUFFER_POOL_MB = int(os.environ.get("MIN_BUFFER_POOL_MB", 64))
+
+
+def cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def memory_limit_mb():
+    """The memory available to the server: MEMORY_LIMIT_MB, the cgroup limit or physical memory"""
+    if os.environ.get("MEMORY_LIMIT_MB"):
+        return int(os.environ["MEMORY_LIMIT_MB"])
+
+    physical = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    for path in (
+        "/sys/fs/cgroup/memory.max",
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+    ):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit():
+            # cgroup v1 reports a huge number when there is no limit
+            return min(int(value) // (1024 * 1024), physical)
+    return physical
+
+
+def plan_workers(workers, memory_mb, cpus):
+    """Split the memory and CPU budget between worker processes.
+
+    Every worker opens its own read-only Database with its own buffer pool,
+    so the pools plus per-worker overhead must fit in the memory budget.
+    Fewer workers are started if each would get less than MIN_BUFFER_POOL_MB.
+    Returns (workers, buffer pool MB per worker, Kuzu threads per worker).
+    """
+    budget_mb = int(memory_mb * MEMORY_FRACTION)
+    max_workers = max(1, budget_mb // (WORKER_OVERHEAD_MB + MIN_BUFFER_POOL_MB))
+    if workers > max_workers:
+        logger.warning(
+            f"{workers} workers do not fit in {budget_mb} MB, starting {max_workers} instead"
+        )
+        workers = max_workers
+
+    buffer_pool_mb = max(MIN_BUFFER_POOL_MB, budget_mb // workers - WORKER_OVERHEAD_MB)
+    threads = max(1, cpus // workers)
+    return workers, buffer_pool_mb, threads
+
+
 if __name__ == "__main__":
     # Get port from environment variable or use default
     port = int(os.environ.get("PORT", 8000))
-    
+
+    # Worker processes, each opening the database read-only; "auto" starts
+    # one per CPU
+    cpus = cpu_count()
+    requested = os.environ.get("WEB_CONCURRENCY", "1")
+    workers = cpus if requested == "auto" else int(requested)
+    memory_mb = memory_limit_mb()
+    workers, buffer_pool_mb, threads = plan_workers(workers, memory_mb, cpus)
+    if workers > 1:
+        logger.warning(
+            f"{workers} workers keep separate cursors, metrics, slow-query logs and "
+            "result caches: cursor pages must reach the worker that opened them and "
+            "/metrics reports whichever worker answers the scrape"
+        )
+
+    # Explicit settings win over the computed budget. Workers read these in
+    # app.main when they open the database.
+    os.environ.setdefault("KUZU_BUFFER_POOL_MB", str(buffer_pool_mb))
+    os.environ.setdefault("KUZU_MAX_THREADS", str(threads))
+    logger.info(
+        f"Starting {workers} worker(s) with {memory_mb} MB and {cpus} CPU(s): "
+        f"buffer pool {os.environ['KUZU_BUFFER_POOL_MB']} MB and "
+        f"{os.environ['KUZU_MAX_THREADS']} Kuzu thread(s) per worker"
+    )
+
     # Run the server
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=port,
         reload=False,
+        workers=workers,
         log_level="info"
     )
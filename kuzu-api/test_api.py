@@ -1,8 +1,9 @@
 import requests
 import json
+import os
 
 # Base URL for the API
-BASE_URL = "http://localhost:8000"
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000")
 
 def test_health():
     """Test the health check endpoint"""
@@ -11,6 +12,13 @@ def test_health():
     print(json.dumps(response.json(), indent=2))
     print()
 
+def test_ready():
+    """Test the readiness endpoint (503 until warm-up finishes)"""
+    response = requests.get(f"{BASE_URL}/ready")
+    print("Ready Response:", response.status_code)
+    print(json.dumps(response.json(), indent=2))
+    print()
+
 def test_query():
     """Test the query endpoint with a simple query"""
     query_data = {
@@ -21,21 +29,38 @@ def test_query():
     print(json.dumps(response.json(), indent=2))
     print()
 
-def test_trigger_sync():
-    """Test the trigger-sync endpoint"""
-    response = requests.get(f"{BASE_URL}/trigger-sync")
-    print("Trigger Sync Response:", response.status_code)
+def test_verse():
+    """Test the typed verse endpoint"""
+    response = requests.get(f"{BASE_URL}/verse/1:1", params={"language": "en"})
+    print("Verse Response:", response.status_code)
+    print(json.dumps(response.json(), indent=2)[:1000])
+    print()
+
+def test_schema():
+    """Test the schema endpoint"""
+    response = requests.get(f"{BASE_URL}/schema")
+    print("Schema Response:", response.status_code)
+    print("Node tables:", [table["name"] for table in response.json().get("node_tables", [])])
+    print()
+
+def test_sync_instructions():
+    """Test the sync-instructions endpoint"""
+    response = requests.get(f"{BASE_URL}/sync-instructions")
+    print("Sync Instructions Response:", response.status_code)
     print(json.dumps(response.json(), indent=2))
     print()
 
 if __name__ == "__main__":
     print("Testing Kuzu API...")
     print("===================")
-    
+
     try:
         test_health()
+        test_ready()
         test_query()
-        test_trigger_sync()
+        test_verse()
+        test_schema()
+        test_sync_instructions()
         print("All tests completed!")
     except Exception as e:
         print(f"Error during testing: {str(e)}")
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+
+from app import cache
+from app.cache import ResultCache, SingleFlight
+from app.cypher import analyze_query
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used_beyond_max_entries():
+    results = ResultCache(max_entries=2, max_bytes=1024)
+    results.put("a", b"1")
+    results.put("b", b"2")
+    assert results.get("a") == b"1"
+    results.put("c", b"3")
+    assert results.get("b") is None
+    assert results.get("a") == b"1"
+    assert results.get("c") == b"3"
+    assert results.stats()["evictions"] == 1
+
+
+def test_lru_evicts_beyond_max_bytes():
+    results = ResultCache(max_entries=10, max_bytes=10)
+    results.put("a", b"x" * 4)
+    results.put("b", b"x" * 4)
+    results.put("c", b"x" * 4)
+    assert results.get("a") is None
+    assert results.stats()["bytes"] == 8
+
+    # A body larger than the whole cache is not stored and evicts nothing
+    results.put("d", b"x" * 11)
+    assert results.get("d") is None
+    assert results.stats()["entries"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    results = ResultCache(ttl_seconds=60)
+    results.put("a", b"1")
+    clock.now += 59
+    assert results.get("a") == b"1"
+    clock.now += 2
+    assert results.get("a") is None
+    assert results.stats()["expirations"] == 1
+
+
+def test_new_snapshot_version_drops_entries():
+    results = ResultCache()
+    results.set_version("v1")
+    results.put("a", b"1", "v1")
+    results.set_version("v2")
+    assert results.get("a") is None
+    assert results.stats()["invalidations"] == 1
+
+    # A body computed on the replaced snapshot is not cached
+    results.put("a", b"1", "v1")
+    assert results.get("a") is None
+
+
+def test_snapshot_version_changes_with_database_files(tmp_path):
+    database = tmp_path / "db.kz"
+    database.write_bytes(b"1")
+    version = cache.snapshot_version(str(database))
+    assert cache.snapshot_version(str(database)) == version
+    database.write_bytes(b"12")
+    assert cache.snapshot_version(str(database)) != version
+
+
+def test_concurrent_calls_share_one_execution():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(3)))
+        return results, calls, flight.stats()
+
+    results, calls, stats = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [(1, False), (1, True), (1, True)]
+    assert stats == {"in_flight": 0, "executions": 1, "coalesced": 2}
+
+
+def test_shared_call_errors_reach_every_caller():
+    async def run():
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(
+            *(flight.do("key", fn) for _ in range(2)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_coalescing_key_includes_timeout(monkeypatch, tmp_path):
+    """Requests only share an execution when they asked for the same timeout"""
+    main = pytest.importorskip("app.main")
+    executions = []
+
+    async def run_until_disconnected(request, fn, *args, profile=None):
+        executions.append(args)
+        await asyncio.sleep(0.01)
+        return b'{"data":[]}'
+
+    monkeypatch.setattr(main, "active_path", str(tmp_path))
+    monkeypatch.setattr(main, "run_until_disconnected", run_until_disconnected)
+    monkeypatch.setattr(main, "result_cache", ResultCache(max_entries=0))
+    monkeypatch.setattr(main, "in_flight", SingleFlight())
+
+    async def run():
+        analysis = analyze_query("RETURN 1")
+        return await asyncio.gather(
+            *(
+                main.answer_query(None, analysis, "RETURN 1", None, timeout_ms, main.RECORDS)
+                for timeout_ms in (1000, 1000, 2000)
+            )
+        )
+
+    responses = asyncio.run(run())
+    assert len(executions) == 2
+    assert [headers["X-Cache"] for _, headers in responses] == ["MISS", "COALESCED", "MISS"]
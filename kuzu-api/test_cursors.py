@@ -0,0 +1,41 @@
+from app import cursors
+from app.cursors import CursorStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_cursor_expires_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cursors, "time", clock)
+    store = CursorStore(ttl_seconds=300)
+    token = store.open("key", ["n"], [b'{"n":1}'], 7, False)
+
+    clock.now += 299
+    cursor_id, cursor, offset = store.get(token)
+    assert cursor.rows == [b'{"n":1}'] and offset == 0
+
+    clock.now += 2
+    assert store.get(token) is None
+    assert store.stats()["expired"] == 1
+    assert store.stats()["bytes"] == 0
+
+
+def test_oldest_cursors_are_evicted_beyond_bounds():
+    store = CursorStore(max_cursors=10, max_bytes=10)
+    first = store.open("a", ["n"], [b"x" * 6], 6, False)
+    second = store.open("b", ["n"], [b"x" * 6], 6, False)
+    assert store.get(first) is None
+    assert store.get(second) is not None
+    assert store.stats()["evicted"] == 1
+
+
+def test_unknown_or_malformed_tokens_resolve_to_none():
+    store = CursorStore()
+    assert store.get(CursorStore.token("missing", 0)) is None
+    assert store.get("not a token") is None
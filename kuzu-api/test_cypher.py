@@ -0,0 +1,88 @@
+from app.cypher import analyze_query
+
+
+def test_read_queries_are_allowed():
+    """Plain reads and procedure calls are read-only"""
+    for query in [
+        "MATCH (v:Verse) RETURN v",
+        "CALL show_tables() RETURN *",
+        "CALL TABLE_INFO('Verse') RETURN *",
+        "MATCH (n:Verse) WHERE n.text CONTAINS 'create' RETURN n",
+        "MATCH (n:Verse) RETURN n // delete nothing",
+    ]:
+        assert analyze_query(query).read_only, query
+
+
+def test_write_clauses_are_rejected():
+    """Write clauses are found in any case and anywhere in the query"""
+    cases = {
+        "CREATE (n:Verse {verse_key: '1:1'})": ("CREATE",),
+        "match (n:Verse) set n.text = 'x'": ("SET",),
+        "MATCH (n) DETACH DELETE n": ("DETACH", "DELETE"),
+        "COPY Verse FROM 'verses.csv'": ("COPY",),
+        "LOAD FROM 'file.csv' RETURN *": ("LOAD",),
+        "MATCH (n) RETURN n; DROP TABLE Verse": ("DROP",),
+        "CALL { CREATE (n:Topic {topic_id: 1}) }": ("CREATE",),
+    }
+    for query, keywords in cases.items():
+        assert analyze_query(query).write_keywords == keywords, query
+
+
+def test_connection_settings_are_rejected():
+    """CALL <option> = <value> changes the pooled connection for later requests"""
+    for query, option in [
+        ("CALL threads=1", "threads"),
+        ("call timeout = 1000", "timeout"),
+        ("CALL `progress_bar` = true", "`progress_bar`"),
+    ]:
+        analysis = analyze_query(query)
+        assert not analysis.read_only, query
+        assert analysis.write_keywords == (f"CALL {option}",)
+
+
+def test_keywords_used_as_names_are_allowed():
+    """Aliases, variables, properties, labels and map keys named like clauses are not writes"""
+    for query in [
+        "MATCH (n:Verse) RETURN n AS load",
+        "MATCH (n:Verse) RETURN n.id AS set, n.text AS copy",
+        "MATCH (set:Verse) RETURN set.verse_key",
+        "MATCH (n:Verse) RETURN count(n), [x IN [1] | x] AS delete",
+        "MATCH (n:Verse) RETURN n.create, {merge: 1}",
+        "MATCH (n:Verse) WHERE n.verse_key = $set RETURN n",
+    ]:
+        assert analyze_query(query).read_only, query
+
+
+def test_bare_keyword_variables_are_rejected():
+    """A clause keyword used as a bare variable cannot be told apart from the clause"""
+    assert not analyze_query("MATCH (set:Verse) RETURN set").read_only
+
+
+def test_cache_key_normalizes_spacing_and_keyword_case():
+    """Queries differing only in whitespace, comments or keyword case share a key"""
+    key = analyze_query("MATCH (v:Verse) WHERE v.surah_number = 1 RETURN count(*)").cache_key()
+    assert analyze_query("match (v:Verse)\n  where v.surah_number=1 // first\n return count(*) ").cache_key() == key
+    assert analyze_query("RETURN 1+1").cache_key() == analyze_query("RETURN 1 + 1").cache_key()
+
+
+def test_cache_key_keeps_literals_and_names():
+    """Literals, labels, properties and map keys keep their text and case"""
+    assert analyze_query("RETURN 'a  b'").cache_key() != analyze_query("RETURN 'a b'").cache_key()
+    assert analyze_query("RETURN 'match'").cache_key() != analyze_query("RETURN 'MATCH'").cache_key()
+    assert analyze_query("RETURN 1.5").cache_key() != analyze_query("RETURN 1 .5").cache_key()
+    assert analyze_query("RETURN {end: 1}").cache_key() != analyze_query("RETURN {END: 1}").cache_key()
+    assert analyze_query("RETURN 1 AS all").cache_key() != analyze_query("RETURN 1 AS ALL").cache_key()
+    assert analyze_query("MATCH (v:Verse) RETURN v").cache_key() != analyze_query("MATCH (v:verse) RETURN v").cache_key()
+
+
+def test_cache_key_canonicalizes_params():
+    analysis = analyze_query("MATCH (v:Verse {verse_key: $k}) RETURN v")
+    assert analysis.cache_key({"k": "1:1", "a": 1}) == analysis.cache_key({"a": 1, "k": "1:1"})
+    assert analysis.cache_key({"k": "1:1"}) != analysis.cache_key({"k": "1:2"})
+
+
+def test_fingerprint_ignores_literals_and_keyword_case():
+    first = analyze_query("MATCH (v:Verse) WHERE v.surah_number = 2 RETURN v")
+    second = analyze_query("match (v:Verse)  where v.surah_number = 114 return v")
+    assert first.fingerprint == second.fingerprint
+    assert first.fingerprint[1] == "MATCH (v:Verse) WHERE v.surah_number = ? RETURN v"
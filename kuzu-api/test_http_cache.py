@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+from app import http_cache
+from app.http_cache import cacheable_response, etag_matches, make_etag, negotiate_encoding
+
+
+def request(headers):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def test_weak_etag_matches_strong_or_weak_if_none_match():
+    etag = make_etag("v1", "verse\x001:1")
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(make_etag("v2", "verse\x001:1"), etag)
+    assert not etag_matches(None, etag)
+
+
+def test_not_modified_on_matching_etag(monkeypatch, tmp_path):
+    """A request whose If-None-Match matches the current ETag gets 304"""
+    kuzu = pytest.importorskip("kuzu")
+    main = pytest.importorskip("app.main")
+    from fastapi.testclient import TestClient
+
+    path = str(tmp_path / "http_cache.kz")
+    conn = kuzu.Connection(kuzu.Database(path))
+    conn.execute("CREATE NODE TABLE Verse(verse_key STRING PRIMARY KEY)")
+    conn.close()
+    monkeypatch.setattr(main, "DB_PATH", path)
+
+    with TestClient(main.app) as client:
+        first = client.get("/schema")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        second = client.get("/schema", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert not second.content
+
+
+def test_negotiate_prefers_zstd_then_gzip():
+    if http_cache.zstandard is not None:
+        assert negotiate_encoding("gzip, zstd") == "zstd"
+    assert negotiate_encoding("gzip, zstd;q=0") == "gzip"
+    assert negotiate_encoding("gzip;q=0, zstd;q=0") is None
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding(None) is None
+
+
+def test_response_is_compressed_with_negotiated_encoding():
+    body = b'{"data":[' + b",".join(b'{"n":1}' for _ in range(500)) + b"]}"
+
+    def respond(accept_encoding):
+        return asyncio.run(
+            cacheable_response(
+                request({"Accept-Encoding": accept_encoding}),
+                body,
+                "application/json",
+                make_etag("v1", "key"),
+                "public, max-age=60",
+            )
+        )
+
+    response = respond("gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == body
+
+    if http_cache.zstandard is not None:
+        response = respond("gzip, zstd")
+        assert response.headers["content-encoding"] == "zstd"
+        assert http_cache.zstandard.ZstdDecompressor().decompress(response.body) == body
+
+    response = respond("identity")
+    assert "content-encoding" not in response.headers
+    assert response.body == body
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from app.pool import ConnectionPool, PoolExhausted
+
+kuzu = pytest.importorskip("kuzu")
+
+
+@pytest.fixture
+def db(tmp_path):
+    return kuzu.Database(str(tmp_path / "pool.kz"))
+
+
+def test_burst_beyond_waiter_bound_is_shed(db):
+    """A burst arriving in one tick queues at most max_waiters beyond the idle connections"""
+
+    async def burst():
+        pool = ConnectionPool(db, size=1, max_waiters=1, acquire_timeout=5)
+
+        async def acquire():
+            conn = await pool.acquire()
+            await asyncio.sleep(0.05)
+            pool.release(conn)
+
+        results = await asyncio.gather(*(acquire() for _ in range(4)), return_exceptions=True)
+        stats = pool.stats()
+        pool.close()
+        return results, stats
+
+    results, stats = asyncio.run(burst())
+    shed = [r for r in results if isinstance(r, PoolExhausted)]
+    assert len(shed) == 2
+    assert stats["shed"] == 2
+    assert stats["acquired"] == 2
+
+    from app.main import query_error
+
+    error = query_error(shed[0])
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+
+
+def test_waiters_within_bound_are_served(db):
+    async def burst():
+        pool = ConnectionPool(db, size=2, max_waiters=2, acquire_timeout=5)
+
+        async def acquire():
+            conn = await pool.acquire()
+            await asyncio.sleep(0.01)
+            pool.release(conn)
+
+        results = await asyncio.gather(*(acquire() for _ in range(4)), return_exceptions=True)
+        stats = pool.stats()
+        pool.close()
+        return results, stats
+
+    results, stats = asyncio.run(burst())
+    assert not any(isinstance(r, Exception) for r in results)
+    assert stats["shed"] == 0
+
+
+def test_run_on_each_holds_one_connection_at_a_time(db):
+    """Requests get a connection while the others are being visited"""
+
+    async def warm_while_serving():
+        pool = ConnectionPool(db, size=2, acquire_timeout=5)
+        in_use = []
+
+        def visit(conn):
+            in_use.append(pool.stats()["in_use"])
+            time.sleep(0.1)
+            return conn
+
+        warming = asyncio.create_task(pool.run_on_each(visit, interval=0.01))
+        await asyncio.sleep(0.02)
+        start_time = time.perf_counter()
+        async with pool.connection():
+            wait = time.perf_counter() - start_time
+            await asyncio.sleep(0.05)
+        visited = await warming
+        pool.close()
+        return wait, visited, in_use
+
+    wait, visited, in_use = asyncio.run(warm_while_serving())
+    assert wait < 0.05
+    assert len(set(map(id, visited))) == 2
+    assert max(in_use) <= 2
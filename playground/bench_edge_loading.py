@@ -0,0 +1,173 @@
+"""Rows per second of HAS_TAFSIR edge creation, per-edge CREATE vs bulk COPY.
+
+Builds a throwaway database with synthetic verses and tafsir nodes, then
+creates the verse -> tafsir edges the way the loaders used to (one
+MATCH ... CREATE per edge, timed on a sample since it is slow) and the way
+they do now (one COPY per batch of (verse_key, id) pairs via bulk_edges).
+A fraction of the tafsir rows point at verse keys that do not exist, as in
+the raw data, to exercise the skipped-key reporting.
+
+Usage:
+    python bench_edge_loading.py --rows 20000 --sample 2000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+import kuzu
+import pandas as pd
+
+from bulk_edges import copy_verse_edges, load_verse_keys, report_missing
+
+
+def build(db_path, chapters, verses_per_chapter, rows, missing_rate, seed):
+    """Create Verse and Tafsir nodes and return the (verse_key, id) pairs to connect"""
+    rng = random.Random(seed)
+    db = kuzu.Database(db_path)
+    conn = kuzu.Connection(db)
+    conn.execute(
+        "CREATE NODE TABLE Verse (id INT64, surah_number INT64, ayah_number INT64, "
+        "verse_key STRING PRIMARY KEY, text STRING)"
+    )
+    conn.execute(
+        "CREATE NODE TABLE Tafsir (id INT64 PRIMARY KEY, verse_key STRING, text STRING, "
+        "language STRING, source STRING, group_ayah_key STRING, from_ayah STRING, to_ayah STRING)"
+    )
+
+    work_dir = os.path.dirname(db_path)
+    verses = [
+        (c * 1000 + v, c, v, f"{c}:{v}", "text")
+        for c in range(1, chapters + 1)
+        for v in range(1, verses_per_chapter + 1)
+    ]
+    verses_csv = os.path.join(work_dir, "verses.csv")
+    pd.DataFrame(verses, columns=["id", "surah_number", "ayah_number", "verse_key", "text"]).to_csv(
+        verses_csv, index=False
+    )
+    conn.execute(f"COPY Verse FROM '{verses_csv}' (HEADER = true)")
+
+    pairs = []
+    for node_id in range(1, rows + 1):
+        if rng.random() < missing_rate:
+            verse_key = f"{chapters + rng.randint(1, 5)}:{rng.randint(1, verses_per_chapter)}"
+        else:
+            verse_key = rng.choice(verses)[3]
+        pairs.append((verse_key, node_id))
+    tafsirs_csv = os.path.join(work_dir, "tafsirs.csv")
+    pd.DataFrame(
+        [(node_id, key, "text", "english", "Source", key, key, key) for key, node_id in pairs],
+        columns=["id", "verse_key", "text", "language", "source", "group_ayah_key", "from_ayah", "to_ayah"],
+    ).to_csv(tafsirs_csv, index=False)
+    conn.execute(f"COPY Tafsir FROM '{tafsirs_csv}' (HEADER = true)")
+    return db, conn, pairs
+
+
+def reset_edges(conn):
+    conn.execute("DROP TABLE IF EXISTS HAS_TAFSIR")
+    conn.execute("CREATE REL TABLE HAS_TAFSIR (FROM Verse TO Tafsir)")
+
+
+def per_edge(conn, pairs):
+    """The previous loader code: one statement per edge"""
+    failed = 0
+    for verse_key, node_id in pairs:
+        try:
+            conn.execute(
+                f"""
+            MATCH (v:Verse), (t:Tafsir)
+            WHERE v.verse_key = '{verse_key}' AND t.id = {node_id}
+            CREATE (v)-[:HAS_TAFSIR]->(t)
+            """
+            )
+        except Exception:
+            failed += 1
+    return failed
+
+
+def bulk_copy(conn, pairs, batch_size, work_dir):
+    verse_keys = load_verse_keys(conn)
+    missing_verses = Counter()
+    for start in range(0, len(pairs), batch_size):
+        _, missing = copy_verse_edges(
+            conn,
+            "HAS_TAFSIR",
+            pairs[start:start + batch_size],
+            verse_keys,
+            os.path.join(work_dir, "has_tafsir.parquet"),
+        )
+        missing_verses.update(missing)
+    return missing_verses
+
+
+def edge_count(conn):
+    return conn.execute("MATCH ()-[r:HAS_TAFSIR]->() RETURN count(r)").get_next()[0]
+
+
+def main(args):
+    work_dir = tempfile.mkdtemp()
+    try:
+        db, conn, pairs = build(
+            os.path.join(work_dir, "edges.kz"),
+            args.chapters,
+            args.verses_per_chapter,
+            args.rows,
+            args.missing_rate,
+            args.seed,
+        )
+        results = {"rows": len(pairs)}
+
+        reset_edges(conn)
+        sample = pairs[: args.sample]
+        start = time.perf_counter()
+        per_edge(conn, sample)
+        seconds = time.perf_counter() - start
+        results["per_edge_create"] = {
+            "rows": len(sample),
+            "edges": edge_count(conn),
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(len(sample) / seconds),
+        }
+
+        reset_edges(conn)
+        start = time.perf_counter()
+        missing = bulk_copy(conn, pairs, args.batch_size, work_dir)
+        seconds = time.perf_counter() - start
+        results["bulk_copy"] = {
+            "rows": len(pairs),
+            "edges": edge_count(conn),
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(len(pairs) / seconds),
+            "skipped": sum(missing.values()),
+        }
+        results["speedup"] = round(
+            results["bulk_copy"]["rows_per_sec"] / results["per_edge_create"]["rows_per_sec"], 1
+        )
+
+        report_missing("HAS_TAFSIR", missing)
+        for method in ("per_edge_create", "bulk_copy"):
+            r = results[method]
+            print(f"{method:>16}: {r['rows']:>7} rows in {r['seconds']:>7.2f} s = {r['rows_per_sec']:>8} rows/s, {r['edges']} edges")
+        print(f"Speedup: {results['speedup']}x")
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="Tafsir rows to connect")
+    parser.add_argument("--sample", type=int, default=2000, help="Rows timed with per-edge CREATE")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per COPY, as in the loaders")
+    parser.add_argument("--chapters", type=int, default=114)
+    parser.add_argument("--verses-per-chapter", type=int, default=55)
+    parser.add_argument("--missing-rate", type=float, default=0.01, help="Fraction of rows whose verse does not exist")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    main(parser.parse_args())
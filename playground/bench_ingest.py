@@ -0,0 +1,149 @@
+"""Full ingest.py build against a synthetic or given raw_data, with per-stage timings as JSON.
+
+Generates a raw_data directory with synthetic_raw_data.py (or uses
+--raw-data), then builds a fresh database from it with ingest.py in a
+separate process and reports, per source:
+
+- wall seconds of each stage: inspect (hash and count), waiting for staged
+  batches, node COPY and edge COPY
+- worker seconds of each stage: read (SQLite), transform (grouping and
+  columns) and write (Parquet), summed over the workers
+- rows, nodes and edges, and rows per second of the whole source
+
+plus the total build time, overall rows per second, the peak resident
+memory of the build process and of its workers, and the database size.
+
+Usage:
+    python bench_ingest.py --tafsir-sources 8 --translation-sources 20 --output ingest.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import kuzu
+
+from ingest import BATCH_ROWS, SOURCES, ingest
+from synthetic_raw_data import generate
+
+
+def build(raw_data_dir, work_dir, source_names, workers, batch_rows):
+    """Build a fresh database and measure it (runs in its own process)"""
+    db_path = os.path.join(work_dir, "bench.kz")
+    db = kuzu.Database(db_path)
+    conn = kuzu.Connection(db)
+    start_time = time.time()
+    stats = ingest(
+        conn,
+        raw_data_dir,
+        os.path.join(work_dir, "manifest.json"),
+        source_names,
+        workers,
+        batch_rows=batch_rows,
+    )
+    seconds = time.time() - start_time
+    db.close()
+    # ru_maxrss is in kilobytes on Linux; the workers have exited by now
+    return {
+        "seconds": round(seconds, 3),
+        "sources": stats,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_worker_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "database_bytes": os.path.getsize(db_path),
+    }
+
+
+def report(result):
+    """Add per-source and overall rates and the stage breakdown"""
+    total_rows = 0
+    for stats in result["sources"].values():
+        wall = stats.pop("seconds")
+        workers = stats.pop("worker_seconds")
+        stats["rows_per_sec"] = round(stats["rows"] / sum(wall.values())) if sum(wall.values()) else None
+        stats["stages"] = {
+            "inspect": wall["inspect"],
+            "read": workers.get("read", 0),
+            "transform": workers.get("transform", 0),
+            "stage": workers.get("write", 0),
+            "stage_wait": wall["stage"],
+            "copy_nodes": wall["copy_nodes"],
+            "copy_edges": wall["copy_edges"],
+        }
+        total_rows += stats["rows"]
+    result["rows"] = total_rows
+    result["rows_per_sec"] = round(total_rows / result["seconds"]) if result["seconds"] else None
+    return result
+
+
+def main(args):
+    work_dir = tempfile.mkdtemp(prefix="bench_ingest_")
+    try:
+        raw_data_dir = args.raw_data
+        corpus = None
+        if not raw_data_dir:
+            raw_data_dir = os.path.join(work_dir, "raw_data")
+            start_time = time.time()
+            corpus = generate(
+                raw_data_dir,
+                args.chapters,
+                args.tafsir_sources,
+                args.translation_sources,
+                args.grouped_fraction,
+                args.max_group,
+                args.seed,
+            )
+            corpus["seconds"] = round(time.time() - start_time, 3)
+            print(f"Generated {corpus} in {raw_data_dir}")
+
+        # A fresh process so peak memory covers the build alone
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as runner:
+            result = runner.submit(
+                build, raw_data_dir, work_dir, args.sources, args.workers, args.batch_rows
+            ).result()
+        result = report(result)
+        result["corpus"] = corpus
+        result["settings"] = {
+            "workers": args.workers or os.cpu_count(),
+            "batch_rows": args.batch_rows,
+            "sources": args.sources,
+        }
+
+        print()
+        for name, stats in result["sources"].items():
+            stages = ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in stats["stages"].items())
+            print(f"{name:>12}: {stats['rows']:>8} rows {stats['rows_per_sec']:>8} rows/s  {stages}")
+        print(
+            f"Total: {result['rows']} rows in {result['seconds']:.2f} s = {result['rows_per_sec']} rows/s, "
+            f"peak RSS {result['peak_rss_mb']} MB (workers {result['peak_worker_rss_mb']} MB), "
+            f"database {result['database_bytes'] / 1e6:.1f} MB"
+        )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(result, f, indent=2)
+    finally:
+        if args.keep:
+            print(f"Kept {work_dir}")
+        else:
+            shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raw-data", help="Benchmark this raw_data directory instead of a generated one")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), default=sorted(SOURCES))
+    parser.add_argument("--workers", type=int, help="ingest.py worker processes (default: one per CPU)")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    parser.add_argument("--chapters", type=int, default=114, help="Chapters of the generated corpus")
+    parser.add_argument("--tafsir-sources", type=int, default=4)
+    parser.add_argument("--translation-sources", type=int, default=10)
+    parser.add_argument("--grouped-fraction", type=float, default=0.5)
+    parser.add_argument("--max-group", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the generated data and database")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    main(parser.parse_args())
@@ -0,0 +1,125 @@
+"""Node count and database size of grouped tafsir stored once per group vs once per verse.
+
+Loads the tafsir files of a raw_data directory into two throwaway
+databases: one the way the loaders used to, with a Tafsir node per SQLite
+row, and one through ingest.py, with a node per group of verses sharing
+the same commentary. Reports the node and edge counts and database sizes
+of both, and checks that every verse gets the same tafsir texts.
+
+Usage:
+    python bench_tafsir_dedupe.py --raw-data raw_data --output dedupe.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+
+import kuzu
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bulk_edges import load_verse_keys, split_missing
+from ingest import KEEP_ROWS, SOURCES, ensure_verses, ingest, source_files
+
+
+def per_verse(db_path, raw_data_dir, work_dir):
+    """The previous layout: one Tafsir node per row, one edge to its ayah_key"""
+    source = SOURCES["tafsir"]
+    db = kuzu.Database(db_path)
+    conn = kuzu.Connection(db)
+    ensure_verses(conn, raw_data_dir, work_dir)
+    verse_keys = load_verse_keys(conn)
+    conn.execute(source["schema"])
+    # The previous layout had no content hash
+    conn.execute("ALTER TABLE Tafsir DROP text_hash")
+    conn.execute("CREATE REL TABLE IF NOT EXISTS HAS_TAFSIR (FROM Verse TO Tafsir)")
+
+    next_id = 1
+    for path in source_files(raw_data_dir, source):
+        language, label = source["describe"](os.path.basename(path))
+        sqlite_conn = sqlite3.connect(path)
+        try:
+            rows = sqlite_conn.execute(f"{source['select']} {KEEP_ROWS} ORDER BY rowid").fetchall()
+        finally:
+            sqlite_conn.close()
+        if not rows:
+            continue
+        ids = list(range(next_id, next_id + len(rows)))
+        next_id += len(rows)
+        nodes = pa.table({"id": pa.array(ids, pa.int64()), **source["columns"](rows, language, label)})
+        nodes = nodes.drop_columns(["text_hash"])
+        edges, _ = split_missing(zip(nodes.column("verse_key").to_pylist(), ids), verse_keys)
+        pq.write_table(nodes, os.path.join(work_dir, "nodes.parquet"))
+        pq.write_table(edges, os.path.join(work_dir, "edges.parquet"))
+        conn.execute(f"COPY Tafsir FROM '{os.path.join(work_dir, 'nodes.parquet')}'")
+        if edges.num_rows:
+            conn.execute(f"COPY HAS_TAFSIR FROM '{os.path.join(work_dir, 'edges.parquet')}'")
+    return db, conn
+
+
+def grouped(db_path, raw_data_dir, workers):
+    db = kuzu.Database(db_path)
+    conn = kuzu.Connection(db)
+    ingest(conn, raw_data_dir, f"{db_path}.manifest.json", ["tafsir"], workers)
+    return db, conn
+
+
+def measure(db, conn, db_path):
+    """Counts, size and the (verse, source, text) triples a verse query sees"""
+    nodes = conn.execute("MATCH (t:Tafsir) RETURN count(t)").get_next()[0]
+    edges = conn.execute("MATCH ()-[r:HAS_TAFSIR]->() RETURN count(r)").get_next()[0]
+    result = conn.execute(
+        "MATCH (v:Verse)-[:HAS_TAFSIR]->(t:Tafsir) RETURN v.verse_key, t.source, t.language, t.text"
+    )
+    seen = []
+    while result.has_next():
+        seen.append(tuple(result.get_next()))
+    db.close()
+    size = sum(
+        os.path.getsize(os.path.join(os.path.dirname(db_path), f))
+        for f in os.listdir(os.path.dirname(db_path))
+        if f.startswith(os.path.basename(db_path)) and not f.endswith(".json")
+    )
+    return {"nodes": nodes, "edges": edges, "size_bytes": size}, sorted(seen)
+
+
+def main(args):
+    work_dir = tempfile.mkdtemp()
+    try:
+        results = {}
+        seen = {}
+        for layout in ("per_verse", "grouped"):
+            os.makedirs(os.path.join(work_dir, layout))
+            db_path = os.path.join(work_dir, layout, "tafsir.kz")
+            if layout == "per_verse":
+                db, conn = per_verse(db_path, args.raw_data, os.path.join(work_dir, layout))
+            else:
+                db, conn = grouped(db_path, args.raw_data, args.workers)
+            results[layout], seen[layout] = measure(db, conn, db_path)
+
+        before, after = results["per_verse"], results["grouped"]
+        results["node_reduction"] = round(1 - after["nodes"] / before["nodes"], 3) if before["nodes"] else 0
+        results["size_reduction"] = round(1 - after["size_bytes"] / before["size_bytes"], 3)
+        results["same_verse_results"] = seen["per_verse"] == seen["grouped"]
+
+        print()
+        for layout in ("per_verse", "grouped"):
+            r = results[layout]
+            print(f"{layout:>10}: {r['nodes']:>8} nodes {r['edges']:>8} edges {r['size_bytes'] / 1e6:>9.1f} MB")
+        print(f"Nodes: {results['node_reduction']:.1%} fewer, size: {results['size_reduction']:.1%} smaller")
+        print(f"Verse queries return the same tafsirs: {results['same_verse_results']}")
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--raw-data", default="./raw_data", help="Directory with ayah.sqlite and tafsir_*.sqlite")
+    parser.add_argument("--workers", type=int, help="Worker processes for ingest.py")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    main(parser.parse_args())
@@ -0,0 +1,68 @@
+"""Bulk relationship loading shared by the loader scripts.
+
+Verse edges are written with one COPY from (verse_key, id) pairs instead of
+a MATCH ... CREATE statement per edge. A pair whose verse does not exist
+would fail the whole COPY, so those are filtered out first and reported
+together at the end.
+"""
+import os
+from collections import Counter
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def load_verse_keys(conn):
+    """All verse keys in the graph"""
+    result = conn.execute("MATCH (v:Verse) RETURN v.verse_key")
+    verse_keys = set()
+    while result.has_next():
+        verse_keys.add(result.get_next()[0])
+    return verse_keys
+
+
+def split_missing(pairs, verse_keys):
+    """Separate (verse_key, id) pairs whose verse exists from those whose verse does not.
+
+    Returns the edges as a from/to Arrow table and a Counter of the missing verse keys.
+    """
+    missing = Counter()
+    from_keys = []
+    to_ids = []
+    for verse_key, node_id in pairs:
+        if verse_key in verse_keys:
+            from_keys.append(verse_key)
+            to_ids.append(node_id)
+        else:
+            missing[verse_key] += 1
+    edges = pa.table(
+        {"from": pa.array(from_keys, pa.string()), "to": pa.array(to_ids, pa.int64())}
+    )
+    return edges, missing
+
+
+def copy_verse_edges(conn, rel_table, pairs, verse_keys, staging_path):
+    """COPY (verse_key, id) pairs into rel_table, skipping verses not in the graph.
+
+    Returns the number of edges created and a Counter of the skipped verse keys.
+    """
+    edges, missing = split_missing(pairs, verse_keys)
+    if edges.num_rows:
+        pq.write_table(edges, staging_path)
+        try:
+            conn.execute(f"COPY {rel_table} FROM '{staging_path}'")
+        finally:
+            os.remove(staging_path)
+    return edges.num_rows, missing
+
+
+def report_missing(rel_table, missing, limit=10):
+    """Print one summary line for edges skipped because their verse does not exist"""
+    if not missing:
+        return
+    examples = ", ".join(f"{key} ({count})" for key, count in missing.most_common(limit))
+    more = f" and {len(missing) - limit} more" if len(missing) > limit else ""
+    print(
+        f"Skipped {sum(missing.values())} {rel_table} edges for {len(missing)} verse keys "
+        f"not in the graph: {examples}{more}"
+    )
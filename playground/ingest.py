@@ -0,0 +1,662 @@
+"""Incremental, resumable ingestion of the raw SQLite files into the graph.
+
+A JSON manifest next to the database records, per input file, its content
+hash, row count, the id range its nodes were given and how many rows have
+been loaded. On each run every file is hashed and counted in a process pool
+and compared with the manifest: unchanged files are skipped, a changed file
+has its old id range deleted and is loaded again under new ids, and a file
+that a crash cut off resumes after its last checkpoint. Files loaded before
+the manifest existed are deleted by language and source/translator and
+loaded again, since there is no way to tell whether they are complete.
+
+Ids are fixed before staging starts: files in name order, rows in rowid
+order, counting up from the largest id in the table or the manifest. Each
+file is split into batches of up to BATCH_ROWS rows, read and cleaned in the
+pool into Parquet staging files, one for the nodes and one for the verse
+edges. Batches are copied in order while later ones are still staging, and
+the manifest is saved after each batch's COPY.
+
+Grouped-ayah tafsir, where consecutive rows of a group repeat the same
+commentary or leave it empty, is stored once per group: one Tafsir node
+carrying the text and its sha256 text_hash, numbered by the group's first
+row, with a HAS_TAFSIR edge to every verse the group's rows and ayah_keys
+cover.
+
+Usage:
+    python ingest.py --db quran_graph_db --raw-data raw_data --workers 4
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import kuzu
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bulk_edges import load_verse_keys, report_missing, split_missing
+
+# Rows per Parquet row group, the unit Kuzu's COPY reads in parallel
+ROW_GROUP_SIZE = 10000
+
+# Rows per staged batch; the manifest is checkpointed after each one
+BATCH_ROWS = 50000
+
+# Rows with no text are not loaded
+KEEP_ROWS = "WHERE text IS NOT NULL AND text != ''"
+
+# Position of the last row with text among the first ? rows, or 0
+LAST_TEXT_ROW = """
+SELECT COUNT(*) FROM {table} WHERE rowid < (
+    SELECT MAX(rowid) FROM (SELECT rowid, text FROM {table} ORDER BY rowid LIMIT ?)
+    WHERE text IS NOT NULL AND text != ''
+)
+"""
+
+VERSE_SCHEMA = """
+CREATE NODE TABLE IF NOT EXISTS Verse (
+    id INT64,
+    surah_number INT64,
+    ayah_number INT64,
+    verse_key STRING PRIMARY KEY,
+    text STRING)
+"""
+
+
+def extract_language_and_source(filename):
+    """Language and source of a tafsir file, e.g. tafsir_ibn_kathir_english.sqlite"""
+    # Remove 'tafsir_' prefix and '.sqlite' suffix
+    name = filename.replace("tafsir_", "").replace(".sqlite", "")
+
+    # Extract language and source based on the filename
+    if "english" in name:
+        language = "english"
+        source = name.replace("_english", "")
+    elif "indonesian" in name:
+        language = "indonesian"
+        source = name.replace("_indonesian", "")
+    else:
+        # Default to English if no language specified
+        language = "english"
+        source = name
+
+    # Clean up source name
+    source = source.replace("_", " ").title()
+
+    return language, source
+
+
+def extract_language_and_translator(filename):
+    """Language and translator of a translation file, e.g. sahih_international_english.sqlite"""
+    # Remove '.sqlite' suffix
+    name = filename.replace(".sqlite", "")
+
+    # Extract language from the filename
+    if name.endswith("_english"):
+        language = "english"
+        translator = name.replace("_english", "")
+    elif name.endswith("_indonesian"):
+        language = "indonesian"
+        translator = name.replace("_indonesian", "")
+    else:
+        # Default to English if no language specified
+        language = "english"
+        translator = name
+
+    # Clean up translator name
+    translator = translator.replace("_", " ").title()
+
+    return language, translator
+
+
+def text_hash(text):
+    """Content address of a tafsir text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def tafsir_group(row, previous=None):
+    """Consecutive rows with the same group and the same text share one Tafsir node.
+
+    Rows are (ayah_key, text, group_ayah_key, from_ayah, to_ayah, ayah_keys).
+    Rows without a group_ayah_key fall back to their from_ayah-to_ayah range,
+    and rows with neither are a group of their own. A row without text
+    belongs to the previous row's group, unless it names a different one.
+    Only consecutive rows are merged, so the same text in two places is
+    stored twice. The text itself is compared, which is cheaper than
+    hashing every row; nodes get their text_hash in tafsir_columns.
+    """
+    ayah_key, text, group_ayah_key, from_ayah, to_ayah, _ = row
+    if group_ayah_key:
+        group = group_ayah_key
+    elif from_ayah and to_ayah:
+        group = f"{from_ayah}-{to_ayah}"
+    else:
+        group = None
+    if not text and previous is not None and group in (None, previous[0]):
+        return previous
+    return group or ayah_key, text
+
+
+def tafsir_verse_keys(row):
+    """Verses a tafsir row covers: its own ayah_key and those listed in ayah_keys"""
+    keys = [row[0]]
+    for key in (row[5] or "").split(","):
+        key = key.strip()
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def tafsir_columns(rows, language, source):
+    """Tafsir node columns, in table order, from (ayah_key, text, group_ayah_key, from_ayah, to_ayah, ayah_keys) rows"""
+    return {
+        "verse_key": [row[0] for row in rows],
+        "text": [row[1] for row in rows],
+        "language": [language] * len(rows),
+        "source": [source] * len(rows),
+        "group_ayah_key": [row[2] or "" for row in rows],
+        "from_ayah": [row[3] or "" for row in rows],
+        "to_ayah": [row[4] or "" for row in rows],
+        "text_hash": [text_hash(row[1]) for row in rows],
+    }
+
+
+def translation_columns(rows, language, translator):
+    """Translation node columns, in table order, from (ayah_key, text) rows"""
+    return {
+        "verse_key": [row[0] for row in rows],
+        "text": [row[1] for row in rows],
+        "language": [language] * len(rows),
+        "translator": [translator] * len(rows),
+    }
+
+
+SOURCES = {
+    "tafsir": {
+        "node_table": "Tafsir",
+        "rel_table": "HAS_TAFSIR",
+        "schema": """
+        CREATE NODE TABLE IF NOT EXISTS Tafsir (
+            id INT64 PRIMARY KEY,
+            verse_key STRING,
+            text STRING,
+            language STRING,
+            source STRING,
+            group_ayah_key STRING,
+            from_ayah STRING,
+            to_ayah STRING,
+            text_hash STRING
+        )
+        """,
+        # Bumped when the nodes or edges staged from a file change, so loaded
+        # files are reloaded
+        "version": 3,
+        # Columns added since the table was first created
+        "added_columns": {"text_hash": "STRING"},
+        "directory": "",
+        "prefix": "tafsir_",
+        "sqlite_table": "tafsir",
+        # Rows without text are kept, as their verses belong to the group
+        # before them
+        "keep": "",
+        "select": "SELECT ayah_key, text, group_ayah_key, from_ayah, to_ayah, ayah_keys FROM tafsir",
+        "label": "source",
+        "describe": extract_language_and_source,
+        "columns": tafsir_columns,
+        "group": tafsir_group,
+        "verse_keys": tafsir_verse_keys,
+    },
+    "translation": {
+        "node_table": "Translation",
+        "rel_table": "HAS_TRANSLATION",
+        "schema": """
+        CREATE NODE TABLE IF NOT EXISTS Translation (
+            id INT64 PRIMARY KEY,
+            verse_key STRING,
+            text STRING,
+            language STRING,
+            translator STRING
+        )
+        """,
+        "directory": "translations",
+        "prefix": "",
+        "sqlite_table": "translation",
+        "keep": KEEP_ROWS,
+        "select": "SELECT ayah_key, text FROM translation",
+        "version": 1,
+        "added_columns": {},
+        "label": "translator",
+        "describe": extract_language_and_translator,
+        "columns": translation_columns,
+        "group": None,
+        "verse_keys": lambda row: [row[0]],
+    },
+}
+
+
+def source_files(raw_data_dir, source):
+    """SQLite files of a source, in the order their ids are assigned"""
+    directory = os.path.join(raw_data_dir, source["directory"])
+    return sorted(
+        os.path.join(directory, f)
+        for f in os.listdir(directory)
+        if f.startswith(source["prefix"]) and f.endswith(".sqlite")
+    )
+
+
+def inspect_file(source_name, path):
+    """Content hash and number of rows to load of a file (runs in a worker process)"""
+    source = SOURCES[source_name]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    sqlite_conn = sqlite3.connect(path)
+    try:
+        rows = sqlite_conn.execute(
+            f"SELECT COUNT(*) FROM {source['sqlite_table']} {source['keep']}"
+        ).fetchone()[0]
+    finally:
+        sqlite_conn.close()
+    return {"sha256": digest.hexdigest(), "size_bytes": os.path.getsize(path), "rows": rows}
+
+
+def stage_batch(source_name, path, first_id, offset, limit, verse_keys, staging_dir):
+    """Read and clean one batch of a SQLite file into node and edge Parquet files (runs in a worker process).
+
+    The batch owns the groups that start within the limit rows from offset
+    in rowid order: a group that starts earlier belongs to the batch
+    before, and the last group is read to its end. Each group becomes one
+    node, numbered first_id plus the row number its group starts at, with
+    an edge to every verse its rows cover. Rows without text that belong to
+    no group are skipped. Returns the staged paths, row,
+    node and edge counts, text sizes, the verse keys of skipped edges and
+    the seconds spent reading, transforming and writing.
+    """
+    start_time = time.time()
+    source = SOURCES[source_name]
+    language, label = source["describe"](os.path.basename(path))
+    group = source["group"] or (lambda row, previous: None)
+
+    selected = []
+    sqlite_conn = sqlite3.connect(path)
+    try:
+        # The rows before the batch back to the last one with text show
+        # whether its first group started earlier
+        start = max(offset - 1, 0)
+        if source["group"] is not None and offset:
+            start = sqlite_conn.execute(
+                LAST_TEXT_ROW.format(table=source["sqlite_table"]), (offset,)
+            ).fetchone()[0]
+        cursor = sqlite_conn.execute(
+            f"{source['select']} {source['keep']} ORDER BY rowid LIMIT -1 OFFSET ?", (start,)
+        )
+        previous = None
+        for index, row in enumerate(cursor, start):
+            key = group(row, previous)
+            continues = key is not None and key == previous
+            if not row[1] and not continues:
+                key = None
+            previous = key
+            if index < offset or (continues and not selected):
+                continue
+            if index >= offset + limit and not continues:
+                break
+            if row[1] or continues:
+                selected.append((index, row, continues))
+    finally:
+        sqlite_conn.close()
+    read_time = time.time()
+
+    groups = []
+    text_bytes = 0
+    for index, row, continues in selected:
+        text_bytes += len((row[1] or "").encode("utf-8"))
+        if continues:
+            keys = groups[-1][2]
+            keys.extend(k for k in source["verse_keys"](row) if k not in keys)
+        else:
+            groups.append((first_id + index, row, source["verse_keys"](row)))
+    heads = [row for _, row, _ in groups]
+    nodes = pa.table({
+        "id": pa.array([node_id for node_id, _, _ in groups], pa.int64()),
+        **source["columns"](heads, language, label),
+    })
+    edges, missing = split_missing(
+        ((key, node_id) for node_id, _, keys in groups for key in keys), verse_keys
+    )
+    transform_time = time.time()
+
+    name = f"{os.path.splitext(os.path.basename(path))[0]}_{offset}"
+    nodes_path = os.path.join(staging_dir, f"{source['node_table']}_{name}.parquet")
+    edges_path = os.path.join(staging_dir, f"{source['rel_table']}_{name}.parquet")
+    pq.write_table(nodes, nodes_path, row_group_size=ROW_GROUP_SIZE)
+    pq.write_table(edges, edges_path, row_group_size=ROW_GROUP_SIZE)
+    return {
+        "path": path,
+        "nodes_path": nodes_path,
+        "edges_path": edges_path,
+        "rows": len(selected),
+        "nodes": nodes.num_rows,
+        "edges": edges.num_rows,
+        "text_bytes": text_bytes,
+        "stored_text_bytes": sum(len(row[1].encode("utf-8")) for row in heads),
+        "missing": missing,
+        "seconds": time.time() - start_time,
+        "worker_seconds": {
+            "read": read_time - start_time,
+            "transform": transform_time - read_time,
+            "write": time.time() - transform_time,
+        },
+    }
+
+
+def load_manifest(path):
+    """The manifest of loaded files, or an empty one"""
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"files": {}}
+
+
+def save_manifest(manifest, path):
+    """Write the manifest atomically, so a crash leaves the previous checkpoint"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def _scalar(conn, query, parameters=None):
+    result = conn.execute(query, parameters or {})
+    return result.get_next()[0] if result.has_next() else None
+
+
+def ensure_verses(conn, raw_data_dir, staging_dir):
+    """Load Verse nodes from ayah.sqlite if the table is empty"""
+    conn.execute(VERSE_SCHEMA)
+    verse_count = _scalar(conn, "MATCH (v:Verse) RETURN count(v)")
+    if verse_count:
+        print(f"Found {verse_count} existing verses in the database")
+        return
+
+    # Same columns, by position, as COPY Verse FROM ayah.verses
+    sqlite_conn = sqlite3.connect(os.path.join(raw_data_dir, "ayah.sqlite"))
+    try:
+        rows = sqlite_conn.execute("SELECT * FROM verses ORDER BY rowid").fetchall()
+    finally:
+        sqlite_conn.close()
+    names = ["id", "surah_number", "ayah_number", "verse_key", "text"]
+    verses = pa.table({name: [row[i] for row in rows] for i, name in enumerate(names)})
+    verses_path = os.path.join(staging_dir, "Verse.parquet")
+    pq.write_table(verses, verses_path, row_group_size=ROW_GROUP_SIZE)
+    conn.execute(f"COPY Verse FROM '{verses_path}'")
+    print(f"Loaded {verses.num_rows} verses into Kuzu")
+
+
+def add_missing_columns(conn, table, columns):
+    """Add columns to a table created before they existed"""
+    result = conn.execute(f"CALL table_info('{table}') RETURN name")
+    existing = set()
+    while result.has_next():
+        existing.add(result.get_next()[0])
+    for name, data_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD {name} {data_type}")
+
+
+def _copy(conn, table, paths):
+    if not paths:
+        return
+    files = ", ".join(f"'{path}'" for path in paths)
+    conn.execute(f"COPY {table} FROM [{files}]")
+
+
+def _delete_ids(conn, table, start, end):
+    """Remove nodes with start <= id < end and their edges"""
+    if end > start:
+        conn.execute(
+            f"MATCH (t:{table}) WHERE t.id >= $first AND t.id < $last DETACH DELETE t",
+            {"first": start, "last": end},
+        )
+
+
+def plan_files(conn, manifest, raw_data_dir, source_name, inspected):
+    """Decide what to load of each inspected file and clear out stale or partial nodes.
+
+    Updates the manifest entries in place and returns the files with rows
+    left to load as (key, entry) pairs in id order.
+    """
+    source = SOURCES[source_name]
+    table = source["node_table"]
+    files = manifest["files"]
+    ends = [
+        entry["first_id"] + entry["rows"]
+        for entry in files.values()
+        if entry["source"] == source_name
+    ]
+    next_id = max([(_scalar(conn, f"MATCH (t:{table}) RETURN max(t.id)") or 0) + 1] + ends)
+
+    pending = []
+    for path, info in inspected:
+        key = os.path.relpath(path, raw_data_dir)
+        entry = files.get(key)
+        if entry and entry["sha256"] == info["sha256"] and entry.get("version", 1) == source["version"]:
+            if entry["status"] == "complete":
+                print(f"Skipping {key} - unchanged")
+                continue
+            # Resume after the last checkpoint, dropping rows of the batch that was cut off
+            print(f"Resuming {key} at row {entry['loaded_rows']} of {entry['rows']}")
+            _delete_ids(conn, table, entry["first_id"] + entry["loaded_rows"], entry["first_id"] + entry["rows"])
+        else:
+            if entry:
+                reason = "content changed" if entry["sha256"] != info["sha256"] else "node layout changed"
+                print(f"Reloading {key} - {reason}")
+                _delete_ids(conn, table, entry["first_id"], entry["first_id"] + entry["rows"])
+            else:
+                # Loaded before there was a manifest, or never loaded
+                language, label = source["describe"](os.path.basename(path))
+                count = _scalar(
+                    conn,
+                    f"MATCH (t:{table}) WHERE t.language = $language AND t.{source['label']} = $label "
+                    "RETURN count(t)",
+                    {"language": language, "label": label},
+                )
+                if count:
+                    print(f"Reloading {key} - {count} nodes loaded without a manifest")
+                    conn.execute(
+                        f"MATCH (t:{table}) WHERE t.language = $language AND t.{source['label']} = $label "
+                        "DETACH DELETE t",
+                        {"language": language, "label": label},
+                    )
+            entry = files[key] = {
+                "source": source_name,
+                "version": source["version"],
+                "sha256": info["sha256"],
+                "size_bytes": info["size_bytes"],
+                "rows": info["rows"],
+                "first_id": next_id,
+                "loaded_rows": 0,
+                "nodes": 0,
+                "edges": 0,
+                "skipped_edges": 0,
+                "status": "loading",
+            }
+            next_id += info["rows"]
+        entry["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if entry["loaded_rows"] >= entry["rows"]:
+            entry["status"] = "complete"
+        else:
+            pending.append((key, entry))
+
+    known = {os.path.relpath(path, raw_data_dir) for path, _ in inspected}
+    for key, entry in files.items():
+        if entry["source"] == source_name and key not in known:
+            print(f"{key} is in the manifest but no longer in {raw_data_dir}; its nodes are kept")
+    return sorted(pending, key=lambda item: item[1]["first_id"])
+
+
+def ingest(
+    conn,
+    raw_data_dir,
+    manifest_path,
+    source_names=("tafsir", "translation"),
+    workers=None,
+    staging_dir=None,
+    batch_rows=BATCH_ROWS,
+):
+    """Load new, changed and partially loaded files of the given sources.
+
+    Files are hashed and counted in parallel and compared with the manifest
+    at manifest_path: unchanged files are skipped, changed files have their
+    old nodes removed and are loaded again, and a file cut off by a crash
+    resumes after its last checkpoint. Batches of up to batch_rows rows are
+    staged in parallel while earlier batches are copied, and the manifest is
+    saved after each batch. Returns per-source row and edge counts and stage
+    timings.
+    """
+    workers = workers or os.cpu_count()
+    keep_staging = staging_dir is not None
+    staging_dir = staging_dir or tempfile.mkdtemp(prefix="ingest_")
+    os.makedirs(staging_dir, exist_ok=True)
+    manifest = load_manifest(manifest_path)
+    # Spawn rather than fork so no Kuzu threads are forked. Spawned workers
+    # re-import the parent's __main__ as __mp_main__, so scripts that call
+    # ingest must keep doing so under an if __name__ == "__main__" guard
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    stats = {}
+    try:
+        ensure_verses(conn, raw_data_dir, staging_dir)
+        verse_keys = load_verse_keys(conn)
+
+        for source_name in source_names:
+            source = SOURCES[source_name]
+            conn.execute(source["schema"])
+            add_missing_columns(conn, source["node_table"], source["added_columns"])
+            conn.execute(
+                f"CREATE REL TABLE IF NOT EXISTS {source['rel_table']} "
+                f"(FROM Verse TO {source['node_table']})"
+            )
+            timings = {"inspect": 0.0, "stage": 0.0, "copy_nodes": 0.0, "copy_edges": 0.0}
+
+            # Hash and count every file, then fix each pending file's ids
+            # before staging so ids do not depend on scheduling
+            start_time = time.time()
+            paths = source_files(raw_data_dir, source)
+            inspected = list(zip(paths, pool.map(inspect_file, [source_name] * len(paths), paths)))
+            pending = plan_files(conn, manifest, raw_data_dir, source_name, inspected)
+            save_manifest(manifest, manifest_path)
+            timings["inspect"] = time.time() - start_time
+            if not pending:
+                continue
+
+            batches = [
+                (key, entry, offset, min(batch_rows, entry["rows"] - offset))
+                for key, entry in pending
+                for offset in range(entry["loaded_rows"], entry["rows"], batch_rows)
+            ]
+            print(f"Staging {len(batches)} batches of {len(pending)} {source_name} files with {workers} workers")
+
+            # Batches are yielded in order, so later ones stage while earlier ones are copied
+            staged = pool.map(
+                stage_batch,
+                [source_name] * len(batches),
+                [os.path.join(raw_data_dir, key) for key, _, _, _ in batches],
+                [entry["first_id"] for _, entry, _, _ in batches],
+                [offset for _, _, offset, _ in batches],
+                [limit for _, _, _, limit in batches],
+                [verse_keys] * len(batches),
+                [staging_dir] * len(batches),
+            )
+            missing = Counter()
+            totals = Counter()
+            worker_seconds = Counter()
+            for key, entry, offset, limit in batches:
+                start_time = time.time()
+                batch = next(staged)
+                timings["stage"] += time.time() - start_time
+
+                start_time = time.time()
+                _copy(conn, source["node_table"], [batch["nodes_path"]] if batch["nodes"] else [])
+                timings["copy_nodes"] += time.time() - start_time
+                start_time = time.time()
+                _copy(conn, source["rel_table"], [batch["edges_path"]] if batch["edges"] else [])
+                timings["copy_edges"] += time.time() - start_time
+                os.remove(batch["nodes_path"])
+                os.remove(batch["edges_path"])
+
+                # Checkpoint: the groups starting before offset + limit are loaded
+                entry["loaded_rows"] = offset + limit
+                entry["nodes"] += batch["nodes"]
+                entry["edges"] += batch["edges"]
+                entry["skipped_edges"] += sum(batch["missing"].values())
+                entry["status"] = "complete" if entry["loaded_rows"] >= entry["rows"] else "loading"
+                entry["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+                save_manifest(manifest, manifest_path)
+                print(
+                    f"  {key}: rows {offset}-{entry['loaded_rows']} of {entry['rows']} "
+                    f"staged in {batch['seconds']:.2f} seconds"
+                )
+                missing.update(batch["missing"])
+                worker_seconds.update(batch["worker_seconds"])
+                totals.update({name: batch[name] for name in ("rows", "nodes", "edges", "text_bytes", "stored_text_bytes")})
+
+            report_missing(source["rel_table"], missing)
+            stats[source_name] = {
+                "files": len(pending),
+                "batches": len(batches),
+                **{name: totals[name] for name in ("rows", "nodes", "edges", "text_bytes", "stored_text_bytes")},
+                "skipped_edges": sum(missing.values()),
+                "seconds": {phase: round(seconds, 3) for phase, seconds in timings.items()},
+                # Summed over the workers, so these can add up to more than the wall time
+                "worker_seconds": {phase: round(seconds, 3) for phase, seconds in worker_seconds.items()},
+            }
+            print(
+                f"Loaded {totals['rows']} rows as {totals['nodes']} {source['node_table']} nodes "
+                f"and {totals['edges']} {source['rel_table']} edges: "
+                + ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in timings.items())
+            )
+            if totals["nodes"] < totals["rows"]:
+                print(
+                    f"  Grouped rows share nodes: {totals['rows'] - totals['nodes']} fewer nodes "
+                    f"({1 - totals['nodes'] / totals['rows']:.1%}), text stored "
+                    f"{totals['stored_text_bytes'] / 1e6:.1f} MB instead of {totals['text_bytes'] / 1e6:.1f} MB"
+                )
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if not keep_staging:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="quran_graph_db", help="Kuzu database to load into")
+    parser.add_argument("--raw-data", default="./raw_data", help="Directory with ayah.sqlite, tafsir_*.sqlite and translations/")
+    parser.add_argument("--manifest", help="Manifest of loaded files (default: <db>.manifest.json)")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), default=sorted(SOURCES))
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS, help="Rows per staged batch and checkpoint")
+    parser.add_argument("--staging-dir", help="Keep the staged Parquet files here instead of a temporary directory")
+    args = parser.parse_args()
+
+    db = kuzu.Database(args.db)
+    conn = kuzu.Connection(db)
+    ingest(
+        conn,
+        args.raw_data,
+        args.manifest or f"{args.db}.manifest.json",
+        args.sources,
+        args.workers,
+        args.staging_dir,
+        args.batch_rows,
+    )
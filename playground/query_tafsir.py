@@ -5,12 +5,13 @@ import pandas as pd
 db = kuzu.Database("quran_graph_db")
 conn = kuzu.Connection(db)
 
-# Query 1: Count tafsirs by source and language
+# Query 1: Count tafsirs by source and language. Grouped-ayah tafsir is
+# stored once per group, so verses covered and texts stored can differ
 print("Tafsirs by source and language:")
 result = conn.execute(
     """
-MATCH (t:Tafsir)
-RETURN t.source, t.language, count(*) as count
+MATCH (v:Verse)-[:HAS_TAFSIR]->(t:Tafsir)
+RETURN t.source, t.language, count(*) as count, count(DISTINCT t) as texts
 ORDER BY count DESC
 """
 )
@@ -0,0 +1,189 @@
+"""Generate a synthetic raw_data directory with the schemas the loaders read.
+
+Writes ayah.sqlite with a verses table, tafsir_<source>_<language>.sqlite
+files with a tafsir table and translations/<translator>_<language>.sqlite
+files with a translation table, so ingest.py and its benchmarks can run
+without the real data. Chapters have the Quran's real verse counts
+(6236 verses in 114 chapters), cut down with --chapters for smaller
+corpora. Text lengths are drawn from log-normal distributions around
+typical lengths: short verses and translations, brief tafsir like
+Jalalayn, and long grouped commentary like Ibn Kathir, where one text
+covers a run of verses and is repeated on each of their rows.
+
+Usage:
+    python synthetic_raw_data.py raw_data_synthetic --tafsir-sources 8 --translation-sources 20
+"""
+import argparse
+import math
+import os
+import random
+import sqlite3
+
+# Verses in each of the 114 chapters
+VERSE_COUNTS = [
+    7, 286, 200, 176, 120, 165, 206, 75, 129, 109, 123, 111, 43, 52, 99, 128, 111, 110, 98, 135,
+    112, 78, 118, 64, 77, 227, 93, 88, 69, 60, 34, 30, 73, 54, 45, 83, 182, 88, 75, 85,
+    54, 53, 89, 59, 37, 35, 38, 29, 18, 45, 60, 49, 62, 55, 78, 96, 29, 22, 24, 13,
+    14, 11, 11, 18, 12, 12, 30, 52, 52, 44, 28, 28, 20, 56, 40, 31, 50, 40, 46, 42,
+    29, 19, 36, 25, 22, 17, 19, 26, 30, 20, 15, 21, 11, 8, 8, 19, 5, 8, 8, 11,
+    11, 8, 3, 9, 5, 4, 7, 3, 6, 3, 5, 4, 5, 6,
+]
+
+# Median characters of each kind of text
+VERSE_CHARS = 120
+TRANSLATION_CHARS = 180
+TAFSIR_CHARS = 400
+GROUPED_TAFSIR_CHARS = 3000
+
+LANGUAGES = ["english", "indonesian"]
+
+WORDS = (
+    "the and of to in that is for he they who those which with not it his their them "
+    "allah lord people day earth heavens mercy guidance signs messenger believers said "
+    "verse meaning commentary narrated reported scholars chapter revealed explained "
+    "dan yang di itu ini dengan untuk dari mereka kepada tidak ayat tafsir orang"
+).split()
+
+
+class TextSource:
+    """Random text of log-normally distributed length, sliced from one pregenerated corpus"""
+
+    def __init__(self, rng, size=1_000_000):
+        self.rng = rng
+        words = []
+        length = 0
+        while length < size:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        self.corpus = " ".join(words)
+
+    def text(self, median, sigma=0.6):
+        length = max(10, min(len(self.corpus) // 2, int(self.rng.lognormvariate(math.log(median), sigma))))
+        start = self.rng.randrange(len(self.corpus) - length)
+        return self.corpus[start:start + length]
+
+
+def verse_keys(chapters):
+    """(surah, ayah) of every verse of the first chapters"""
+    return [
+        (surah, ayah)
+        for surah, count in enumerate(VERSE_COUNTS[:chapters], 1)
+        for ayah in range(1, count + 1)
+    ]
+
+
+def write_verses(path, verses, texts):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE verses (id INTEGER PRIMARY KEY, surah_number INTEGER, "
+        "ayah_number INTEGER, verse_key TEXT, text TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO verses VALUES (?, ?, ?, ?, ?)",
+        (
+            (i, surah, ayah, f"{surah}:{ayah}", texts.text(VERSE_CHARS))
+            for i, (surah, ayah) in enumerate(verses, 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def tafsir_rows(verses, rng, texts, max_group):
+    """Rows of one tafsir source; groups of up to max_group verses of a chapter share a text"""
+    median = GROUPED_TAFSIR_CHARS if max_group > 1 else TAFSIR_CHARS
+    i = 0
+    while i < len(verses):
+        surah = verses[i][0]
+        group = [v for v in verses[i:i + rng.randint(1, max_group)] if v[0] == surah]
+        keys = [f"{s}:{a}" for s, a in group]
+        text = texts.text(median)
+        for key in keys:
+            yield key, keys[0], keys[0], keys[-1], ",".join(keys), text
+        i += len(group)
+
+
+def write_tafsir(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE tafsir (ayah_key TEXT, group_ayah_key TEXT, from_ayah TEXT, "
+        "to_ayah TEXT, ayah_keys TEXT, text TEXT)"
+    )
+    conn.executemany("INSERT INTO tafsir VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def write_translation(path, verses, texts):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE translation (sura INTEGER, ayah INTEGER, ayah_key TEXT, text TEXT)")
+    conn.executemany(
+        "INSERT INTO translation VALUES (?, ?, ?, ?)",
+        ((surah, ayah, f"{surah}:{ayah}", texts.text(TRANSLATION_CHARS)) for surah, ayah in verses),
+    )
+    conn.commit()
+    conn.close()
+
+
+def generate(
+    output_dir,
+    chapters=114,
+    tafsir_sources=4,
+    translation_sources=10,
+    grouped_fraction=0.5,
+    max_group=6,
+    seed=42,
+):
+    """Write a raw_data directory and return the number of files and rows per kind"""
+    rng = random.Random(seed)
+    texts = TextSource(rng)
+    verses = verse_keys(chapters)
+    os.makedirs(os.path.join(output_dir, "translations"), exist_ok=True)
+
+    write_verses(os.path.join(output_dir, "ayah.sqlite"), verses, texts)
+    summary = {"verses": len(verses), "tafsir_files": 0, "tafsir_rows": 0, "translation_files": 0, "translation_rows": 0}
+
+    grouped = round(tafsir_sources * grouped_fraction)
+    for n in range(tafsir_sources):
+        language = LANGUAGES[n % len(LANGUAGES)]
+        rows = list(tafsir_rows(verses, rng, texts, max_group if n < grouped else 1))
+        write_tafsir(os.path.join(output_dir, f"tafsir_source_{n + 1:02d}_{language}.sqlite"), rows)
+        summary["tafsir_files"] += 1
+        summary["tafsir_rows"] += len(rows)
+
+    for n in range(translation_sources):
+        language = LANGUAGES[n % len(LANGUAGES)]
+        write_translation(
+            os.path.join(output_dir, "translations", f"translator_{n + 1:02d}_{language}.sqlite"), verses, texts
+        )
+        summary["translation_files"] += 1
+        summary["translation_rows"] += len(verses)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir", help="Directory to write, e.g. raw_data_synthetic")
+    parser.add_argument("--chapters", type=int, default=114, help="Chapters to include, with their real verse counts")
+    parser.add_argument("--tafsir-sources", type=int, default=4)
+    parser.add_argument("--translation-sources", type=int, default=10)
+    parser.add_argument("--grouped-fraction", type=float, default=0.5, help="Fraction of tafsir sources with grouped verses")
+    parser.add_argument("--max-group", type=int, default=6, help="Most verses sharing one grouped tafsir text")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    summary = generate(
+        args.output_dir,
+        args.chapters,
+        args.tafsir_sources,
+        args.translation_sources,
+        args.grouped_fraction,
+        args.max_group,
+        args.seed,
+    )
+    print(
+        f"Wrote {summary['verses']} verses, {summary['tafsir_files']} tafsir files "
+        f"({summary['tafsir_rows']} rows) and {summary['translation_files']} translation files "
+        f"({summary['translation_rows']} rows) to {args.output_dir}"
+    )
@@ -0,0 +1,126 @@
+import json
+import sqlite3
+
+import pyarrow.parquet as pq
+import pytest
+
+import ingest
+
+kuzu = pytest.importorskip("kuzu")
+
+VERSES = ["1:1", "1:2", "1:3", "1:4", "1:5", "1:6", "1:7", "2:1", "2:2"]
+
+# (ayah_key, group_ayah_key, from_ayah, to_ayah, ayah_keys, text)
+TAFSIR_ROWS = [
+    # A group whose later rows leave the commentary empty
+    ("1:1", "1:1", "1:1", "1:3", "1:1,1:2,1:3", "First"),
+    ("1:2", "1:1", "1:1", "1:3", "1:1,1:2,1:3", ""),
+    ("1:3", "1:1", "1:1", "1:3", "1:1,1:2,1:3", None),
+    # A group whose rows repeat it, then an empty row without a group
+    ("1:4", "1:4", "1:4", "1:5", "1:4,1:5", "Second"),
+    ("1:5", "1:4", "1:4", "1:5", "1:4,1:5", "Second"),
+    ("1:6", None, None, None, None, ""),
+    ("1:7", None, None, None, None, "Third"),
+    # An empty row naming a group with no text anywhere has no tafsir
+    ("2:1", "2:1", "2:1", "2:1", "2:1", ""),
+    ("2:2", None, None, None, None, "Fourth"),
+]
+
+# Tafsir node (by the row its group starts at) -> verses it is linked to
+GROUPS = {
+    0: {"1:1", "1:2", "1:3"},
+    3: {"1:4", "1:5", "1:6"},
+    6: {"1:7"},
+    8: {"2:2"},
+}
+
+
+@pytest.fixture
+def raw_data(tmp_path):
+    raw_data = tmp_path / "raw_data"
+    (raw_data / "translations").mkdir(parents=True)
+
+    conn = sqlite3.connect(raw_data / "ayah.sqlite")
+    conn.execute(
+        "CREATE TABLE verses (id INTEGER, surah_number INTEGER, "
+        "ayah_number INTEGER, verse_key TEXT, text TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO verses VALUES (?, ?, ?, ?, ?)",
+        [(i, *map(int, key.split(":")), key, f"verse {key}") for i, key in enumerate(VERSES, 1)],
+    )
+    conn.commit()
+    conn.close()
+
+    conn = sqlite3.connect(raw_data / "tafsir_test_english.sqlite")
+    conn.execute(
+        "CREATE TABLE tafsir (ayah_key TEXT, group_ayah_key TEXT, from_ayah TEXT, "
+        "to_ayah TEXT, ayah_keys TEXT, text TEXT)"
+    )
+    conn.executemany("INSERT INTO tafsir VALUES (?, ?, ?, ?, ?, ?)", TAFSIR_ROWS)
+    conn.commit()
+    conn.close()
+    return raw_data
+
+
+def stage_all(raw_data, staging_dir, batch_rows):
+    """Stage a whole file in batches and return its node texts and edges by node id"""
+    path = str(raw_data / "tafsir_test_english.sqlite")
+    texts = {}
+    edges = {}
+    for offset in range(0, len(TAFSIR_ROWS), batch_rows):
+        limit = min(batch_rows, len(TAFSIR_ROWS) - offset)
+        batch = ingest.stage_batch(
+            "tafsir", path, 0, offset, limit, set(VERSES), str(staging_dir)
+        )
+        nodes = pq.read_table(batch["nodes_path"]).to_pydict()
+        for node_id, text in zip(nodes["id"], nodes["text"]):
+            assert node_id not in texts, f"node {node_id} staged by two batches"
+            texts[node_id] = text
+        for edge in pq.read_table(batch["edges_path"]).to_pylist():
+            edges.setdefault(edge["to"], set()).add(edge["from"])
+    return texts, edges
+
+
+@pytest.mark.parametrize("batch_rows", range(1, len(TAFSIR_ROWS) + 1))
+def test_groups_are_whole_at_any_batch_boundary(raw_data, tmp_path, batch_rows):
+    """Empty rows join the group before them, wherever the batches are cut"""
+    texts, edges = stage_all(raw_data, tmp_path, batch_rows)
+    assert texts == {0: "First", 3: "Second", 6: "Third", 8: "Fourth"}
+    assert edges == GROUPS
+
+
+def tafsir_edges(conn):
+    result = conn.execute("MATCH (v:Verse)-[:HAS_TAFSIR]->(t:Tafsir) RETURN t.id, v.verse_key")
+    edges = {}
+    while result.has_next():
+        node_id, verse_key = result.get_next()
+        edges.setdefault(node_id, set()).add(verse_key)
+    return edges
+
+
+def test_resume_after_partial_manifest(raw_data, tmp_path):
+    """A run cut off after a checkpoint reloads only the rest, with the same ids"""
+    manifest_path = str(tmp_path / "db.manifest.json")
+    conn = kuzu.Connection(kuzu.Database(str(tmp_path / "db.kz")))
+    ingest.ingest(conn, str(raw_data), manifest_path, ("tafsir",), workers=1, batch_rows=2)
+    complete = tafsir_edges(conn)
+    first_id = min(complete)
+    assert complete == {first_id + row: verses for row, verses in GROUPS.items()}
+
+    # As if the run had stopped after copying a batch it had not checkpointed
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    entry = manifest["files"]["tafsir_test_english.sqlite"]
+    entry.update(loaded_rows=4, status="loading")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    stats = ingest.ingest(conn, str(raw_data), manifest_path, ("tafsir",), workers=1, batch_rows=2)
+    assert stats["tafsir"]["nodes"] == 2
+    assert tafsir_edges(conn) == complete
+
+    with open(manifest_path) as f:
+        entry = json.load(f)["files"]["tafsir_test_english.sqlite"]
+    assert entry["status"] == "complete"
+    assert entry["loaded_rows"] == entry["rows"] == len(TAFSIR_ROWS)